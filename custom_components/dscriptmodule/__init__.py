@@ -4,12 +4,13 @@ from __future__ import annotations
 from typing import Final
 import logging
 import asyncio
-import aiofiles
-import json
-import os
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    SupportsResponse,
+)
+from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.const import (
     CONF_DEVICES,
     CONF_PARAMS,
@@ -18,7 +19,12 @@ from homeassistant.const import (
 
 from .const import (
     CONF_ADD_ENTITIES,
+    CONF_BOARD_INDEX,
+    CONF_COORDINATOR,
+    CONF_KNOWN_STORE,
+    CONF_LIVENESS,
     CONF_PYOJBECT,
+    CONF_ROUTING,
     CONF_SERVER,
     DSCRIPT_TOPICTOENTITYTYPE,
     DOMAIN,
@@ -27,12 +33,29 @@ from .const import (
     KNOWN_DATA_FILE,
 )
 
-from .server import dScriptBuiltInServer
-from .board import async_dScript_SetupKnownBoards
+from .coordinator import dScriptPollCoordinator
+from .liveness import dScriptLivenessTracker
+from .registry import (
+    dScriptBoardIndex,
+    dScriptEntityRouting,
+)
+from .store import dScriptKnownDataStore
+from .server import (
+    dScriptBuiltInServer,
+    async_service_ServerStart,
+    async_service_ServerStop,
+)
+from .board import (
+    async_dScript_RemoveBoard,
+    async_dScript_SetupKnownBoards,
+)
 from .services import (
     async_registerService,
     async_service_UpdateButton,
     async_service_HeartbeatKnownBoards,
+    async_service_TraceDump,
+    async_service_TraceStart,
+    async_service_TraceStop,
 )
 
 _LOGGER: Final = logging.getLogger(__name__)
@@ -50,7 +73,13 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry_data[CONF_PARAMS]=entry.data
         entry_data.setdefault(CONF_DEVICES, {})
         entry_data.setdefault(KNOWN_DATA, {})
-        entry_data.setdefault(CONF_SERVER, {})        
+        entry_data.setdefault(CONF_SERVER, {})
+        entry_data[CONF_BOARD_INDEX] = dScriptBoardIndex(entry.entry_id)
+        entry_data[CONF_ROUTING] = dScriptEntityRouting(entry.entry_id)
+        entry_data[CONF_LIVENESS] = dScriptLivenessTracker(hass, entry)
+        entry_data[CONF_LIVENESS].async_start()
+        entry_data[CONF_COORDINATOR] = dScriptPollCoordinator(hass, entry)
+        entry_data[CONF_COORDINATOR].async_start()
     except Exception as e:
         _LOGGER.error("%s - async_setup_entry: Creating data store failed: %s (%s.%s)", entry.entry_id, str(e), e.__class__.__module__, type(e).__name__)
         return False
@@ -64,11 +93,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     try:
         _LOGGER.debug("%s - async_setup_entry: Searching known data file: %s", entry.entry_id, KNOWN_DATA_FILE)
-        if os.path.isfile(KNOWN_DATA_FILE):
-            async with aiofiles.open(KNOWN_DATA_FILE, mode='r') as j:
-                known_data = json.loads(await j.read())
-            _LOGGER.debug("%s - async_setup_entry: Got known file data: %s", entry.entry_id, known_data)
-            entry_data[KNOWN_DATA] = known_data.get(DOMAIN, {})
+        if hass.data[DOMAIN].get(CONF_KNOWN_STORE, None) is None:
+            hass.data[DOMAIN][CONF_KNOWN_STORE] = dScriptKnownDataStore(hass)
+        KnownStore = hass.data[DOMAIN][CONF_KNOWN_STORE]
+        entry_data[KNOWN_DATA] = await KnownStore.async_load()
+        KnownStore.register(entry.entry_id, entry_data[KNOWN_DATA])
     except Exception as e:
         _LOGGER.error("%s - async_setup_entry: Searching known data failed: %s (%s.%s)", DOMAIN, str(e), e.__class__.__module__, type(e).__name__)
         return False
@@ -77,9 +106,8 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.debug("%s - async_setup_entry: init dScriptServer", DOMAIN)
         entry_data[CONF_SERVER][CONF_PYOJBECT] = dScriptBuiltInServer(hass, entry)
         BuiltInServer = entry_data[CONF_SERVER][CONF_PYOJBECT]
-        if BuiltInServer.dScriptServer.State is False:
-            _LOGGER.debug("%s - async_setup_entry: start dScriptServer", DOMAIN)
-            await BuiltInServer.async_dSServerStart("integration_setup")
+        _LOGGER.debug("%s - async_setup_entry: start dScriptServer", DOMAIN)
+        await BuiltInServer.async_dSServerStart("integration_setup")
     except Exception as e:
         _LOGGER.error("%s - async_setup_entry: init server failed: %s (%s.%s)", DOMAIN, str(e), e.__class__.__module__, type(e).__name__)
         entry_data[CONF_SERVER][CONF_PYOJBECT]=None
@@ -101,11 +129,16 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.debug("%s - async_setup_entry: register services", entry.entry_id)        
         await async_registerService(hass, "updatebutton", async_service_UpdateButton)
         await async_registerService(hass, "heartbeatknownboards", async_service_HeartbeatKnownBoards)
+        await async_registerService(hass, "serverstart", async_service_ServerStart)
+        await async_registerService(hass, "serverstop", async_service_ServerStop)
+        await async_registerService(hass, "tracestart", async_service_TraceStart)
+        await async_registerService(hass, "tracestop", async_service_TraceStop)
+        await async_registerService(hass, "tracedump", async_service_TraceDump, SupportsResponse.OPTIONAL)
     except Exception as e:
         _LOGGER.error("%s - async_setup_entry: register services failed: %s (%s.%s)", entry.entry_id, str(e), e.__class__.__module__, type(e).__name__)
         return False 
 
-    hass.async_create_task(async_dScript_SetupKnownBoards(hass, entry, 3))
+    hass.async_create_task(async_dScript_SetupKnownBoards(hass, entry))
     _LOGGER.debug("%s - async_setup_entry: Completed", entry.entry_id)
     return True
 
@@ -116,6 +149,20 @@ async def options_update_listener(hass: HomeAssistant, entry: ConfigEntry) -> bo
     await hass.config_entries.async_reload(entry.entry_id)
 
 
+async def async_remove_config_entry_device(hass: HomeAssistant, entry: ConfigEntry, device_entry: DeviceEntry) -> bool:
+    """Remove a board device (deleted by the user) from the config entry."""
+    try:
+        for domain, board_mac in device_entry.identifiers:
+            if not domain == DOMAIN: continue
+            _LOGGER.debug("%s - async_remove_config_entry_device: remove board: %s", entry.entry_id, board_mac)
+            if not await async_dScript_RemoveBoard(hass, entry, board_mac):
+                return False
+        return True
+    except Exception as e:
+        _LOGGER.error("%s - async_remove_config_entry_device: Remove device failed: %s (%s.%s)", entry.entry_id, str(e), e.__class__.__module__, type(e).__name__)
+        return False
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     try:
@@ -131,12 +178,26 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         entry_data=hass.data[DOMAIN][entry.entry_id]
         if CONF_PYOJBECT in entry_data[CONF_SERVER] and not entry_data[CONF_SERVER].get(CONF_PYOJBECT, None) is None:
             BuiltInServer = entry_data[CONF_SERVER].get(CONF_PYOJBECT)
-            if await BuiltInServer.async_dSServerStop("integration_unload") is False:
+            if await BuiltInServer.async_dSServerRelease() is False:
                 _LOGGER.error("%s - async_setup_entry: failed to unload server: %s", DOMAIN, BuiltInServer)
                 all_ok = False
             else:
                 hass.data[DOMAIN][entry.entry_id].pop(CONF_SERVER)
 
+        if CONF_LIVENESS in entry_data:
+            entry_data[CONF_LIVENESS].async_stop()
+
+        if CONF_COORDINATOR in entry_data:
+            entry_data[CONF_COORDINATOR].async_stop()
+
+        for board_entry in entry_data.get(CONF_DEVICES, {}).values():
+            if not board_entry.get(CONF_PYOJBECT, None) is None:
+                board_entry[CONF_PYOJBECT].close_client()
+
+        KnownStore = hass.data[DOMAIN].get(CONF_KNOWN_STORE, None)
+        if not KnownStore is None and await KnownStore.async_release(entry.entry_id) == 0:
+            hass.data[DOMAIN].pop(CONF_KNOWN_STORE)
+
         if CONF_ADD_ENTITIES in entry_data and not entry_data.get(CONF_ADD_ENTITIES, None) is None:
             hass.data[DOMAIN][entry.entry_id].pop(CONF_ADD_ENTITIES)
 
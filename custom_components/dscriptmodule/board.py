@@ -5,32 +5,73 @@ from __future__ import annotations
 from typing import Final
 import logging
 import asyncio
+import time
 
 from homeassistant.const import (
     CONF_DEVICES,
     CONF_ENABLED,
     CONF_FRIENDLY_NAME,
     CONF_IP_ADDRESS,
+    CONF_PROTOCOL,
 )
 from homeassistant.helpers import discovery
 
 from dScriptModule import dScriptBoard
+from .breaker import dScriptCircuitBreaker
+from .client import (
+    dScriptBoardClient,
+    NO_PIPELINE_PROTOCOLS,
+    REQUEST_REPLAY,
+    UNSENT,
+)
 from .const import (
+    CONF_BOARD_CONCURRENCY,
+    CONF_COORDINATOR,
+    CONF_LIVENESS,
     CONF_PYOJBECT,
-    CONF_SERVER,
+    CONF_ROUTING,
+    CONF_TIMING,
     DEFAULT_AESKEY,
+    DEFAULT_BOARD_CONCURRENCY,
+    DEFAULT_BOARD_DEADLINE,
+    DEFAULT_CONFIG_REVALIDATE,
     DEFAULT_PORT,
     DEFAULT_PROTOCOL,
+    DEFAULT_STARTUP_BOARD_TIMEOUT,
+    DEFAULT_STARTUP_CONCURRENCY,
     DOMAIN,
     DSCRIPT_ENTITYTYPETOCOUNTATTR,
     DSCRIPT_TOPICTOENTITYTYPE,
     KNOWN_DATA,
+    KNOWN_FINGERPRINT,
+    KNOWN_FINGERPRINT_VERSION,
+    KNOWN_FINGERPRINT_VERSION_KEY,
+    KNOWN_LAST_SEEN,
+)
+from .descriptors import dScriptBoardDescriptors
+from .metrics import (
+    METRIC_ERRORS,
+    METRIC_SENSORS,
+    dScriptBoardMetrics,
+)
+from .states import dScriptBoardStateTable
+from .telemetry import dScriptBoardTelemetry
+from .scheduler import (
+    dScriptBoardScheduler,
+    dScript_CommandLane,
 )
-from .entities import (
-    create_entity_unique_id
+from .tracing import (
+    TRACER,
+    TOPIC_COMMAND,
 )
 from .utils import (
+    async_dScript_remove_entities,
     async_dScript_setup_entry,
+    dScript_ForgetKnownBoard,
+    dScript_IndexBoard,
+    dScript_KnownDataChanged,
+    dScript_UnindexBoard,
+    dScript_WriteBoardStates,
     ProgrammingDebug,
     async_ProgrammingDebug,
 )
@@ -39,10 +80,14 @@ _LOGGER: Final = logging.getLogger(__name__)
 
 
 async def async_setup_dScriptBoard(hass: HomeAssistant, entry: ConfigEntry, tcp_ip, tcp_port=DEFAULT_PORT, protocol=DEFAULT_PROTOCOL, aeskey=DEFAULT_AESKEY):
-    """Set up a new dScriptBoard."""
+    """Set up a new dScriptBoard - returns the board object if it was set up."""
     try:
         _LOGGER.debug("%s - %s: async_setup_dScriptBoard: setup board", entry.entry_id, tcp_ip)
-        dSBoard = dScriptBoardHA(entry.entry_id, tcp_ip, tcp_port, protocol, aeskey)
+        dSBoard = await asyncio.wait_for(hass.async_add_executor_job(dScriptBoardHA, entry.entry_id, tcp_ip, tcp_port, protocol, aeskey), timeout=DEFAULT_BOARD_DEADLINE)
+        dSBoard.set_concurrency(entry.data.get(CONF_BOARD_CONCURRENCY, DEFAULT_BOARD_CONCURRENCY))
+        if not await dSBoard.async_check_available():
+            _LOGGER.warning("%s - %s: async_setup_dScriptBoard: board not available", entry.entry_id, tcp_ip)
+            return None
         entry_data=hass.data[DOMAIN][entry.entry_id]
         if not entry_data[KNOWN_DATA].get(dSBoard.MACAddress, None) is None and not entry_data[KNOWN_DATA][dSBoard.MACAddress].get(CONF_PYOJBECT, None) is None:
             _LOGGER.warning("%s - %s: async_setup_dScriptBoard: board already exists: %s", entry.entry_id, tcp_ip, dSBoard.name)
@@ -59,113 +104,443 @@ async def async_setup_dScriptBoard(hass: HomeAssistant, entry: ConfigEntry, tcp_
         entry_data.setdefault(CONF_DEVICES, {})
         entry_data[CONF_DEVICES].setdefault(dSBoard.MACAddress, {})
         entry_data[CONF_DEVICES][dSBoard.MACAddress][CONF_PYOJBECT] = dSBoard
+        dScript_IndexBoard(hass, entry, dSBoard)
+        entry_data[CONF_COORDINATOR].async_add_board(dSBoard)
 
         _LOGGER.debug("%s - %s: async_setup_dScriptBoard: save to known data", entry.entry_id, tcp_ip)        
-        entry_data[KNOWN_DATA].setdefault(dSBoard.MACAddress, {})
-        entry_data[KNOWN_DATA][dSBoard.MACAddress][CONF_FRIENDLY_NAME] = dSBoard.name
-        entry_data[KNOWN_DATA][dSBoard.MACAddress][CONF_IP_ADDRESS] = dSBoard.IP
+        dScript_StoreKnownBoard(hass, entry, dSBoard)
+        dSBoard._config_validated = time.monotonic()
 
         _LOGGER.debug("%s - %s: async_setup_dScriptBoard: setup platforms", entry.entry_id, tcp_ip)
         await async_dScript_ValidateBoardConfig(hass, entry, dSBoard, True)
+        return dSBoard
     except Exception as e:
         _LOGGER.error("%s - %s: async_setup_dScriptBoard: failed: %s (%s.%s)", entry.entry_id, tcp_ip, str(e), e.__class__.__module__, type(e).__name__)
 
 
-async def async_dScript_ValidateBoardConfig(hass: HomeAssistant, entry: ConfigEntry, dSBoard: dScriptBoardHA, init=False):
-    """Update configuration and create entities of dScriptBoard."""
+def dScript_StoreKnownBoard(hass: HomeAssistant, entry: ConfigEntry, dSBoard: dScriptBoardHA) -> None:
+    """Save name, address and topology fingerprint of a board to the known data"""
+    board_entry = hass.data[DOMAIN][entry.entry_id][KNOWN_DATA].setdefault(dSBoard.MACAddress, {})
+    board_entry[CONF_FRIENDLY_NAME] = dSBoard.name
+    board_entry[CONF_IP_ADDRESS] = dSBoard.IP
+    board_entry[KNOWN_LAST_SEEN] = int(time.time())
+    board_entry[KNOWN_FINGERPRINT] = dSBoard.fingerprint()
+    dScript_KnownDataChanged(hass)
+
+
+def dScript_BoardCounts(dSBoard: dScriptBoardHA) -> dict:
+    """Return the number of entities per platform the board currently provides"""
+    counts = {}
+    for platform in DSCRIPT_TOPICTOENTITYTYPE.values():
+        if platform == 'switch' and not dSBoard._CustomFirmeware: pattr = DSCRIPT_ENTITYTYPETOCOUNTATTR['switch_native']
+        else: pattr=DSCRIPT_ENTITYTYPETOCOUNTATTR[platform]
+        if not hasattr(dSBoard, pattr):
+            _LOGGER.error("%s - %s: dScript_BoardCounts: invalid platform or attribute: %s | %s", dSBoard.name, DOMAIN, platform, pattr)
+            continue
+        counts[platform] = getattr(dSBoard, pattr, 0)
+    return counts
+
+
+async def async_dScript_ValidateBoardConfig(hass: HomeAssistant, entry: ConfigEntry, dSBoard: dScriptBoardHA, init=False, refresh=True):
+    """Update configuration and create / remove entities of dScriptBoard (refresh: read the config from the board first)."""
     try:
         if init == True:
             _LOGGER.debug("%s - %s: async_dScript_ValidateBoardConfig: initialize board entities", entry.entry_id, dSBoard.name)
             await async_dScript_setup_entry(hass=hass, entry=entry, dSBoardList=[dSBoard])
         else:
-            _LOGGER.debug("%s - %s: async_dScript_ValidateBoardConfig: storing board entities count", entry.entry_id, dSBoard.name)
-            counts_pre = {}
-            for platform in DSCRIPT_TOPICTOENTITYTYPE.values():
-                if platform == 'switch' and not dSBoard._CustomFirmeware: pattr = DSCRIPT_ENTITYTYPETOCOUNTATTR['switch_native']
-                else: pattr=DSCRIPT_ENTITYTYPETOCOUNTATTR[platform]
-                if not hasattr(dSBoard, pattr):
-                    _LOGGER.error("%s - %s: async_dScript_ValidateBoardConfig: %s invalid platform or attribute: %s | %s", entry.entry_id, DOMAIN, dSBoard.name, platform, pattr)
-                    continue
-                counts_pre[platform] = getattr(dSBoard, pattr, 0)
-            
-            _LOGGER.debug("%s - %s: async_dScript_ValidateBoardConfig: updating board entities count", entry.entry_id, dSBoard.name)
-            await dSBoard.async_GetConfig()
-            platforms_add_entities=[]
-            platforms_remove_entities=[]        
-            for platform in counts_pre.keys():
-                if platform == 'switch' and not dSBoard._CustomFirmeware: pattr = DSCRIPT_ENTITYTYPETOCOUNTATTR['switch_native']
-                else: pattr=DSCRIPT_ENTITYTYPETOCOUNTATTR[platform]
-                count_post = getattr(dSBoard, pattr, 0)
-                _LOGGER.debug("%s - %s: async_dScript_ValidateBoardConfig: %s entities count: %s -> %s", entry.entry_id, dSBoard.name, platform, counts_pre[platform], count_post)
-                if counts_pre[platform] == count_post: continue
-                elif counts_pre[platform] < count_post: platforms_add_entities.append(platform)
-                elif counts_pre[platform] > count_post:
-                    for identifier in list(range(int(count_post)+1,int(counts_pre[platform])+1)):
-                        uniqueid = create_entity_unique_id(dSBoard, identifier, platform)
-                        entity_object = async_dScript_GetEntityByUniqueID(hass, entry.entry_id, uniqueid, dSBoard.MACAddress)
-                        if entity_object is None:
-                            _LOGGER.warning("%s - %s: async_dScript_ValidateBoardConfig: unable to find remove entity: %s", entry.entry_id, dSBoard.name, uniqueid)
-                            continue
-                        platforms_remove_entities.append(entity_object)
-
-            if platforms_remove_entities:
-#            To-Be-Done 
-                _LOGGER.debug("%s - %s: async_dScript_ValidateBoardConfig: remove non existing entities (TBD)", entry.entry_id, dSBoard.name)
-#                await async_dScript_remove_entry(hass=hass, entry=entry, dSEntityTypes=platforms_add_entities, dSBoardList=[dSBoard])
-#                #hass.add_job(entity_object.async_remove())
-            if platforms_add_entities:
-                _LOGGER.debug("%s - %s: async_dScript_ValidateBoardConfig: register newly added entities", entry.entry_id, dSBoard.name)
-                await async_dScript_setup_entry(hass=hass, entry=entry, dSEntityTypes=platforms_add_entities, dSBoardList=[dSBoard])
-                #self.hass.async_create_task(discovery.async_load_platform(self.hass, 'light', DOMAIN, dSBoard, self._entry))
+            if refresh == True:
+                _LOGGER.debug("%s - %s: async_dScript_ValidateBoardConfig: updating board entities count", entry.entry_id, dSBoard.name)
+                await dSBoard.async_GetConfig()
+            await async_dScript_ReconcileBoardEntities(hass, entry, dSBoard)
     except Exception as e:
         _LOGGER.error("%s - %s: async_dScript_ValidateBoardConfig: failed: %s (%s.%s)", entry.entry_id, dSBoard.name, str(e), e.__class__.__module__, type(e).__name__)
 
 
-async def async_dScript_SetupKnownBoards(hass: HomeAssistant, entry: ConfigEntry, delay: int = 0):
-    """Async: Trigger heartbeat for all known boards"""    
+async def async_dScript_ReconcileBoardEntities(hass: HomeAssistant, entry: ConfigEntry, dSBoard: dScriptBoardHA) -> None:
+    """Async: Diff the existing entities of a board against its current topology - add and remove in one batch per platform"""
+    entry_data=hass.data[DOMAIN][entry.entry_id]
+    dSBoard.descriptors.refresh_config()
+    counts = dScript_BoardCounts(dSBoard)
+    existing = { (entity._dSEntityType, entity._identifier): entity for entity in entry_data[CONF_ROUTING].entities(dSBoard.MACAddress) }
+    platforms_add_entities = [ platform for platform, count in counts.items() if any(not (platform, identifier) in existing for identifier in range(1, int(count)+1)) ]
+    remove_entities = [ entity for (platform, identifier), entity in existing.items() if identifier > counts.get(platform, 0) ]
+    _LOGGER.debug("%s - %s: async_dScript_ReconcileBoardEntities: add platforms: %s | remove entities: %s", entry.entry_id, dSBoard.name, platforms_add_entities, len(remove_entities))
+    if remove_entities:
+        _LOGGER.info("%s - %s: async_dScript_ReconcileBoardEntities: remove %s no longer existing entities", entry.entry_id, dSBoard.name, len(remove_entities))
+        await async_dScript_remove_entities(hass, entry, remove_entities)
+    if platforms_add_entities:
+        _LOGGER.debug("%s - %s: async_dScript_ReconcileBoardEntities: register newly added entities", entry.entry_id, dSBoard.name)
+        await async_dScript_setup_entry(hass=hass, entry=entry, dSEntityTypes=platforms_add_entities, dSBoardList=[dSBoard])
+
+
+async def async_dScript_RevalidateBoardConfig(hass: HomeAssistant, entry: ConfigEntry, dSBoard: dScriptBoardHA, force: bool = False) -> None:
+    """Async: Validate the board configuration at most every DEFAULT_CONFIG_REVALIDATE seconds - single request in flight per board"""
     try:
-        await asyncio.sleep(delay)
-        _LOGGER.debug("%s - %s: async_dScript_SetupKnownBoards: heartbeat known boards", entry.entry_id, DOMAIN)
+        if not dSBoard._config_task is None and not dSBoard._config_task.done():
+            dSBoard.config_stats["deduplicated"] += 1
+            await asyncio.shield(dSBoard._config_task)
+            return None
+        if not force and time.monotonic() - dSBoard._config_validated < DEFAULT_CONFIG_REVALIDATE:
+            dSBoard.config_stats["skipped"] += 1
+            return None
+        _LOGGER.debug("%s - %s: async_dScript_RevalidateBoardConfig: validate (forced: %s)", entry.entry_id, dSBoard.name, force)
+        dSBoard._config_task = hass.async_create_task(_async_dScript_RevalidateBoardConfig(hass, entry, dSBoard))
+        await asyncio.shield(dSBoard._config_task)
+    except Exception as e:
+        _LOGGER.error("%s - %s: async_dScript_RevalidateBoardConfig: failed: %s (%s.%s)", entry.entry_id, dSBoard.name, str(e), e.__class__.__module__, type(e).__name__)
+
+
+async def _async_dScript_RevalidateBoardConfig(hass: HomeAssistant, entry: ConfigEntry, dSBoard: dScriptBoardHA) -> None:
+    """Async: Read the board configuration and store the board if its config fingerprint changed - only a valid read counts as validated"""
+    try:
+        known = dSBoard.fingerprint()
+        friendlyname = dSBoard.friendlyname
+        fingerprint = dSBoard.config_fingerprint()
+        if not await dSBoard.async_GetConfig():
+            _LOGGER.warning("%s - %s: async_dScript_RevalidateBoardConfig: no valid configuration read", entry.entry_id, dSBoard.name)
+            dSBoard.apply_fingerprint(known)
+            dSBoard.friendlyname = friendlyname
+            dSBoard.config_stats["failed"] += 1
+            return None
+        await async_dScript_ValidateBoardConfig(hass, entry, dSBoard, refresh=False)
+        dSBoard._config_validated = time.monotonic()
+        dSBoard.config_stats["validated"] += 1
+        if not dSBoard.config_fingerprint() == fingerprint:
+            _LOGGER.info("%s - %s: async_dScript_RevalidateBoardConfig: configuration changed", entry.entry_id, dSBoard.name)
+            dSBoard.config_stats["changed"] += 1
+            dScript_StoreKnownBoard(hass, entry, dSBoard)
+    except Exception as e:
+        _LOGGER.error("%s - %s: _async_dScript_RevalidateBoardConfig: failed: %s (%s.%s)", entry.entry_id, dSBoard.name, str(e), e.__class__.__module__, type(e).__name__)
+
+
+async def async_dScript_SetupKnownBoards(hass: HomeAssistant, entry: ConfigEntry):
+    """Async: Bring up all known boards in parallel (bounded) - most recently seen boards first"""    
+    try:
+        _LOGGER.debug("%s - %s: async_dScript_SetupKnownBoards: setup known boards", entry.entry_id, DOMAIN)
         entry_data=hass.data[DOMAIN][entry.entry_id]
-        BuiltInServer = entry_data[CONF_SERVER][CONF_PYOJBECT]
-        
-        for board_entry in list(entry_data.get(KNOWN_DATA, [])):
-            _LOGGER.debug("%s - %s: async_dScript_SetupKnownBoards: processing board entry: %s ", entry.entry_id, DOMAIN, board_entry)
-            board_entry = entry_data[KNOWN_DATA][board_entry]
+        timeline = entry_data.setdefault(CONF_TIMING, {})
+        timeline.update({ "started": time.monotonic(), "first_board": None, "all_boards": None, "concurrency": DEFAULT_STARTUP_CONCURRENCY, "boards": {} })
+
+        known_boards = []
+        for board_mac, board_entry in list(entry_data.get(KNOWN_DATA, {}).items()):
             if not board_entry.get(CONF_ENABLED, True): continue
-            ip_address = board_entry.get(CONF_IP_ADDRESS, None)
-            if ip_address is None: continue
-            
-            _LOGGER.debug("%s - %s: async_dScript_SetupKnownBoards: heartbeat known board IP: %s ", entry.entry_id, DOMAIN, ip_address)
-            hass.async_create_task(async_setup_dScriptBoard(hass, entry, ip_address))
+            if board_entry.get(CONF_IP_ADDRESS, None) is None: continue
+            known_boards.append((board_entry, await async_dScript_WarmStartBoard(hass, entry, board_mac, board_entry)))
+        known_boards.sort(key=lambda known: known[0].get(KNOWN_LAST_SEEN, 0), reverse=True)
+        timeline["warm_boards"] = len([ known for known in known_boards if not known[1] is None ])
+        timeline["warm_start"] = round(time.monotonic() - timeline["started"], 3)
+
+        semaphore = asyncio.Semaphore(DEFAULT_STARTUP_CONCURRENCY)
+        await asyncio.gather(*[ _async_dScript_SetupKnownBoard(hass, entry, semaphore, board_entry[CONF_IP_ADDRESS], dSBoard) for board_entry, dSBoard in known_boards ])
+        timeline["all_boards"] = round(time.monotonic() - timeline["started"], 3)
+        _LOGGER.debug("%s - %s: async_dScript_SetupKnownBoards: %s known boards processed within %ss", entry.entry_id, DOMAIN, len(known_boards), timeline["all_boards"])
+    except Exception as e:
+        _LOGGER.error("%s - %s: async_dScript_SetupKnownBoards: setup known boards failed: %s (%s.%s)", entry.entry_id, DOMAIN, str(e), e.__class__.__module__, type(e).__name__)
+        return None
+
+
+async def _async_dScript_SetupKnownBoard(hass: HomeAssistant, entry: ConfigEntry, semaphore: asyncio.Semaphore, ip_address: str, dSBoard: dScriptBoardHA | None = None):
+    """Async: Setup (or reconcile a warm started) known board within the startup concurrency limit and record its latency"""
+    timeline = hass.data[DOMAIN][entry.entry_id][CONF_TIMING]
+    async with semaphore:
+        _LOGGER.debug("%s - %s: _async_dScript_SetupKnownBoard: setup known board IP: %s ", entry.entry_id, DOMAIN, ip_address)
+        start = time.monotonic()
+        try:
+            if dSBoard is None:
+                dSBoard = await asyncio.wait_for(async_setup_dScriptBoard(hass, entry, ip_address), timeout=DEFAULT_STARTUP_BOARD_TIMEOUT)
+            else:
+                dSBoard = await asyncio.wait_for(async_dScript_ReconcileBoard(hass, entry, dSBoard), timeout=DEFAULT_STARTUP_BOARD_TIMEOUT)
+            result = "ok" if dSBoard else "unavailable"
+        except asyncio.TimeoutError:
+            _LOGGER.warning("%s - %s: _async_dScript_SetupKnownBoard: no setup within %ss: %s", entry.entry_id, DOMAIN, DEFAULT_STARTUP_BOARD_TIMEOUT, ip_address)
+            result = "timeout"
+        end = time.monotonic()
+    timeline["boards"][ip_address] = { "latency": round(end - start, 3), "result": result }
+    if result == "ok" and timeline["first_board"] is None:
+        timeline["first_board"] = round(end - timeline["started"], 3)
+
+
+async def async_dScript_WarmStartBoard(hass: HomeAssistant, entry: ConfigEntry, board_mac: str, board_entry: dict) -> dScriptBoardHA | None:
+    """Async: Create a board and its entities from the cached fingerprint without contacting the board"""
+    try:
+        fingerprint = board_entry.get(KNOWN_FINGERPRINT, None)
+        if fingerprint is None or not fingerprint.get(KNOWN_FINGERPRINT_VERSION_KEY, None) == KNOWN_FINGERPRINT_VERSION:
+            _LOGGER.debug("%s - %s: async_dScript_WarmStartBoard: no (valid) fingerprint cached: %s", entry.entry_id, DOMAIN, board_mac)
+            return None
+        entry_data=hass.data[DOMAIN][entry.entry_id]
+        if not entry_data[CONF_DEVICES].get(board_mac, {}).get(CONF_PYOJBECT, None) is None:
+            return None
+
+        _LOGGER.debug("%s - %s: async_dScript_WarmStartBoard: create board from cache: %s", entry.entry_id, DOMAIN, board_mac)
+        dSBoard = dScriptBoardHA(entry.entry_id, board_entry[CONF_IP_ADDRESS], fingerprint=fingerprint)
+        dSBoard.set_concurrency(entry.data.get(CONF_BOARD_CONCURRENCY, DEFAULT_BOARD_CONCURRENCY))
+        dSBoard.MACAddress = board_mac
+        dSBoard.friendlyname = board_entry.get(CONF_FRIENDLY_NAME, dSBoard.friendlyname)
+        entry_data[CONF_DEVICES].setdefault(board_mac, {})
+        entry_data[CONF_DEVICES][board_mac][CONF_PYOJBECT] = dSBoard
+        dScript_IndexBoard(hass, entry, dSBoard)
+        entry_data[CONF_COORDINATOR].async_add_board(dSBoard)
+        await async_dScript_ValidateBoardConfig(hass, entry, dSBoard, True)
+        return dSBoard
+    except Exception as e:
+        _LOGGER.error("%s - %s: async_dScript_WarmStartBoard: failed for %s: %s (%s.%s)", entry.entry_id, DOMAIN, board_mac, str(e), e.__class__.__module__, type(e).__name__)
+        return None
+
+
+async def async_dScript_ReconcileBoard(hass: HomeAssistant, entry: ConfigEntry, dSBoard: dScriptBoardHA) -> dScriptBoardHA | None:
+    """Async: Connect a warm started board and reconcile its cached topology with the real one"""
+    try:
+        _LOGGER.debug("%s - %s: async_dScript_ReconcileBoard: reconcile board", entry.entry_id, dSBoard.name)
+        board_mac = dSBoard.MACAddress
+        friendlyname = dSBoard.friendlyname
+        available = await dSBoard.async_check_available()
+        dSBoard.friendlyname = friendlyname
+        if not available and not dSBoard.foreign_mac is None:
+            _LOGGER.warning("%s - %s: async_dScript_ReconcileBoard: %s is now used by %s", entry.entry_id, dSBoard.name, dSBoard.IP, dSBoard.foreign_mac)
+            dScript_UnindexBoard(hass, entry, board_mac)
+            hass.async_create_task(async_setup_dScriptBoard(hass, entry, dSBoard.IP))
+        if not available:
+            _LOGGER.warning("%s - %s: async_dScript_ReconcileBoard: board not available", entry.entry_id, dSBoard.name)
+            dScript_WriteBoardStates(hass, entry, board_mac)
+            return None
+
+        dScript_StoreKnownBoard(hass, entry, dSBoard)
+        dSBoard._config_validated = time.monotonic()
+        await async_dScript_ValidateBoardConfig(hass, entry, dSBoard, refresh=False)
+        for entity in hass.data[DOMAIN][entry.entry_id][CONF_ROUTING].entities(board_mac):
+            if getattr(entity, 'platform', None) is None: continue
+            if entity._poll_method is None:
+                entity.async_schedule_update_ha_state(True)
+        hass.data[DOMAIN][entry.entry_id][CONF_COORDINATOR].async_request_refresh(dSBoard)
+        return dSBoard
     except Exception as e:
-        _LOGGER.error("%s - %s: async_dScript_SetupKnownBoards: heartbeat known boards failed: %s (%s.%s)", entry.entry_id, DOMAIN, str(e), e.__class__.__module__, type(e).__name__)
+        _LOGGER.error("%s - %s: async_dScript_ReconcileBoard: failed: %s (%s.%s)", entry.entry_id, dSBoard.name, str(e), e.__class__.__module__, type(e).__name__)
         return None
 
+
+async def async_dScript_RemoveBoard(hass: HomeAssistant, entry: ConfigEntry, board_mac: str) -> bool:
+    """Async: Remove a board with its entities, routes, polling, connection, liveness state and known data"""
+    try:
+        _LOGGER.debug("%s - %s: async_dScript_RemoveBoard: remove board", entry.entry_id, board_mac)
+        entry_data = hass.data[DOMAIN][entry.entry_id]
+        board_entry = entry_data[CONF_DEVICES].get(board_mac, {})
+        entities = [entity for uniqueid, entity in board_entry.items() if not uniqueid == CONF_PYOJBECT]
+        entities += [entity for entity in entry_data[CONF_ROUTING].entities(board_mac) if not entity in entities]
+        await async_dScript_remove_entities(hass, entry, entities)
+        entry_data[CONF_ROUTING].remove_board(board_mac)
+        dSBoard = board_entry.get(CONF_PYOJBECT, None)
+        if not dSBoard is None:
+            entry_data[CONF_COORDINATOR].async_remove_board(dSBoard)
+            dSBoard.close_client()
+        entry_data[CONF_LIVENESS].async_forget(board_mac)
+        dScript_UnindexBoard(hass, entry, board_mac)
+        entry_data[CONF_DEVICES].pop(board_mac, None)
+        entry_data[KNOWN_DATA].pop(board_mac, None)
+        dScript_ForgetKnownBoard(hass, board_mac)
+        return True
+    except Exception as e:
+        _LOGGER.error("%s - %s: async_dScript_RemoveBoard: failed: %s (%s.%s)", entry.entry_id, board_mac, str(e), e.__class__.__module__, type(e).__name__)
+        return False
+
+
 class dScriptBoardHA(dScriptBoard):
     """Custom variant of dScriptBoard object for HA"""
     available = None
     friendlyname = None
     MACAddress = '00:00:00:00:00:00'
+    _probe = None
+    _warm = False
+    _config_task = None
+    _config_validated = 0
+    _client = None
+    _command_callback = None
+    _availability_callback = None
+    foreign_mac = None #MAC address of another board that answered at the IP address of this board
+    _status_read = False
+    _config_read = False
     _ConnectedBoardSensors = 1 #set this fixed to 1 as we have a single board status sensor implemented in HA
+    _ConnectedMetricSensors = len(METRIC_SENSORS) #fixed - one diagnostic sensor per board metric
     
-    def __init__(self, entry_id: str, tcp_ip, tcp_port=DEFAULT_PORT, protocol=DEFAULT_PROTOCOL, aeskey=DEFAULT_AESKEY):
-        """Initialize the object."""
+    def __init__(self, entry_id: str, tcp_ip, tcp_port=DEFAULT_PORT, protocol=DEFAULT_PROTOCOL, aeskey=DEFAULT_AESKEY, fingerprint: dict | None = None):
+        """Initialize the object (without any network access if a cached fingerprint is given)."""
         try:
             _LOGGER.debug("%s - %s: dScriptBoardHA __init__: prepare", entry_id, tcp_ip)
+            self.scheduler = dScriptBoardScheduler()
+            self.breaker = dScriptCircuitBreaker(tcp_ip)
+            self.telemetry = dScriptBoardTelemetry()
+            self.states = dScriptBoardStateTable()
+            self.descriptors = dScriptBoardDescriptors(self)
+            self.metrics = dScriptBoardMetrics()
+            self.scheduler.observer = self.metrics.observe_slot
+            if not fingerprint is None:
+                self._warm = True
+                self.apply_fingerprint(fingerprint)
+                protocol = fingerprint.get(CONF_PROTOCOL, protocol)
             super().__init__(TCP_IP=tcp_ip, TCP_PORT=tcp_port, PROTOCOL=protocol)
+            self._warm = False
+            self.config_stats = { "validated": 0, "skipped": 0, "deduplicated": 0, "changed": 0, "failed": 0 }
             if len(aeskey) > 0:
                 self.SetAESKey(aeskey)
         except Exception as e:
             _LOGGER.error("%s - %s: dScriptBoardHA __init__: prepare failed: %s (%s.%s)", entry_id, tcp_ip, str(e), e.__class__.__module__, type(e).__name__)
             return None
+        _LOGGER.debug("%s - %s: dScriptBoardHA __init__: complete", entry_id, tcp_ip)
+
+
+    async def async_check_available(self, timeout: float = DEFAULT_BOARD_DEADLINE) -> bool:
+        """Async: Check availability off the event loop with a hard deadline (single probe in flight, none while the circuit breaker is open)"""
+        try:
+            if self._probe is None or self._probe.done():
+                if not self.breaker.allow_probe():
+                    _LOGGER.debug("%s - %s: dScriptBoardHA async_check_available: suppressed by circuit breaker", self._HostName, self.IP)
+                    return False
+                self._probe = asyncio.get_running_loop().run_in_executor(None, self.check_available)
+            await asyncio.wait_for(asyncio.shield(self._probe), timeout=timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.warning("%s - %s: dScriptBoardHA async_check_available: no answer within %ss", self._HostName, self.IP, timeout)
+            self.available = False
+        except Exception as e:
+            _LOGGER.error("%s - %s: dScriptBoardHA async_check_available failed: %s (%s.%s)", self._HostName, self.IP, str(e), e.__class__.__module__, type(e).__name__)
+            self.available = False
+        if self.available == True:
+            self.breaker.success()
+            self.telemetry.record(self._Volts, self._Temperature)
+        else:
+            if not self.foreign_mac is None:
+                self.close_client()
+            self._breaker_failure()
+        return self.available == True
+
+
+    def set_concurrency(self, limit: int) -> None:
+        """Set the number of requests in flight to the board (a single one for protocols using a nonce per request)"""
+        if self._Protocol in NO_PIPELINE_PROTOCOLS:
+            limit = 1
+        self.scheduler.limit = max(1, int(limit))
+        self.close_client()
+        self._client = None
+
+
+    async def _dScriptBoard__async_SendProtocol(self, command, arguments):
+        """Async: Send a command within a scheduler slot of its lane (covers the AES nonce exchange as well)"""
+        if self.breaker.suppress():
+            return False
+        token = REQUEST_REPLAY.set(not command.startswith('Set'))
+        try:
+            data = await self.scheduler.async_run(dScript_CommandLane(command), dScriptBoard._dScriptBoard__async_SendProtocol, self, command, arguments)
+        finally:
+            REQUEST_REPLAY.reset(token)
+        if TRACER.enabled:
+            TRACER.trace(self, TOPIC_COMMAND, command, arguments=arguments, lane=lambda: dScript_CommandLane(command), result=lambda: data.hex() if isinstance(data, (bytes, bytearray)) else data)
+        if command.startswith('Set') and not self._command_callback is None:
+            self._command_callback(self, command, arguments)
+        elif command == 'GetStatus' and isinstance(data, (bytes, bytearray)):
+            self._status_read = True
+        elif command == 'GetConfig' and not data is None and not isinstance(data, bool):
+            self._config_read = True
+        return data
+
+
+    async def async_GetStatus(self) -> None:
+        """Async: Read the board status and add voltage and temperature to the board telemetry"""
+        self._status_read = False
+        await super().async_GetStatus()
+        if self._status_read:
+            self.telemetry.record(self._Volts, self._Temperature)
+
 
-        if not self.check_available() == True:
+    async def async_GetConfig(self) -> bool:
+        """Async: Read the board configuration - returns True if the board answered with the configuration of this board (its MAC address)"""
+        self._config_read = False
+        await super().async_GetConfig()
+        if not self._config_read:
+            return False
+        return ':'.join(m.zfill(2) for m in str(self._MACAddress).split(':')) == self.MACAddress
+
+
+    async def _dScriptBoard__async_Send(self, msg, buff, retry=False):
+        """Async: Send a message via the persistent connection of the board (replaces a new connection per request)"""
+        if self._client is None:
+            self._client = dScriptBoardClient(self, self.scheduler.limit)
+        replay = REQUEST_REPLAY.get()
+        data = await self._client.async_request(msg, buff, self.ConnectionTimeout, replay)
+        if (data is UNSENT or (data is None and replay)) and not retry:
+            if TRACER.enabled:
+                TRACER.trace(self, TOPIC_COMMAND, "retry sending", msg=lambda: msg.hex())
+            return await self._dScriptBoard__async_Send(msg, buff, True)
+        elif data is None and not replay:
+            _LOGGER.error("%s - %s: dScriptBoardHA async_Send: no answer - command not repeated as the board may have executed it: %s | %s", self._HostName, self.IP, msg, buff)
+            self.metrics.count(METRIC_ERRORS)
+            self._breaker_failure()
+            return False
+        elif data is None or data is UNSENT:
+            _LOGGER.error("%s - %s: dScriptBoardHA async_Send: failed with retry: %s | %s", self._HostName, self.IP, msg, buff)
+            self.metrics.count(METRIC_ERRORS)
+            self._breaker_failure()
+            return False
+        self.breaker.success()
+        return data
+
+
+    def _breaker_failure(self) -> None:
+        """Count a failed request - the board becomes unavailable if its circuit breaker opened"""
+        if self.breaker.failure():
+            self.available = False
+            self.close_client()
+            if not self._availability_callback is None:
+                self._availability_callback(self)
+
+
+    def close_client(self) -> None:
+        """Close the persistent connection of the board"""
+        if not self._client is None:
+            self._client.close()
+
+
+    def GetHostName(self) -> None:
+        """Resolve the hostname of the board (skipped while warm starting from a cached fingerprint)"""
+        if self._warm:
             return None
-        _LOGGER.debug("%s - %s: dScriptBoardHA __init__: complete", entry_id, tcp_ip)
+        super().GetHostName()
+
+
+    def fingerprint(self) -> dict:
+        """Return the topology fingerprint of the board as stored within the known data"""
+        return {
+            KNOWN_FINGERPRINT_VERSION_KEY: KNOWN_FINGERPRINT_VERSION,
+            "hostname": self._HostName,
+            "module_id": self._ModuleID,
+            "system_firmware": [self._SystemFirmwareMajor, self._SystemFirmwareMinor],
+            "application_firmware": [self._ApplicationFirmwareMajor, self._ApplicationFirmwareMinor],
+            "custom_firmware": self._CustomFirmeware,
+            CONF_PROTOCOL: self._Protocol,
+            "counts": { pattr: getattr(self, pattr, 0) for pattr in set(DSCRIPT_ENTITYTYPETOCOUNTATTR.values()) },
+        }
+
+
+    def config_fingerprint(self) -> tuple:
+        """Return the part of the fingerprint reported by GetConfig (firmware type and entity counts)"""
+        return (self._CustomFirmeware,) + tuple(getattr(self, pattr, 0) for pattr in sorted(set(DSCRIPT_ENTITYTYPETOCOUNTATTR.values())))
+
+
+    def apply_fingerprint(self, fingerprint: dict) -> None:
+        """Restore the topology of the board from a cached fingerprint"""
+        self._HostName = fingerprint.get("hostname", None)
+        self.friendlyname = self._HostName
+        self._ModuleID = fingerprint.get("module_id", self._ModuleID)
+        self._SystemFirmwareMajor, self._SystemFirmwareMinor = fingerprint.get("system_firmware", [0, 0])
+        self._ApplicationFirmwareMajor, self._ApplicationFirmwareMinor = fingerprint.get("application_firmware", [0, 0])
+        self._CustomFirmeware = fingerprint.get("custom_firmware", False)
+        for pattr, count in fingerprint.get("counts", {}).items():
+            if pattr in DSCRIPT_ENTITYTYPETOCOUNTATTR.values() and not pattr in ('_ConnectedBoardSensors', '_ConnectedMetricSensors'):
+                setattr(self, pattr, int(count))
 
 
     def check_available(self):
+        """Connect to the board and update its status and configuration (blocking) - another board answering at its IP leaves it unchanged and unavailable"""
+        expected = self.MACAddress
+        fingerprint = None if expected == dScriptBoardHA.MACAddress else self.fingerprint()
+        friendlyname = self.friendlyname
         try:
             _LOGGER.debug("%s - %s: dScriptBoardHA check_available: connect", self._HostName, self.IP)
             self.InitBoard()
@@ -187,6 +562,16 @@ class dScriptBoardHA(dScriptBoard):
             self.available = False
             return False
 
+        if not fingerprint is None and not self.MACAddress == expected:
+            _LOGGER.warning("%s - %s: dScriptBoardHA check_available: IP address is now used by %s - restore %s", self._HostName, self.IP, self.MACAddress, expected)
+            self.foreign_mac = self.MACAddress
+            self.apply_fingerprint(fingerprint)
+            self.friendlyname = friendlyname
+            self.MACAddress = expected
+            self.available = False
+            return False
+        self.foreign_mac = None
+
         _LOGGER.debug("%s - %s: dScriptBoardHA check_available complete: FW: %s.%s | App: %s.%s | Custom: %s | MAC: %s | IP: %s | Prot: %s", 
             self._HostName, self._SystemFirmwareMajor, self._SystemFirmwareMinor, 
             self._ApplicationFirmwareMajor, self._ApplicationFirmwareMinor, self._CustomFirmeware, self.MACAddress, self.IP, self._Protocol)
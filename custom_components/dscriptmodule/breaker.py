@@ -0,0 +1,102 @@
+"""Per board circuit breaker for unreachable dScriptBoards."""
+
+from __future__ import annotations
+from typing import Final
+import logging
+import random
+import time
+
+from .const import (
+    DEFAULT_BOARD_DEADLINE,
+    DEFAULT_BREAKER_BACKOFF,
+    DEFAULT_BREAKER_BACKOFF_MAX,
+    DEFAULT_BREAKER_JITTER,
+    DEFAULT_BREAKER_THRESHOLD,
+)
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+STATE_CLOSED: Final = 'closed'
+STATE_OPEN: Final = 'open'
+STATE_HALF_OPEN: Final = 'half_open'
+
+
+class dScriptCircuitBreaker(object):
+    """closed: requests pass | open: requests are suppressed until the backoff expired | half_open: a single probe is in flight"""
+
+    def __init__(self, name: str, threshold: int = DEFAULT_BREAKER_THRESHOLD) -> None:
+        """Initialize the object."""
+        self._name = name
+        self._threshold = threshold
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._opens = 0
+        self._retry_at = 0.0
+        self._probe_started = 0.0
+        self.stats = {
+            "opened": 0,
+            "probes": 0,
+            "suppressed": 0,
+        }
+
+    @property
+    def closed(self) -> bool:
+        """Return True if requests to the board are allowed"""
+        return self.state == STATE_CLOSED
+
+    def allow_probe(self) -> bool:
+        """Return True if the caller may contact the board - a single caller becomes the probe once the backoff expired"""
+        now = time.monotonic()
+        if self.state == STATE_CLOSED:
+            return True
+        if self.state == STATE_HALF_OPEN and now - self._probe_started < DEFAULT_BOARD_DEADLINE * 2:
+            self.stats["suppressed"] += 1
+            return False
+        if self.state == STATE_OPEN and now < self._retry_at:
+            self.stats["suppressed"] += 1
+            return False
+        _LOGGER.debug("%s: dScriptCircuitBreaker: half open - probe board", self._name)
+        self.state = STATE_HALF_OPEN
+        self._probe_started = now
+        self.stats["probes"] += 1
+        return True
+
+    def expire(self) -> None:
+        """End the backoff now (e.g. the board sent a heartbeat) - the next caller becomes the probe"""
+        if self.state == STATE_OPEN:
+            self._retry_at = 0.0
+
+    def suppress(self) -> bool:
+        """Return True (and count it) if a request has to be suppressed"""
+        if self.state == STATE_CLOSED:
+            return False
+        self.stats["suppressed"] += 1
+        return True
+
+    def success(self) -> None:
+        """Record a successful request or probe - closes the breaker"""
+        if not self.state == STATE_CLOSED:
+            _LOGGER.info("%s: dScriptCircuitBreaker: board reachable again - closed", self._name)
+        self.state = STATE_CLOSED
+        self._failures = 0
+        self._opens = 0
+
+    def failure(self) -> bool:
+        """Record a failed request or probe - returns True if the breaker opened with this failure"""
+        self._failures += 1
+        if self.state == STATE_CLOSED and self._failures < self._threshold:
+            return False
+        opened = self.state == STATE_CLOSED
+        backoff = min(DEFAULT_BREAKER_BACKOFF * 2 ** self._opens, DEFAULT_BREAKER_BACKOFF_MAX)
+        backoff = backoff * random.uniform(1 - DEFAULT_BREAKER_JITTER, 1 + DEFAULT_BREAKER_JITTER)
+        self._opens += 1
+        self._retry_at = time.monotonic() + backoff
+        self.state = STATE_OPEN
+        if opened:
+            self.stats["opened"] += 1
+            _LOGGER.warning("%s: dScriptCircuitBreaker: %s failed requests - suppress board I/O for %ss", self._name, self._failures, round(backoff))
+        return opened
+
+    def as_dict(self) -> dict:
+        """Return the current state for diagnostics"""
+        return dict(self.stats, state=self.state, failures=self._failures, retry_in=round(max(0, self._retry_at - time.monotonic()), 1) if self.state == STATE_OPEN else 0)
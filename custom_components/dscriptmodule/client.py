@@ -0,0 +1,222 @@
+"""Persistent asyncio connection to a dScriptBoard"""
+
+from __future__ import annotations
+from typing import Final
+import logging
+import asyncio
+import contextvars
+import socket
+
+from .const import (
+    DEFAULT_CLIENT_CLOSE,
+    DEFAULT_CLIENT_IDLE,
+    DEFAULT_CLIENT_PIPELINE,
+)
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+RECONNECT: Final = object() # the board closed a reused connection - repeat the request on a new one (reads only)
+UNSENT: Final = object() # the request was never written to the board - it is safe to send it again
+REQUEST_REPLAY: Final = contextvars.ContextVar('dscript_request_replay', default=True) # False while sending a command that must not run twice (Set*)
+NO_PIPELINE_PROTOCOLS: Final = ['binaryaes'] # each AES nonce is returned by the previous response
+CLOSED_BY_BOARD_LIMIT: Final = 3 # consecutive closed connections until the board is treated as one request per connection
+
+
+class dScriptBoardClient(object):
+    """Warm connection to a single board - requests are written back to back and answered in order"""
+
+    def __init__(self, board, pipeline: int = DEFAULT_CLIENT_PIPELINE, idle: float = DEFAULT_CLIENT_IDLE) -> None:
+        """Initialize the object."""
+        self._board = board
+        self._idle = idle
+        self._pipeline = 1 if board._Protocol in NO_PIPELINE_PROTOCOLS else pipeline
+        self._persistent = True
+        self._closed_by_board = 0
+        self._reader = None
+        self._writer = None
+        self._generation = 0
+        self._written = 0
+        self._answered = 0
+        self._slots = None
+        self._single = None
+        self._inflight = 0
+        self._connect_lock = None
+        self._read_lock = None
+        self._idle_handle = None
+        self._closing = set()
+        self.stats = {
+            "connects": 0,
+            "requests": 0,
+            "reused": 0,
+            "reconnects": 0,
+            "errors": 0,
+            "persistent": True,
+        }
+
+    @property
+    def connected(self) -> bool:
+        """Return True if a connection to the board is open (and the board did not close it after its last answer)"""
+        return not self._writer is None and not self._writer.is_closing() and not self._reader.at_eof()
+
+    async def async_request(self, msg: bytes, buff: int, timeout: float, replay: bool = True):
+        """Async: Send a request and return its (up to buff bytes long) answer
+
+        Returns None if the board did not answer and UNSENT if the request was never written.
+        A written request is only repeated on a new connection if replay is set (reads).
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self._pipeline)
+            self._single = asyncio.Lock()
+            self._connect_lock = asyncio.Lock()
+            self._read_lock = asyncio.Lock()
+        async with self._slots:
+            self.stats["requests"] += 1
+            self._inflight += 1
+            if not self._idle_handle is None:
+                self._idle_handle.cancel()
+                self._idle_handle = None
+            try:
+                return await self._async_request_retry(msg, buff, timeout, replay)
+            finally:
+                self._inflight -= 1
+                if self._inflight == 0 and not self._writer is None:
+                    self._idle_handle = asyncio.get_running_loop().call_later(self._idle, self.close)
+
+    async def _async_request_retry(self, msg: bytes, buff: int, timeout: float, replay: bool):
+        """Async: Send a request - a read is repeated on a new connection if the board closed the shared one"""
+        data = RECONNECT
+        attempts = self._pipeline + 1 # the first request on a new connection never returns RECONNECT
+        while data is RECONNECT and attempts > 0:
+            attempts -= 1
+            if self._persistent:
+                data = await self._async_request(msg, buff, timeout)
+            else:
+                async with self._single:
+                    data = await self._async_request(msg, buff, timeout)
+                    await self.async_close()
+            if data is RECONNECT:
+                self.stats["reconnects"] += 1
+                if not replay:
+                    # the board may have executed the request already - never send a command twice
+                    _LOGGER.debug("%s - %s: dScriptBoardClient: connection lost after a non repeatable request was written", self._board.friendlyname, self._board.IP)
+                    self.stats["errors"] += 1
+                    return None
+        if data is RECONNECT:
+            return None
+        return data
+
+    async def _async_request(self, msg: bytes, buff: int, timeout: float):
+        """Async: Write a request on the current connection and read its answer in order"""
+        if not self.connected:
+            try:
+                await self._async_connect(timeout)
+            except (asyncio.TimeoutError, OSError) as e:
+                _LOGGER.debug("%s - %s: dScriptBoardClient connect failed: %s (%s.%s)", self._board.friendlyname, self._board.IP, str(e), e.__class__.__module__, type(e).__name__)
+                self.stats["errors"] += 1
+                return UNSENT
+        generation = self._generation
+        reader = self._reader
+        reused = self._written > 0
+        if reused:
+            self.stats["reused"] += 1
+        self._written += 1
+        self._writer.write(msg)
+        async with self._read_lock:
+            if not generation == self._generation:
+                # an earlier answer on this connection failed - the stream is out of sync
+                return RECONNECT
+            try:
+                await asyncio.wait_for(self._writer.drain(), timeout=timeout)
+                data = b''
+                while len(data) < buff:
+                    chunk = await asyncio.wait_for(reader.read(buff - len(data)), timeout=timeout)
+                    if not chunk: break
+                    data = data + chunk
+            except (asyncio.TimeoutError, OSError) as e:
+                _LOGGER.debug("%s - %s: dScriptBoardClient request failed: %s (%s.%s)", self._board.friendlyname, self._board.IP, str(e), e.__class__.__module__, type(e).__name__)
+                self.stats["errors"] += 1
+                shared = reused or self._written > 1 # the board may reset a connection carrying further requests
+                await self.async_close()
+                if shared and isinstance(e, OSError):
+                    self._board_closed()
+                    return RECONNECT
+                return None
+            if len(data) < buff:
+                await self.async_close()
+                if len(data) == 0 and reused:
+                    self._board_closed()
+                    return RECONNECT
+                if len(data) == 0:
+                    return None
+            else:
+                self._answered += 1
+                if self._answered > 1:
+                    self._closed_by_board = 0
+            return data
+
+    async def _async_connect(self, timeout: float) -> None:
+        """Async: Open a new connection (one at a time)"""
+        async with self._connect_lock:
+            if self.connected:
+                return None
+            if not self._writer is None:
+                # the board closed the connection after its last answer - detected before writing to it
+                self._board_closed()
+                await self.async_close()
+            reader, writer = await asyncio.wait_for(asyncio.open_connection(self._board.IP, self._board.Port), timeout=timeout)
+            sock = writer.get_extra_info('socket')
+            if not sock is None:
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._reader = reader
+            self._writer = writer
+            self._generation += 1
+            self._written = 0
+            self._answered = 0
+            self.stats["connects"] += 1
+
+    def _board_closed(self) -> None:
+        """Count a connection the board closed after a single answer - fall back to one request per connection if it always does"""
+        if self._answered > 1:
+            return None
+        self._closed_by_board += 1
+        if self._closed_by_board >= CLOSED_BY_BOARD_LIMIT and self._persistent:
+            _LOGGER.info("%s - %s: dScriptBoardClient: board closes every connection - disable persistent connection", self._board.friendlyname, self._board.IP)
+            self._persistent = False
+            self.stats["persistent"] = False
+
+    def _detach(self):
+        """Detach the current connection from the client - returns its writer (None if not connected)"""
+        if not self._idle_handle is None:
+            self._idle_handle.cancel()
+            self._idle_handle = None
+        writer = self._writer
+        if writer is None:
+            return None
+        self._generation += 1
+        self._reader = None
+        self._writer = None
+        return writer
+
+    async def _async_wait_closed(self, writer) -> None:
+        """Async: Close a detached connection and wait until it is closed"""
+        try:
+            writer.close()
+            await asyncio.wait_for(writer.wait_closed(), timeout=DEFAULT_CLIENT_CLOSE)
+        except Exception as e:
+            _LOGGER.debug("%s - %s: dScriptBoardClient close failed: %s (%s.%s)", self._board.friendlyname, self._board.IP, str(e), e.__class__.__module__, type(e).__name__)
+
+    async def async_close(self) -> None:
+        """Async: Close the current connection - requests waiting for an answer on it fail"""
+        writer = self._detach()
+        if not writer is None:
+            await self._async_wait_closed(writer)
+
+    def close(self) -> None:
+        """Close the current connection (from synchronous code) - waiting for the close runs as a task"""
+        writer = self._detach()
+        if writer is None:
+            return None
+        task = asyncio.get_running_loop().create_task(self._async_wait_closed(writer))
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
@@ -17,13 +17,19 @@ import homeassistant.helpers.config_validation as cv
 from .const import (
     AVAILABLE_PROTOCOLS,
     CONF_AESKEY,
+    CONF_BOARD_CONCURRENCY,
     CONF_LISTENIP,
+    CONF_NATIVE_SERVER,
+    CONF_PUSH_COALESCE,
     CONF_SERVER,
     DEFAULT_AESKEY,
+    DEFAULT_BOARD_CONCURRENCY,
     DEFAULT_LISTENIP,
     DEFAULT_NAME,
+    DEFAULT_NATIVE_SERVER,
     DEFAULT_PORT,
     DEFAULT_PROTOCOL,
+    DEFAULT_PUSH_COALESCE,
     DOMAIN,
 )
 
@@ -35,6 +41,9 @@ DSCRIPTMODULE_SCHEMA: Final = vol.Schema({
     vol.Required(CONF_PORT, default=DEFAULT_PORT): cv.port,
     vol.Required(CONF_PROTOCOL, default=DEFAULT_PROTOCOL): vol.In(AVAILABLE_PROTOCOLS),
     vol.Optional(CONF_AESKEY, default=DEFAULT_AESKEY): cv.string,
+    vol.Optional(CONF_PUSH_COALESCE, default=DEFAULT_PUSH_COALESCE): cv.positive_int,
+    vol.Optional(CONF_NATIVE_SERVER, default=DEFAULT_NATIVE_SERVER): cv.boolean,
+    vol.Optional(CONF_BOARD_CONCURRENCY, default=DEFAULT_BOARD_CONCURRENCY): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
 })
 
 async def async_get_OPTIONS_DSCRIPTMODULE_SCHEMA(current_data):
@@ -48,6 +57,9 @@ async def async_get_OPTIONS_DSCRIPTMODULE_SCHEMA(current_data):
             vol.Required(CONF_PORT, default=current_data.get(CONF_PORT, DEFAULT_PORT)): cv.port,
             vol.Required(CONF_PROTOCOL, default=current_data.get(CONF_PROTOCOL, DEFAULT_PROTOCOL)): vol.In(AVAILABLE_PROTOCOLS),
             vol.Optional(CONF_AESKEY, default=current_data.get(CONF_AESKEY, DEFAULT_AESKEY)): cv.string,
+            vol.Optional(CONF_PUSH_COALESCE, default=current_data.get(CONF_PUSH_COALESCE, DEFAULT_PUSH_COALESCE)): cv.positive_int,
+            vol.Optional(CONF_NATIVE_SERVER, default=current_data.get(CONF_NATIVE_SERVER, DEFAULT_NATIVE_SERVER)): cv.boolean,
+            vol.Optional(CONF_BOARD_CONCURRENCY, default=current_data.get(CONF_BOARD_CONCURRENCY, DEFAULT_BOARD_CONCURRENCY)): vol.All(vol.Coerce(int), vol.Range(min=1, max=16)),
         })
         await asyncio.sleep(0)
         return OPTIONS_DSCRIPTMODULE_SCHEMA
@@ -14,18 +14,68 @@ CONF_SERVER: Final = 'server'
 CONF_PYOJBECT: Final = 'pyobj'
 CONF_ADD_ENTITIES: Final = 'addentitiescallback'
 CONF_ENTRY_ID: Final = 'entry_id'
+CONF_PUSH_COALESCE: Final = 'push_coalesce'
+CONF_NATIVE_SERVER: Final = 'native_server'
+CONF_BOARD_INDEX: Final = 'boardindex'
+CONF_ROUTING: Final = 'routing'
+CONF_LIVENESS: Final = 'liveness'
+CONF_LISTENERS: Final = 'listeners'
+CONF_TIMING: Final = 'timing'
+CONF_KNOWN_STORE: Final = 'knownstore'
+CONF_BOARD_CONCURRENCY: Final = 'board_concurrency'
+CONF_COORDINATOR: Final = 'coordinator'
 
 KNOWN_DATA: Final = 'cache'
 KNOWN_DATA_FILE: Final = '/config/.'+DOMAIN+'_'+KNOWN_DATA+'.json'
+KNOWN_LAST_SEEN: Final = 'last_seen'
+KNOWN_FINGERPRINT: Final = 'fingerprint'
+KNOWN_FINGERPRINT_VERSION_KEY: Final = 'version'
+KNOWN_FINGERPRINT_VERSION: Final = 1 #increase if the fingerprint content changes - older fingerprints are ignored
 
 DEFAULT_NAME: Final = 'dScriptModule'
 DEFAULT_PORT: Final = 17123
 DEFAULT_PROTOCOL: Final = "binary"
 DEFAULT_AESKEY: Final = ""
 DEFAULT_LISTENIP: Final = "0.0.0.0"
+DEFAULT_NATIVE_SERVER: Final = False
+DEFAULT_PUSH_COALESCE: Final = 0 #milliseconds - 0 means coalesce within one event loop iteration only
+DEFAULT_BOARD_DEADLINE: Final = 15 #seconds - hard limit for a single board availability probe
+DEFAULT_SERVER_RETRY: Final = 1 #seconds - first retry delay if the server could not be started
+DEFAULT_SERVER_RETRY_MAX: Final = 60 #seconds
+DEFAULT_CLIENT_PIPELINE: Final = 1 #requests written to a board connection before the first answer was read (the board firmware handles one request at a time)
+DEFAULT_BOARD_CONCURRENCY: Final = 1 #requests in flight per board - further requests are queued by priority (> 1 pipelines requests - opt-in)
+DEFAULT_CLIENT_IDLE: Final = 60 #seconds - an unused board connection is closed afterwards
+DEFAULT_CLIENT_CLOSE: Final = 5 #seconds - wait for a dropped board connection to be closed
+DEFAULT_CONFIG_REVALIDATE: Final = 600 #seconds - minimum interval between heartbeat triggered config reads of a board
+DEFAULT_STORE_DELAY: Final = 10 #seconds - debounce of known data cache writes
+DEFAULT_STARTUP_CONCURRENCY: Final = 4 #boards initialized in parallel at startup
+DEFAULT_STARTUP_BOARD_TIMEOUT: Final = 30 #seconds - hard limit for the setup of a single known board
+DEFAULT_POLL_INTERVAL: Final = 30 #seconds - state poll interval of an entity after its state changed
+DEFAULT_POLL_INTERVAL_MIN: Final = 5 #seconds - poll interval right after a command or push
+DEFAULT_POLL_INTERVAL_MAX: Final = 300 #seconds - poll interval of entities with a stable state
+DEFAULT_POLL_BACKOFF: Final = 1.5 #interval factor per poll without state change
+DEFAULT_POLL_JITTER: Final = 0.1 #random +/- share of the interval
+DEFAULT_POLL_BATCH: Final = 5 #seconds - entities of a board due within this window are polled in the same cycle
+DEFAULT_BREAKER_THRESHOLD: Final = 3 #consecutive failed requests until the circuit breaker of a board opens
+DEFAULT_BREAKER_BACKOFF: Final = 10 #seconds - first open period of a board circuit breaker (doubled per failed probe)
+DEFAULT_BREAKER_BACKOFF_MAX: Final = 600 #seconds
+DEFAULT_BREAKER_JITTER: Final = 0.2 #random +/- share of the open period
+DEFAULT_HEALTH_TIMEOUT: Final = 5 #seconds - hard limit for the http health probe of a board
+DEFAULT_TELEMETRY_SIZE: Final = 288 #status samples kept per board (GetStatus about every 5 minutes = 1 day)
+DEFAULT_TELEMETRY_ALPHA: Final = 0.1 #smoothing factor of the telemetry EWMA
+DEFAULT_TELEMETRY_DIAG_SAMPLES: Final = 48 #latest telemetry samples per value within diagnostics
+DEFAULT_TRACE_SIZE: Final = 1000 #trace records kept within the trace ring buffer
+DEFAULT_TRACE_SAMPLE: Final = 1.0 #share of the matching trace records that is kept (1.0 = all)
+DEFAULT_TRACE_DIAG_RECORDS: Final = 100 #latest trace records within diagnostics
+DEFAULT_METRIC_BUCKETS: Final = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000) #milliseconds - upper bounds of the latency histogram buckets (+ overflow bucket)
+DEFAULT_HEARTBEAT_INTERVAL: Final = 60 #seconds - assumed until the interval of a board was learned
+DEFAULT_HEARTBEAT_MISSED: Final = 3 #missed heartbeat intervals until a board is probed for availability
+DEFAULT_LIVENESS_CHECK: Final = 30 #seconds
+DEFAULT_NEGATIVE_CACHE_TTL: Final = 300
 AVAILABLE_PROTOCOLS: Final =  ['modbus','ascii','binary','binaryaes']
 
 CATTR_FW_VERSION: Final =  "firmware"
+CATTR_RTT: Final =  "rtt_ms"
 CATTR_IP_ADDRESS: Final =  "ipaddress"
 CATTR_PROTOCOL: Final =  "protocol"
 CATTR_SW_TYPE: Final =  "custom_app"
@@ -39,9 +89,12 @@ DSCRIPT_TOPICTOENTITYTYPE: Final = {
     "getshutter": "cover",
     "getmotion": "sensor_motion",
     "getbutton": "sensor_button",
-    "getboard_dummy": "sensor_board"
+    "getboard_dummy": "sensor_board",
+    "getmetric_dummy": "sensor_metric"
 }
 
+DSCRIPT_ENTITYTYPETOTOPIC: Final = { v: k for k, v in DSCRIPT_TOPICTOENTITYTYPE.items() }
+
 DSCRIPT_ENTITYTYPETOCOUNTATTR: Final = {
     "light": "_ConnectedLights",
     "switch": "_ConnectedSockets",
@@ -49,5 +102,21 @@ DSCRIPT_ENTITYTYPETOCOUNTATTR: Final = {
     "cover":  "_ConnectedShutters",
     "sensor_motion": "_ConnectedMotionSensors",
     "sensor_button": "_ConnectedButtons",
-    "sensor_board": "_ConnectedBoardSensors"
+    "sensor_board": "_ConnectedBoardSensors",
+    "sensor_metric": "_ConnectedMetricSensors"
+}
+
+# binary push protocol of the boards (same tables as dScriptModule) - topics are the lower case command names
+DSCRIPT_DECIMALCOMMANDS: Final = {
+    48: "getstatus", 49: "setrelay", 50: "setoutput", 51: "getrelay", 52: "getinput", 53: "getanalogue", 54: "getcounter",
+    64: "setlight", 65: "setshutter", 66: "setsocket",
+    80: "getconfig", 81: "getlight", 82: "getshutter", 83: "getsocket", 84: "getmotion", 85: "getbutton",
+    0: "heartbeat", 255: "testonline", 254: "stopserver", 253: "boardrestart"
 }
+
+DSCRIPT_ONOFFSTATES: Final = { 0: "off", 1: "on", 2: "toggle" }
+
+DSCRIPT_EVENTTOPICS: Final = [
+    "heartbeat", "getstatus", "getrelay", "getinput", "getanalogue", "getcounter", "getconfig",
+    "getlight", "getshutter", "getsocket", "getmotion", "getbutton", "testonline"
+]
@@ -0,0 +1,263 @@
+"""Board level state polling of dScriptModule entities."""
+
+from __future__ import annotations
+from typing import Final
+import logging
+import asyncio
+import random
+import time
+import zlib
+
+from homeassistant.core import (
+    HomeAssistant,
+    callback,
+)
+from homeassistant.config_entries import ConfigEntry
+
+from .const import (
+    CONF_ROUTING,
+    DEFAULT_POLL_BACKOFF,
+    DEFAULT_POLL_BATCH,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_POLL_INTERVAL_MAX,
+    DEFAULT_POLL_INTERVAL_MIN,
+    DEFAULT_POLL_JITTER,
+    DOMAIN,
+)
+
+from .metrics import (
+    METRIC_ERRORS,
+    METRIC_POLL_DURATION,
+)
+from .tracing import (
+    TRACER,
+    TOPIC_POLL,
+)
+from .utils import dScript_WriteBoardStates
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+def _jitter(interval: float) -> float:
+    """Return the interval randomly stretched or shortened by the jitter share"""
+    return interval * random.uniform(1 - DEFAULT_POLL_JITTER, 1 + DEFAULT_POLL_JITTER)
+
+
+class dScriptPollCoordinator(object):
+    """Poll the states of the routed entities of a board within one cycle and fan them out to the entities
+
+    Every board runs its own timer with a phase offset derived from its MAC address. The poll interval
+    of an entity backs off while its state is stable and tightens after commands and pushes.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry, interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        """Initialize the object."""
+        self.hass = hass
+        self._entry = entry
+        self._entry_id = entry.entry_id
+        self._interval = interval
+        self._running = False
+        self._boards = {}
+        self._handles = {}
+        self._scheduled = {}
+        self._cycles = {}
+        self._entities = {}
+        self._stats = {}
+
+    @callback
+    def async_start(self) -> None:
+        """Start the poll timers of all added boards"""
+        self._running = True
+        for dSBoard in self._boards.values():
+            self._async_schedule(dSBoard, time.monotonic() + self._phase(dSBoard))
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop all poll timers and running board cycles"""
+        self._running = False
+        for handle in self._handles.values():
+            handle.cancel()
+        self._handles = {}
+        self._scheduled = {}
+        for task in self._cycles.values():
+            if not task.done():
+                task.cancel()
+        self._cycles = {}
+        for dSBoard in self._boards.values():
+            dSBoard._command_callback = None
+            dSBoard._availability_callback = None
+
+    @callback
+    def async_add_board(self, dSBoard) -> None:
+        """Start polling a board - its first cycle is delayed by the phase offset of the board"""
+        self._boards[dSBoard.MACAddress] = dSBoard
+        self._stats.setdefault(dSBoard.MACAddress, { "cycles": 0, "skipped": 0, "requests": 0, "failed": 0, "changed": 0, "duration_last": 0.0, "duration_max": 0.0 })
+        dSBoard._command_callback = self.async_board_command
+        dSBoard._availability_callback = self.async_board_unavailable
+        if self._running:
+            self._async_schedule(dSBoard, time.monotonic() + self._phase(dSBoard))
+
+    @callback
+    def async_remove_board(self, dSBoard) -> None:
+        """Stop polling a removed board and drop its poll state"""
+        mac = dSBoard.MACAddress
+        handle = self._handles.pop(mac, None)
+        if not handle is None:
+            handle.cancel()
+        self._scheduled.pop(mac, None)
+        task = self._cycles.pop(mac, None)
+        if not task is None and not task.done():
+            task.cancel()
+        self._stats.pop(mac, None)
+        if self._boards.get(mac, None) is dSBoard:
+            self._boards.pop(mac)
+        dSBoard._command_callback = None
+        dSBoard._availability_callback = None
+
+    def _phase(self, dSBoard) -> float:
+        """Return the fixed offset of a board within the poll interval"""
+        return (zlib.crc32(dSBoard.MACAddress.encode()) % 1000) / 1000 * self._interval
+
+    @callback
+    def _async_schedule(self, dSBoard, when: float) -> None:
+        """(Re)schedule the next cycle of a board to a monotonic time - an earlier existing schedule is kept"""
+        mac = dSBoard.MACAddress
+        handle = self._handles.get(mac, None)
+        if not handle is None:
+            if self._scheduled.get(mac, 0) <= when:
+                return None
+            handle.cancel()
+        self._scheduled[mac] = when
+        self._handles[mac] = self.hass.loop.call_later(max(0, when - time.monotonic()), self._async_board_due, mac)
+
+    @callback
+    def _async_board_due(self, mac: str) -> None:
+        """Start the cycle of a board whose first entity is due"""
+        self._handles.pop(mac, None)
+        dSBoard = self._boards.get(mac, None)
+        if dSBoard is None or not self._running:
+            return None
+        if not dSBoard.available == True or not dSBoard.breaker.closed:
+            self._async_schedule(dSBoard, time.monotonic() + _jitter(self._interval))
+            return None
+        self.async_request_refresh(dSBoard, False)
+
+    @callback
+    def async_request_refresh(self, dSBoard, force: bool = True) -> asyncio.Task:
+        """Start a poll cycle of a board (force: poll all entities, not only the due ones) - returns the already running cycle if there is one"""
+        stats = self._stats.setdefault(dSBoard.MACAddress, { "cycles": 0, "skipped": 0, "requests": 0, "failed": 0, "changed": 0, "duration_last": 0.0, "duration_max": 0.0 })
+        task = self._cycles.get(dSBoard.MACAddress, None)
+        if not task is None and not task.done():
+            stats["skipped"] += 1
+            return task
+        task = self.hass.async_create_task(self.async_refresh_board(dSBoard, force))
+        self._cycles[dSBoard.MACAddress] = task
+        return task
+
+    @callback
+    def async_board_command(self, dSBoard, command: str, arguments: list) -> None:
+        """Tighten the poll interval of the entity addressed by a Set* command of a board"""
+        if not arguments:
+            return None
+        entity = self.hass.data[DOMAIN][self._entry_id][CONF_ROUTING].get((dSBoard.MACAddress, 'get' + command[3:].lower(), arguments[0]))
+        if not entity is None:
+            self.async_tighten(entity)
+
+    @callback
+    def async_board_unavailable(self, dSBoard) -> None:
+        """Write the (unavailable) states of all entities of a board whose circuit breaker opened"""
+        dScript_WriteBoardStates(self.hass, self._entry, dSBoard.MACAddress)
+
+    @callback
+    def async_tighten(self, entity) -> None:
+        """Poll an entity soon after a command or push - the interval backs off again while its state is stable"""
+        poll = self._entity(entity)
+        poll["interval"] = DEFAULT_POLL_INTERVAL_MIN
+        poll["due"] = min(poll["due"], time.monotonic() + DEFAULT_POLL_INTERVAL_MIN)
+        if self._running and entity._board.MACAddress in self._boards and entity.needs_poll:
+            self._async_schedule(entity._board, poll["due"])
+
+    @callback
+    def async_forget(self, entity) -> None:
+        """Drop the poll state of a removed entity"""
+        self._entities.pop(entity.uniqueid, None)
+
+    def _entity(self, entity) -> dict:
+        """Return the poll state of an entity - new entities are due at the phase of their board"""
+        poll = self._entities.get(entity.uniqueid, None)
+        if poll is None:
+            now = time.monotonic()
+            poll = { "interval": self._interval, "due": now, "polls": 0, "changes": 0, "since": now }
+            self._entities[entity.uniqueid] = poll
+        return poll
+
+    async def async_refresh_board(self, dSBoard, force: bool = True) -> int:
+        """Async: Read the states of the (due) entities of a board requiring a poll - returns the number of requests sent"""
+        try:
+            now = time.monotonic()
+            routed = self.hass.data[DOMAIN][self._entry_id][CONF_ROUTING].entities(dSBoard.MACAddress)
+            entities = [ entity for entity in routed
+                if not entity._poll_method is None and not getattr(entity, 'platform', None) is None and entity.needs_poll
+                and (force or self._entity(entity)["due"] <= now + DEFAULT_POLL_BATCH) ]
+            stats = self._stats[dSBoard.MACAddress]
+            if entities:
+                # all requests are queued at once - the board scheduler sends them pipelined over the board connection
+                previous = [ entity._state for entity in entities ]
+                results = await asyncio.gather(*[ getattr(dSBoard, entity._poll_method)(entity._identifier) for entity in entities ], return_exceptions=True)
+                for entity, state, before in zip(entities, results, previous):
+                    if isinstance(state, Exception):
+                        stats["failed"] += 1
+                        dSBoard.metrics.count(METRIC_ERRORS)
+                    entity.async_handle_poll(state)
+                    changed = not entity._state == before
+                    if changed:
+                        stats["changed"] += 1
+                    self._async_polled(entity, changed)
+                duration = time.monotonic() - now
+                stats["cycles"] += 1
+                stats["requests"] += len(entities)
+                stats["duration_last"] = round(duration, 4)
+                stats["duration_max"] = round(max(stats["duration_max"], duration), 4)
+                dSBoard.metrics.observe(METRIC_POLL_DURATION, duration)
+                if TRACER.enabled:
+                    TRACER.trace(dSBoard, TOPIC_POLL, "coordinator cycle", entities=len(entities), duration=stats["duration_last"], force=force)
+            self._async_schedule_next(dSBoard, routed)
+            return len(entities)
+        except Exception as e:
+            _LOGGER.error("%s - %s: dScriptPollCoordinator async_refresh_board failed for %s: %s (%s.%s)", self._entry_id, DOMAIN, dSBoard.name, str(e), e.__class__.__module__, type(e).__name__)
+            if self._running:
+                self._async_schedule(dSBoard, time.monotonic() + _jitter(self._interval))
+            return 0
+
+    @callback
+    def _async_polled(self, entity, changed: bool) -> None:
+        """Adapt the poll interval of an entity - back off while stable, return to the default interval on change"""
+        poll = self._entity(entity)
+        poll["polls"] += 1
+        if changed:
+            poll["changes"] += 1
+            poll["interval"] = min(poll["interval"], self._interval)
+        else:
+            poll["interval"] = min(poll["interval"] * DEFAULT_POLL_BACKOFF, DEFAULT_POLL_INTERVAL_MAX)
+        poll["due"] = time.monotonic() + _jitter(poll["interval"])
+
+    @callback
+    def _async_schedule_next(self, dSBoard, routed: list) -> None:
+        """Schedule the next cycle of a board to its first due entity (default interval if none requires a poll)"""
+        if not self._running or not dSBoard.MACAddress in self._boards:
+            return None
+        due = [ self._entity(entity)["due"] for entity in routed if not entity._poll_method is None and entity.needs_poll ]
+        if due:
+            self._async_schedule(dSBoard, max(min(due), time.monotonic() + DEFAULT_POLL_INTERVAL_MIN))
+        else:
+            self._async_schedule(dSBoard, time.monotonic() + _jitter(self._interval))
+
+    def stats(self) -> dict:
+        """Return the poll statistics per board"""
+        return { mac: dict(stats) for mac, stats in self._stats.items() }
+
+    def rates(self) -> dict:
+        """Return the current interval and the effective poll rate (polls per hour) per entity"""
+        now = time.monotonic()
+        return { uniqueid: { "interval": round(poll["interval"], 1), "polls": poll["polls"], "changes": poll["changes"], "polls_per_hour": round(poll["polls"] * 3600 / max(now - poll["since"], 1), 1) }
+            for uniqueid, poll in self._entities.items() if poll["polls"] > 0 }
@@ -33,6 +33,11 @@ from .const import(
     DOMAIN,
 )
 
+from .tracing import (
+    TRACER,
+    TOPIC_POLL,
+    dScript_TraceError,
+)
 from .utils import(
     async_dScript_setup_entry,
 )
@@ -40,6 +45,7 @@ from .utils import(
 
 _LOGGER: Final = logging.getLogger(__name__)
 PLATFORM = 'cover'
+POSITION_KIND = 'cover_position'
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry, async_add_entities: AddEntitiesCallback) -> None:
     """Async: Set up the cover platform."""
@@ -50,7 +56,7 @@ class dScriptCover(CoverEntity, dScriptPlatformEntity):
     """The class for dScriptModule covers."""
     
     _platform = PLATFORM
-    _attr_current_cover_position = None
+    _poll_method = 'async_GetShutter'
     _attr_supported_features = CoverEntityFeature.OPEN | CoverEntityFeature.CLOSE | CoverEntityFeature.STOP | CoverEntityFeature.SET_POSITION
     _device_class = CoverDeviceClass.SHUTTER
 
@@ -65,11 +71,30 @@ class dScriptCover(CoverEntity, dScriptPlatformEntity):
             fallback_state = state[1]
             state = state[0]
         else: fallback_state = state
-        if isinstance(state, int): self._attr_current_cover_position = state
+        if isinstance(state, int): self._position = state
         if state == 100: return STATE_OPEN
         elif state == 0: return STATE_CLOSED        
         else: return fallback_state
     
+    def _poll_post_process(self, state):
+        """Platform specific post processing of a polled state"""
+        return self._state_post_process(state)
+
+    @property
+    def _position(self) -> int | None:
+        """Return the position of the cover - kept within the state table of its board"""
+        return self._board.states.get(POSITION_KIND, self._identifier, None)
+
+    @_position.setter
+    def _position(self, position: int | None) -> None:
+        """Write the position of the cover to the state table of its board"""
+        self._board.states.set(POSITION_KIND, self._identifier, position)
+
+    @property
+    def current_cover_position(self) -> int | None:
+        """Return the current position of the cover (0 closed, 100 open)."""
+        return self._position
+
     @property
     def is_opening(self) -> bool:
         """Return true if the cover is currently opening."""
@@ -81,7 +106,7 @@ class dScriptCover(CoverEntity, dScriptPlatformEntity):
     def is_open(self) -> bool:
         """Return true if the cover is open."""
         #_LOGGER.debug("%s - %s: is_open", self._board.friendlyname, self._name)        
-        if self._attr_current_cover_position == 100: return True
+        if self._position == 100: return True
         return False
 
     @property
@@ -95,7 +120,7 @@ class dScriptCover(CoverEntity, dScriptPlatformEntity):
     def is_closed(self) -> bool:
         """Return true if the cover is open."""
         #_LOGGER.debug("%s - %s: is_open", self._board.friendlyname, self._name)        
-        if self._attr_current_cover_position == 0: return True
+        if self._position == 0: return True
         return False
 
     async def async_stop_cover(self, **kwargs) -> None:
@@ -146,28 +171,17 @@ class dScriptCover(CoverEntity, dScriptPlatformEntity):
             state = self._state_post_process(state)
             self._state = state
             self.async_write_ha_state()
-            _LOGGER.debug("%s - %s: async_local_poll complete: %s", self._board.friendlyname, self._name, state)
+            if TRACER.enabled:
+                TRACER.trace(self._board, TOPIC_POLL, "local poll complete", entity=self.uniqueid, state=state)
         except TypeError as e:
-            _LOGGER.debug("%s - %s.%s: async_local_poll known exception: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
+            if TRACER.enabled:
+                TRACER.trace(self._board, TOPIC_POLL, "local poll known exception", entity=self.uniqueid, error=lambda: dScript_TraceError(e))
             self._state = STATE_UNKNOWN
             self.async_write_ha_state()
         except OSError as e:
-            _LOGGER.debug("%s - %s.%s: async_local_poll known exception: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
+            if TRACER.enabled:
+                TRACER.trace(self._board, TOPIC_POLL, "local poll known exception", entity=self.uniqueid, error=lambda: dScript_TraceError(e))
             self._state = STATE_UNKNOWN
             self.async_write_ha_state()
         except Exception as e:
             _LOGGER.error("%s - %s.%s: async_local_poll failed: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
- 
-    async def async_local_push(self, state=None) -> None:
-        """Async: Get the latest status from device after an update was pushed"""
-        try:
-            #_LOGGER.debug("%s - %s.%s: async_local_push: %s", self._entry_id, self._board.name, self.uniqueid, state) 
-            if not state is None:                    
-                state = self._state_post_process(state)
-                self._state = state
-                self.async_write_ha_state()
-                _LOGGER.debug("%s - %s.%s: async_local_push complete: %s", self._entry_id, self._board.name, self.uniqueid, state) 
-            else:
-                await self.hass.async_create_task(self.async_local_poll())
-        except Exception as e:
-            _LOGGER.error("%s - %s.%s: async_local_push failed: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
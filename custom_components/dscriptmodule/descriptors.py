@@ -0,0 +1,70 @@
+"""Memoized per board descriptors of dScriptModule entities."""
+
+from __future__ import annotations
+from typing import Final
+import logging
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+_MISSING: Final = object()
+
+
+class dScriptBoardDescriptors(object):
+    """Values derived from the (rarely changing) identity of a board - device info, suggested area, entity counts ...
+
+    The cache is dropped as soon as the firmware, the IP address or the name of the board changes
+    or a config read returned a different config fingerprint.
+    """
+
+    def __init__(self, dSBoard) -> None:
+        """Initialize the object."""
+        self._board = dSBoard
+        self._key = None
+        self._config = None
+        self._revision = 0
+        self._cache = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "invalidated": 0,
+        }
+
+    def _identity(self) -> tuple:
+        """Return the cheap part of the board identity - checked on every access"""
+        board = self._board
+        return (self._revision, board.MACAddress, board.IP, board.friendlyname, board._HostName, board._ModuleID, board._Protocol, board._CustomFirmeware,
+            board._SystemFirmwareMajor, board._SystemFirmwareMinor, board._ApplicationFirmwareMajor, board._ApplicationFirmwareMinor)
+
+    def refresh_config(self) -> bool:
+        """Compare the config fingerprint of the board with the cached one - returns True (and invalidates) if it changed"""
+        config = self._board.config_fingerprint()
+        if config == self._config:
+            return False
+        self._config = config
+        self.invalidate()
+        return True
+
+    def invalidate(self) -> None:
+        """Drop all cached descriptors with the next access"""
+        self._revision += 1
+
+    def get(self, name, factory):
+        """Return the cached descriptor - factory (without arguments) builds it on a miss"""
+        key = self._identity()
+        if not key == self._key:
+            if self._cache:
+                _LOGGER.debug("%s: dScriptBoardDescriptors: board identity changed - drop %s descriptors", self._board.IP, len(self._cache))
+                self.stats["invalidated"] += 1
+            self._cache = {}
+            self._key = key
+        value = self._cache.get(name, _MISSING)
+        if value is _MISSING:
+            self.stats["misses"] += 1
+            value = self._cache[name] = factory()
+        else:
+            self.stats["hits"] += 1
+        return value
+
+    def as_dict(self) -> dict:
+        """Return the cache statistics for diagnostics"""
+        return dict(self.stats, cached=len(self._cache))
@@ -14,10 +14,22 @@ import asyncio
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_DEVICES
 
 from .const import (
+    CONF_BOARD_INDEX,
+    CONF_COORDINATOR,
+    CONF_KNOWN_STORE,
+    CONF_LIVENESS,
+    CONF_PYOJBECT,
+    CONF_ROUTING,
+    CONF_SERVER,
+    CONF_TIMING,
+    DEFAULT_TELEMETRY_DIAG_SAMPLES,
+    DEFAULT_TRACE_DIAG_RECORDS,
     DOMAIN,
 )
+from .tracing import TRACER
 
 REDACT_CONFIG = {'dummy1', 'dummy2' }
 REDACT_DOMAIN_DATA = {'dummy1', 'dummy2' }
@@ -42,6 +54,45 @@ async def async_get_config_entry_diagnostics( hass: HomeAssistant, entry: Config
         _LOGGER.error("%s - async_get_config_entry_diagnostics %s: Add domain data failed: %s (%s.%s)", entry.entry_id, platform, str(e), e.__class__.__module__, type(e).__name__)
         return diag
 
+    try:
+        _LOGGER.debug("%s - async_get_config_entry_diagnostics %s: Add server ingress and lookup statistics", entry.entry_id, platform)
+        BuiltInServer = hass.data[DOMAIN][entry.entry_id].get(CONF_SERVER, {}).get(CONF_PYOJBECT, None)
+        if not BuiltInServer is None:
+            diag["server"] = { "serving": BuiltInServer.dScriptServer.State, "ready_after": BuiltInServer.server_stats["ready_after"], "start_failures": BuiltInServer.server_stats["start_failures"], "shared_by": len(BuiltInServer.listener._subscribers) }
+            diag["ingress"] = dict(BuiltInServer.ingress_stats)
+        Timeline = hass.data[DOMAIN][entry.entry_id].get(CONF_TIMING, None)
+        if not Timeline is None:
+            diag["startup"] = { k: v for k, v in Timeline.items() if not k == "started" }
+        KnownStore = hass.data[DOMAIN].get(CONF_KNOWN_STORE, None)
+        if not KnownStore is None:
+            diag["known_data_store"] = dict(KnownStore.stats)
+        BoardIndex = hass.data[DOMAIN][entry.entry_id].get(CONF_BOARD_INDEX, None)
+        if not BoardIndex is None:
+            diag["board_index"] = dict(BoardIndex.stats)
+        Devices = hass.data[DOMAIN][entry.entry_id].get(CONF_DEVICES, {})
+        diag["board_connections"] = { mac: dict(board_entry[CONF_PYOJBECT]._client.stats) for mac, board_entry in Devices.items() if not getattr(board_entry.get(CONF_PYOJBECT, None), '_client', None) is None }
+        diag["board_scheduler"] = { mac: board_entry[CONF_PYOJBECT].scheduler.as_dict() for mac, board_entry in Devices.items() if hasattr(board_entry.get(CONF_PYOJBECT, None), 'scheduler') }
+        diag["board_breakers"] = { mac: board_entry[CONF_PYOJBECT].breaker.as_dict() for mac, board_entry in Devices.items() if hasattr(board_entry.get(CONF_PYOJBECT, None), 'breaker') }
+        diag["board_telemetry"] = { mac: board_entry[CONF_PYOJBECT].telemetry.as_dict(DEFAULT_TELEMETRY_DIAG_SAMPLES) for mac, board_entry in Devices.items() if hasattr(board_entry.get(CONF_PYOJBECT, None), 'telemetry') }
+        diag["board_states"] = { mac: board_entry[CONF_PYOJBECT].states.as_dict() for mac, board_entry in Devices.items() if hasattr(board_entry.get(CONF_PYOJBECT, None), 'states') }
+        diag["board_descriptors"] = { mac: board_entry[CONF_PYOJBECT].descriptors.as_dict() for mac, board_entry in Devices.items() if hasattr(board_entry.get(CONF_PYOJBECT, None), 'descriptors') }
+        diag["board_metrics"] = { mac: board_entry[CONF_PYOJBECT].metrics.as_dict() for mac, board_entry in Devices.items() if hasattr(board_entry.get(CONF_PYOJBECT, None), 'metrics') }
+        diag["tracing"] = TRACER.as_dict(DEFAULT_TRACE_DIAG_RECORDS)
+        diag["config_validation"] = { mac: dict(board_entry[CONF_PYOJBECT].config_stats) for mac, board_entry in Devices.items() if hasattr(board_entry.get(CONF_PYOJBECT, None), 'config_stats') }
+        Liveness = hass.data[DOMAIN][entry.entry_id].get(CONF_LIVENESS, None)
+        if not Liveness is None:
+            diag["liveness"] = Liveness.stats()
+        Coordinator = hass.data[DOMAIN][entry.entry_id].get(CONF_COORDINATOR, None)
+        if not Coordinator is None:
+            diag["board_polling"] = Coordinator.stats()
+            diag["poll_rates"] = Coordinator.rates()
+        Routing = hass.data[DOMAIN][entry.entry_id].get(CONF_ROUTING, None)
+        if not Routing is None:
+            diag["push_coalescing"] = { e.entity_id: { "written": e._push_written, "merged": e._push_merged } for e in Routing.all() if e._push_written > 0 }
+    except Exception as e:
+        _LOGGER.error("%s - async_get_config_entry_diagnostics %s: Add server ingress and lookup statistics failed: %s (%s.%s)", entry.entry_id, platform, str(e), e.__class__.__module__, type(e).__name__)
+        return diag
+
     try:
         _LOGGER.debug("%s - async_get_config_entry_diagnostics %s: Add python module [dScriptModule] version", entry.entry_id, platform)
         diag["dScriptModule_module"] = version('dScriptModule')
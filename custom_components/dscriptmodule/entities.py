@@ -4,6 +4,7 @@ from __future__ import annotations
 from typing import Final
 import logging
 import asyncio
+import time
 
 from homeassistant.core import (
     HomeAssistant,
@@ -16,6 +17,7 @@ from homeassistant.helpers.entity import (
     generate_entity_id,
 )
 from homeassistant.const import (
+    CONF_DEVICES,
     CONF_FRIENDLY_NAME,
     CONF_NAME,
     STATE_UNKNOWN,
@@ -23,9 +25,21 @@ from homeassistant.const import (
 
 from .const import (
     DOMAIN,
+    CONF_COORDINATOR,
+    CONF_PUSH_COALESCE,
+    CONF_ROUTING,
+    DEFAULT_PUSH_COALESCE,
     DSCRIPT_ENTITYTYPETOCOUNTATTR,
+    DSCRIPT_ENTITYTYPETOTOPIC,
     MANUFACTURER,
 )
+from .metrics import METRIC_PUSH_LATENCY
+from .tracing import (
+    TRACER,
+    TOPIC_POLL,
+    TOPIC_PUSH,
+    dScript_TraceError,
+)
 
 _LOGGER: Final = logging.getLogger(__name__)
 
@@ -52,11 +66,18 @@ def create_entity_id(dSBoard: dScriptBoardHA, identifier: int, dSEntityType: str
 class dScriptPlatformEntity(Entity):
     """Base class for Govee Life integration."""
     
-    _state = STATE_UNKNOWN
     _device_class = None
-    _attributes = {}
+    _attributes = None
     _icon = None
     _name = None
+    _push_window = 0
+    _push_pending = None
+    _push_handle = None
+    _push_written = 0
+    _push_merged = 0
+    _push_received = 0.0
+    _push_coalesce = True #level states only - pushed events (e.g. button presses) are written one by one
+    _poll_method = None #board method reading the state of the entity - such entities are polled by the board coordinator
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry, dSBoard: dScriptBoardHA, identifier: int, dSEntityType: str, **kwargs) -> None:
         """Initialize the object."""
@@ -69,12 +90,15 @@ class dScriptPlatformEntity(Entity):
             self._identifier = identifier
             self._board = dSBoard
             self._dSEntityType = dSEntityType
+            self._attributes = {}
             self._entity_id = create_entity_id(self._board, self._identifier, self._dSEntityType)
+            self._push_window = float(self._entry.data.get(CONF_PUSH_COALESCE, DEFAULT_PUSH_COALESCE)) / 1000
 
             #_LOGGER.debug("%s - %s %s%s: __init__ kwargs = %s", self._entry_id, self._board.name, self._dSEntityType, self._identifier, kwargs)
             self._init_platform_specific(**kwargs)
             self.entity_id = generate_entity_id(self._platform+'.{}', self._entity_id, hass=hass)
             self.uniqueid = create_entity_unique_id(self._board, self._identifier, self._dSEntityType)
+            self.route_key = (self._board.MACAddress, DSCRIPT_ENTITYTYPETOTOPIC[self._dSEntityType], self._identifier)
             #_LOGGER.debug("%s - %s %s: __init__ complete: %s", self._entry_id self._board.name, self.uniqueid, self.entity_id)
         except Exception as e:            
             _LOGGER.error("%s - %s %s%s: __init__ failed: %s (%s.%s)", entry.entry_id, str(dSBoard.name), str(dSEntityType), str(identifier), str(e), e.__class__.__module__, type(e).__name__)
@@ -95,6 +119,24 @@ class dScriptPlatformEntity(Entity):
         return state
 
 
+    def _poll_post_process(self, state):
+        """Platform specific post processing of a polled state"""
+        #do nothing here as this is only a drop-in option for other platforms
+        #do not put actions in a try / except block - execeptions should be covered by calling function
+        return state
+
+
+    @property
+    def _state(self):
+        """Return the raw state of the entity - kept within the state table of its board"""
+        return self._board.states.get(self._dSEntityType, self._identifier, STATE_UNKNOWN)
+
+    @_state.setter
+    def _state(self, state) -> None:
+        """Write the raw state of the entity to the state table of its board"""
+        self._board.states.set(self._dSEntityType, self._identifier, state)
+
+
     @property
     def name(self) -> str | None:
         """Return the name of the entity."""
@@ -145,16 +187,24 @@ class dScriptPlatformEntity(Entity):
         #_LOGGER.debug("%s - %s.%s: available", self._entry_id, self._board.name, self.uniqueid)
         if not self._board.available:
             return False
-        if self._dSEntityType == 'switch' and not self._board._CustomFirmeware: pattr = DSCRIPT_ENTITYTYPETOCOUNTATTR['switch_native']
-        else: pattr=DSCRIPT_ENTITYTYPETOCOUNTATTR[self._dSEntityType]
-        if getattr(self._board, pattr, 0) < self._identifier:
+        if self._board.descriptors.get(('count', self._dSEntityType), self._entity_count) < self._identifier:
             return False
         return True
 
+    def _entity_count(self) -> int:
+        """Return the number of entities of this type the board reports"""
+        if self._dSEntityType == 'switch' and not self._board._CustomFirmeware: pattr = DSCRIPT_ENTITYTYPETOCOUNTATTR['switch_native']
+        else: pattr=DSCRIPT_ENTITYTYPETOCOUNTATTR[self._dSEntityType]
+        return getattr(self._board, pattr, 0)
+
     @property
     def device_info(self) -> DeviceInfo:
         """Return a device description for device registry."""
         #_LOGGER.debug("%s - %s.%s: device_info", self._entry_id, self._board.name, self.uniqueid)
+        return self._board.descriptors.get('device_info', self._device_info)
+
+    def _device_info(self) -> DeviceInfo:
+        """Build the device description of the board (memoized per board)"""
         info = DeviceInfo(
             identifiers={(DOMAIN, self._board.MACAddress)},
             manufacturer=MANUFACTURER,
@@ -168,9 +218,9 @@ class dScriptPlatformEntity(Entity):
         return info
 
     @property
-    def should_poll(self) -> bool:
-        """Return True if polling is needed."""    
-        #_LOGGER.debug("%s - %s.%s: should_poll", self._entry_id, self._board.name, self.uniqueid)
+    def needs_poll(self) -> bool:
+        """Return True if the state has to be polled from the board."""
+        #_LOGGER.debug("%s - %s.%s: needs_poll", self._entry_id, self._board.name, self.uniqueid)
         if self._state == STATE_UNKNOWN:
             return True
         elif self._board._CustomFirmeware == True:
@@ -178,15 +228,95 @@ class dScriptPlatformEntity(Entity):
         else:
             return True
 
+    @property
+    def should_poll(self) -> bool:
+        """Return True if polling by home assistant is needed (entities with a poll method are polled per board)."""    
+        if not self._poll_method is None:
+            return False
+        return self.needs_poll
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Async: Drop the push route and references of this entity when removed from home assistant"""
+        try:
+            if not self._push_handle is None:
+                self._push_handle.cancel()
+                self._push_handle = None
+            entry_data = self.hass.data[DOMAIN].get(self._entry_id, {})
+            if CONF_ROUTING in entry_data:
+                entry_data[CONF_ROUTING].remove(self)
+            if CONF_COORDINATOR in entry_data:
+                entry_data[CONF_COORDINATOR].async_forget(self)
+            board_entry = entry_data.get(CONF_DEVICES, {}).get(self._board.MACAddress, {})
+            if board_entry.get(self.uniqueid, None) is self:
+                board_entry.pop(self.uniqueid)
+        except Exception as e:
+            _LOGGER.error("%s - %s.%s: async_will_remove_from_hass failed: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
+
+    @callback
+    def async_handle_poll(self, state) -> bool:
+        """Apply a state polled by the board coordinator - returns True if the state was written"""
+        try:
+            if isinstance(state, OSError):
+                if TRACER.enabled:
+                    TRACER.trace(self._board, TOPIC_POLL, "known exception", entity=self.uniqueid, error=lambda: dScript_TraceError(state))
+                state = STATE_UNKNOWN
+            elif isinstance(state, Exception):
+                raise state
+            else:
+                try:
+                    state = self._poll_post_process(state)
+                except TypeError:
+                    state = STATE_UNKNOWN
+            self._state = state
+            self.async_write_ha_state()
+            return True
+        except Exception as e:
+            _LOGGER.error("%s - %s.%s: async_handle_poll failed: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
+            return False
+
+    @callback
+    def async_handle_push(self, state) -> None:
+        """Queue a pushed state - only the latest state within the coalescing window is written (events are written immediately)"""
+        self._push_pending = state
+        coordinator = self.hass.data[DOMAIN].get(self._entry_id, {}).get(CONF_COORDINATOR, None)
+        if not coordinator is None:
+            coordinator.async_tighten(self)
+        if not self._push_coalesce:
+            self._push_received = time.monotonic()
+            self.async_flush_push()
+            return None
+        if not self._push_handle is None:
+            self._push_merged += 1
+            return None
+        self._push_received = time.monotonic()
+        if self._push_window > 0:
+            self._push_handle = self.hass.loop.call_later(self._push_window, self.async_flush_push)
+        else:
+            self._push_handle = self.hass.loop.call_soon(self.async_flush_push)
+
+    @callback
+    def async_flush_push(self) -> None:
+        """Write the latest pushed state (end of coalescing window)"""
+        try:
+            state = self._push_pending
+            self._push_pending = None
+            self._push_handle = None
+            state = self._state_post_process(state)
+            self._state = state
+            self.async_write_ha_state()
+            self._push_written += 1
+            self._board.metrics.observe(METRIC_PUSH_LATENCY, time.monotonic() - self._push_received)
+            if TRACER.enabled:
+                TRACER.trace(self._board, TOPIC_PUSH, "flush push complete", entity=self.uniqueid, state=state, merged=self._push_merged)
+        except Exception as e:
+            _LOGGER.error("%s - %s.%s: async_flush_push failed: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
+
     async def async_local_push(self, state=None) -> None:
         """Async: Get the latest status from device after an update was pushed"""
         try:
-            #_LOGGER.debug("%s - %s.%s: async_local_push: %s", self._entry_id, self._board.name, self.uniqueid, state) 
+            #_LOGGER.debug("%s - %s.%s: async_local_push: %s", self._entry_id, self._board.name, self.uniqueid, state)
             if not state is None:
-                state = self._state_post_process(state)
-                self._state = state
-                self.async_write_ha_state()
-                _LOGGER.debug("%s - %s.%s: async_local_push complete: %s", self._entry_id, self._board.name, self.uniqueid, state) 
+                self.async_handle_push(state)
             else:
                 await self.hass.async_create_task(self.async_local_poll())
         except Exception as e:
@@ -196,7 +326,13 @@ class dScriptPlatformEntity(Entity):
         """Async: Get latest data and states from the device."""
         try:
             #_LOGGER.debug("%s - %s.%s: async_update", self._entry_id, self._board.name, self.uniqueid)
-            if self.should_poll:
+            if self._board.available is None:
+                #board created from cache and not yet connected - it is updated after reconciliation
+                pass
+            elif not self._board.breaker.closed:
+                #board unreachable - no I/O until the circuit breaker probe succeeded
+                pass
+            elif self.needs_poll:
                 #_LOGGER.debug("%s - %s.%s: async_update is done via poll - initiate", self._entry_id, self._board.name, self.uniqueid)
                 await self.hass.async_create_task(self.async_local_poll())
             else:
@@ -0,0 +1,308 @@
+"""Shared dScriptServer listeners used by all config entries of the same address"""
+
+from __future__ import annotations
+from typing import Final
+from collections import deque
+import logging
+import asyncio
+import time
+
+from homeassistant.core import (
+    HomeAssistant,
+    callback,
+)
+from homeassistant.const import (
+    CONF_PORT,
+    CONF_PROTOCOL,
+    EVENT_HOMEASSISTANT_STOP,
+)
+
+from dScriptModule import dScriptServer
+from .native_server import (
+    NATIVE_PROTOCOLS,
+    dScriptNativeServer,
+)
+from .const import (
+    CONF_AESKEY,
+    CONF_BOARD_INDEX,
+    CONF_LISTENERS,
+    CONF_LISTENIP,
+    CONF_NATIVE_SERVER,
+    DEFAULT_NATIVE_SERVER,
+    DEFAULT_SERVER_RETRY,
+    DEFAULT_SERVER_RETRY_MAX,
+    DOMAIN,
+)
+from .utils import (
+    dScript_GetBoardByIP,
+    async_dScript_GetBoardByIP,
+)
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+LISTENER_TOPICS: Final = ['heartbeat', 'getconfig', 'getlight', 'getsocket', 'getshutter', 'getmotion', 'getbutton']
+
+
+def dScript_ListenerKey(conf_params) -> tuple:
+    """Return the key of the listener serving a config entry: (listen ip, port)"""
+    return (conf_params.get(CONF_LISTENIP), conf_params.get(CONF_PORT))
+
+
+def dScript_AcquireListener(hass: HomeAssistant, BuiltInServer) -> dScriptListener:
+    """Return the shared listener for the address of a config entry and subscribe the entry to it"""
+    listeners = hass.data[DOMAIN].setdefault(CONF_LISTENERS, {})
+    conf_params = BuiltInServer._entry.data
+    key = dScript_ListenerKey(conf_params)
+    listener = listeners.get(key, None)
+    if listener is None:
+        listener = dScriptListener(hass, key, conf_params)
+        listeners[key] = listener
+    elif not listener.compatible(conf_params):
+        raise Exception("Listener %s:%s is already used with a different protocol / aes key" % key)
+    listener.subscribe(BuiltInServer)
+    return listener
+
+
+async def async_dScript_ReleaseListener(hass: HomeAssistant, BuiltInServer) -> None | bool:
+    """Async: Unsubscribe a config entry from its listener - the listener is stopped with its last subscriber"""
+    listeners = hass.data[DOMAIN].get(CONF_LISTENERS, {})
+    listener = BuiltInServer.listener
+    if listener.unsubscribe(BuiltInServer) > 0:
+        return None
+    listeners.pop(listener.key, None)
+    if not listeners:
+        hass.data[DOMAIN].pop(CONF_LISTENERS, None)
+    return await listener.async_stop("integration_unload")
+
+
+class dScriptListener(object):
+    """A single dScriptServer socket shared by all config entries listening on the same address"""
+
+    def __init__(self, hass: HomeAssistant, key: tuple, conf_params) -> None:
+        """Initialize the object."""
+        _LOGGER.debug("%s - %s:%s: dScriptListener __init__", DOMAIN, key[0], key[1])
+        self.hass = hass
+        self.key = key
+        self._protocol = conf_params.get(CONF_PROTOCOL)
+        self._aeskey = conf_params.get(CONF_AESKEY)
+        self._subscribers = []
+        self._ready = asyncio.Event()
+        self._stopped = asyncio.Event()
+        self._stopped.set()
+        self._starting = False
+        self._start_retry = None
+        self._start_retry_delay = DEFAULT_SERVER_RETRY
+        self.server_stats = {
+            "start_requested": None,
+            "ready_after": None,
+            "start_failures": 0,
+        }
+        self._ingress_queue = deque()
+        self._ingress_scheduled = False
+        self.ingress_stats = {
+            "events": 0,
+            "drains": 0,
+            "queue_depth_last": 0,
+            "queue_depth_max": 0,
+            "drain_time_last": 0.0,
+            "drain_time_max": 0.0,
+            "drain_time_total": 0.0,
+            "unrouted": 0,
+        }
+
+        if conf_params.get(CONF_NATIVE_SERVER, DEFAULT_NATIVE_SERVER) and self._protocol in NATIVE_PROTOCOLS:
+            _LOGGER.debug("%s - %s:%s: dScriptListener __init__: use asyncio native server", DOMAIN, key[0], key[1])
+            self.dScriptServer = dScriptNativeServer(key[0], key[1], self._protocol)
+            ingress_handler = self.dSBoardIngressLoop
+        else:
+            self.dScriptServer = dScriptServer(key[0], key[1], self._protocol)
+            ingress_handler = self.dSBoardIngress
+        if len(self._aeskey) > 0:
+            self.dScriptServer.SetAESKey(self._aeskey)
+        for topic in LISTENER_TOPICS:
+            self.dScriptServer.addEventHandler(topic, ingress_handler)
+        self._unsub_stop = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_ha_stop)
+
+    def compatible(self, conf_params) -> bool:
+        """Return True if a config entry can share this listener (same decoding of messages)"""
+        return conf_params.get(CONF_PROTOCOL) == self._protocol and conf_params.get(CONF_AESKEY) == self._aeskey
+
+    def subscribe(self, BuiltInServer) -> None:
+        """Add a config entry (dScriptBuiltInServer) receiving the events of this listener"""
+        if not BuiltInServer in self._subscribers:
+            self._subscribers.append(BuiltInServer)
+
+    def unsubscribe(self, BuiltInServer) -> int:
+        """Remove a config entry - returns the number of remaining subscribers"""
+        if BuiltInServer in self._subscribers:
+            self._subscribers.remove(BuiltInServer)
+        return len(self._subscribers)
+
+    async def async_start(self, event) -> None | bool:
+        """Async: Start the server (retried in background if the port cannot be bound)"""
+        try:
+            _LOGGER.debug("%s - %s:%s: async_start: %s", DOMAIN, self.key[0], self.key[1], event)
+            if self.dScriptServer.State == True or self._starting:
+                return None
+            self._starting = True
+            self._cancel_start_retry()
+            if self.server_stats["start_requested"] is None:
+                self.server_stats["start_requested"] = time.monotonic()
+            self._stopped.clear()
+            await self.dScriptServer.async_StartServer()
+            if not self.dScriptServer.State == True:
+                raise Exception("Server not serving on %s:%s" % self.key)
+            self._start_retry_delay = DEFAULT_SERVER_RETRY
+            self.server_stats["ready_after"] = round(time.monotonic() - self.server_stats["start_requested"], 3)
+            self.server_stats["start_requested"] = None
+            self._ready.set()
+            _LOGGER.debug("%s - %s:%s: async_start: started after %ss", DOMAIN, self.key[0], self.key[1], self.server_stats["ready_after"])
+        except Exception as e:
+            _LOGGER.error("%s - %s:%s: async_start: Could not start dScriptServer (retry in %ss): %s (%s.%s)", DOMAIN, self.key[0], self.key[1], self._start_retry_delay, str(e), e.__class__.__module__, type(e).__name__)
+            self.server_stats["start_failures"] += 1
+            self._start_retry = self.hass.loop.call_later(self._start_retry_delay, self._start_retry_callback)
+            self._start_retry_delay = min(self._start_retry_delay * 2, DEFAULT_SERVER_RETRY_MAX)
+            self._stopped.set()
+            return False
+        finally:
+            self._starting = False
+
+    @callback
+    def _start_retry_callback(self) -> None:
+        """Retry a failed server start"""
+        self._start_retry = None
+        self.hass.async_create_task(self.async_start("retry"))
+
+    def _cancel_start_retry(self) -> None:
+        """Cancel a scheduled server start retry"""
+        if not self._start_retry is None:
+            self._start_retry.cancel()
+            self._start_retry = None
+
+    async def async_stop(self, event) -> None | bool:
+        """Async: Stop the server"""
+        try:
+            _LOGGER.debug("%s - %s:%s: async_stop: %s", DOMAIN, self.key[0], self.key[1], event)
+            self._cancel_start_retry()
+            self.server_stats["start_requested"] = None
+            if event == "integration_unload" and not self._unsub_stop is None:
+                self._unsub_stop()
+                self._unsub_stop = None
+            if self.dScriptServer.State == False:
+                self._stopped.set()
+                return None
+            self._ready.clear()
+            await self.dScriptServer.async_StopServer()
+            if self.dScriptServer.State == True:
+                raise Exception("Server still serving on %s:%s" % self.key)
+            self._stopped.set()
+            _LOGGER.debug("%s - %s:%s: async_stop: stopped", DOMAIN, self.key[0], self.key[1])
+        except Exception as e:
+            _LOGGER.error("%s - %s:%s: async_stop: Could not stop dScriptServer: %s (%s.%s)", DOMAIN, self.key[0], self.key[1], str(e), e.__class__.__module__, type(e).__name__)
+            return False
+
+    async def _async_ha_stop(self, event) -> None:
+        """Async: Stop the server with home assistant"""
+        self._unsub_stop = None
+        await self.async_stop(event)
+
+    async def async_wait_ready(self, timeout: float | None = None) -> bool:
+        """Async: Wait until the server is serving - returns False on timeout"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def async_wait_stopped(self, timeout: float | None = None) -> bool:
+        """Async: Wait until the server stopped serving - returns False on timeout"""
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def dSBoardIngress(self, sender, event) -> None:
+        """Hand over any incoming board event into the ingress queue of the event loop"""
+        try:
+            self.hass.loop.call_soon_threadsafe(self._dSIngressPut, sender)
+        except Exception as e:
+            _LOGGER.error("%s - dSBoardIngress: failed: %s (%s.%s)", sender.sender, str(e), e.__class__.__module__, type(e).__name__)
+
+    @callback
+    def dSBoardIngressLoop(self, sender, event) -> None:
+        """Hand over an incoming board event received within the event loop (native server)"""
+        self._dSIngressPut(sender)
+
+    @callback
+    def _dSIngressPut(self, sender) -> None:
+        """Queue an incoming board event and schedule a single drain for all pending events"""
+        self._ingress_queue.append(sender)
+        self.ingress_stats["events"] += 1
+        depth = len(self._ingress_queue)
+        if depth > self.ingress_stats["queue_depth_max"]:
+            self.ingress_stats["queue_depth_max"] = depth
+        if not self._ingress_scheduled:
+            self._ingress_scheduled = True
+            self.hass.loop.call_soon(self._dSIngressDrain)
+
+    @callback
+    def _dSIngressDrain(self) -> None:
+        """Process all pending board events within one loop iteration"""
+        self._ingress_scheduled = False
+        self.ingress_stats["queue_depth_last"] = len(self._ingress_queue)
+        start = time.monotonic()
+        while self._ingress_queue:
+            sender = self._ingress_queue.popleft()
+            try:
+                BuiltInServer, dSBoard = self._route(sender.sender)
+                if BuiltInServer is None:
+                    if self._unknown(sender.sender):
+                        _LOGGER.debug("%s - _dSIngressDrain: drop event of unknown sender: %s", sender.sender, sender.topic)
+                        self.ingress_stats["unrouted"] += 1
+                    else:
+                        self.hass.async_create_task(self._async_route_dispatch(sender))
+                else:
+                    BuiltInServer.dSBoardDispatch(sender, dSBoard)
+            except Exception as e:
+                _LOGGER.error("%s - _dSIngressDrain: failed: %s (%s.%s)", sender.sender, str(e), e.__class__.__module__, type(e).__name__)
+        duration = time.monotonic() - start
+        self.ingress_stats["drains"] += 1
+        self.ingress_stats["drain_time_last"] = duration
+        self.ingress_stats["drain_time_total"] += duration
+        if duration > self.ingress_stats["drain_time_max"]:
+            self.ingress_stats["drain_time_max"] = duration
+
+    @callback
+    def _route(self, ip: str) -> tuple:
+        """Return the (dScriptBuiltInServer, dScriptBoardHA) of the config entry knowing the sender"""
+        for BuiltInServer in self._subscribers:
+            dSBoard = dScript_GetBoardByIP(self.hass, BuiltInServer._entry, ip)
+            if not dSBoard is None:
+                return BuiltInServer, dSBoard
+        return None, None
+
+    @callback
+    def _unknown(self, ip: str) -> bool:
+        """Return True if the sender is negative cached by every config entry"""
+        for BuiltInServer in self._subscribers:
+            if not self.hass.data[DOMAIN][BuiltInServer._entry_id][CONF_BOARD_INDEX].is_negative(ip):
+                return False
+        return True
+
+    async def _async_route_dispatch(self, sender) -> None:
+        """Async: Resolve the config entry of a sender not yet indexed and dispatch the event to it"""
+        try:
+            for BuiltInServer in list(self._subscribers):
+                dSBoard = await async_dScript_GetBoardByIP(self.hass, BuiltInServer._entry, sender.sender)
+                if dSBoard:
+                    BuiltInServer.dSBoardDispatch(sender, dSBoard)
+                    return None
+            if sender.topic == 'heartbeat' and self._subscribers:
+                # unknown board: the first config entry listening on this address adopts it
+                self._subscribers[0].dSBoardDispatch(sender, None)
+                return None
+            self.ingress_stats["unrouted"] += 1
+            _LOGGER.warning("%s - _async_route_dispatch: received trigger from not identifyable board: %s", sender.sender, sender.topic)
+        except Exception as e:
+            _LOGGER.error("%s - _async_route_dispatch: failed: %s (%s.%s)", sender.sender, str(e), e.__class__.__module__, type(e).__name__)
@@ -0,0 +1,107 @@
+"""Passive heartbeat based liveness tracking of dScriptBoards."""
+
+from __future__ import annotations
+from typing import Final
+from datetime import timedelta
+import logging
+import time
+
+from homeassistant.core import (
+    HomeAssistant,
+    callback,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.const import (
+    CONF_DEVICES,
+)
+
+from .const import (
+    CONF_PYOJBECT,
+    DEFAULT_HEARTBEAT_INTERVAL,
+    DEFAULT_HEARTBEAT_MISSED,
+    DEFAULT_LIVENESS_CHECK,
+    DOMAIN,
+)
+from .utils import dScript_WriteBoardStates
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class dScriptLivenessTracker(object):
+    """Derive board availability from missed heartbeat intervals"""
+
+    def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
+        """Initialize the object."""
+        self.hass = hass
+        self._entry = entry
+        self._entry_id = entry.entry_id
+        self._last = {}
+        self._interval = {}
+        self._unsub = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start the periodic missed heartbeat check"""
+        if self._unsub is None:
+            self._unsub = async_track_time_interval(self.hass, self._async_check, timedelta(seconds=DEFAULT_LIVENESS_CHECK))
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the periodic missed heartbeat check"""
+        if not self._unsub is None:
+            self._unsub()
+            self._unsub = None
+
+    @callback
+    def async_heartbeat(self, dSBoard) -> bool:
+        """Record a heartbeat - returns True if the board was considered unavailable before"""
+        mac = dSBoard.MACAddress
+        now = time.monotonic()
+        last = self._last.get(mac, None)
+        interval = self._interval.get(mac, DEFAULT_HEARTBEAT_INTERVAL)
+        if not last is None and now - last < interval * DEFAULT_HEARTBEAT_MISSED:
+            # learn the heartbeat interval of this board (ignore gaps of offline periods)
+            self._interval[mac] = interval * 0.8 + (now - last) * 0.2
+        self._last[mac] = now
+        return not dSBoard.available == True
+
+    @callback
+    def async_forget(self, mac: str) -> None:
+        """Stop tracking a board"""
+        self._last.pop(mac, None)
+        self._interval.pop(mac, None)
+
+    @callback
+    def _async_check(self, now=None) -> None:
+        """Mark boards with missed heartbeats as (possibly) unavailable"""
+        try:
+            devices = self.hass.data[DOMAIN][self._entry_id][CONF_DEVICES]
+            current = time.monotonic()
+            for mac, last in self._last.items():
+                dSBoard = devices.get(mac, {}).get(CONF_PYOJBECT, None)
+                if dSBoard is None or not dSBoard.available == True:
+                    continue
+                if current - last < self._interval.get(mac, DEFAULT_HEARTBEAT_INTERVAL) * DEFAULT_HEARTBEAT_MISSED:
+                    continue
+                _LOGGER.debug("%s - %s: dScriptLivenessTracker: missed heartbeats of %s", self._entry_id, DOMAIN, dSBoard.name)
+                self.hass.async_create_task(self._async_transition(dSBoard))
+        except Exception as e:
+            _LOGGER.error("%s - %s: dScriptLivenessTracker _async_check failed: %s (%s.%s)", self._entry_id, DOMAIN, str(e), e.__class__.__module__, type(e).__name__)
+
+    async def _async_transition(self, dSBoard) -> None:
+        """Async: Confirm a liveness transition with a single active probe"""
+        try:
+            available = dSBoard.available
+            if await dSBoard.async_check_available():
+                self._last[dSBoard.MACAddress] = time.monotonic()
+            if not dSBoard.available == available:
+                _LOGGER.info("%s - %s: dScriptLivenessTracker: %s available: %s -> %s", self._entry_id, DOMAIN, dSBoard.name, available, dSBoard.available)
+                dScript_WriteBoardStates(self.hass, self._entry, dSBoard.MACAddress)
+        except Exception as e:
+            _LOGGER.error("%s - %s: dScriptLivenessTracker _async_transition failed: %s (%s.%s)", self._entry_id, DOMAIN, str(e), e.__class__.__module__, type(e).__name__)
+
+    def stats(self) -> dict:
+        """Return the current liveness information per board"""
+        current = time.monotonic()
+        return { mac: { "last_heartbeat_age": round(current - last, 1), "heartbeat_interval": round(self._interval.get(mac, DEFAULT_HEARTBEAT_INTERVAL), 1) } for mac, last in self._last.items() }
@@ -0,0 +1,104 @@
+"""Per board performance metrics (counters and latency histograms)."""
+
+from __future__ import annotations
+from typing import Final
+from bisect import bisect_left
+import logging
+import time
+
+from .const import DEFAULT_METRIC_BUCKETS
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+METRIC_EVENTS: Final = 'events' #events received from the board (pushes, heartbeats, config changes)
+METRIC_HEARTBEATS: Final = 'heartbeats' #heartbeats received from the board
+METRIC_COMMANDS: Final = 'commands' #protocol commands sent to the board
+METRIC_ERRORS: Final = 'errors' #failed commands and polls
+METRIC_PUSH_LATENCY: Final = 'push_latency' #push received until the state was written
+METRIC_COMMAND_RTT: Final = 'command_rtt' #command sent until the answer was received
+METRIC_POLL_DURATION: Final = 'poll_duration' #duration of a coordinator poll cycle
+METRIC_QUEUE_WAIT: Final = 'queue_wait' #wait of a command for its scheduler slot
+METRIC_COUNTERS: Final = (METRIC_EVENTS, METRIC_HEARTBEATS, METRIC_COMMANDS, METRIC_ERRORS)
+METRIC_HISTOGRAMS: Final = (METRIC_PUSH_LATENCY, METRIC_COMMAND_RTT, METRIC_POLL_DURATION, METRIC_QUEUE_WAIT)
+METRIC_SENSORS: Final = METRIC_COUNTERS + METRIC_HISTOGRAMS #metric of the diagnostic sensor per identifier (identifier 1 = first metric)
+
+
+class dScriptHistogram(object):
+    """Latency histogram with fixed bucket bounds (milliseconds) - O(log buckets) per observation, no samples kept"""
+
+    def __init__(self, bounds: tuple = DEFAULT_METRIC_BUCKETS) -> None:
+        """Initialize the object."""
+        self._bounds = bounds
+        self._counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Add a value (milliseconds)"""
+        self._counts[bisect_left(self._bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    def percentile(self, share: float) -> float | None:
+        """Return the upper bound of the bucket holding the share (0..1) of the values (max for the overflow bucket)"""
+        if self.count == 0:
+            return None
+        rank = share * self.count
+        seen = 0
+        for index, count in enumerate(self._counts):
+            seen += count
+            if seen >= rank and count > 0:
+                return float(self._bounds[index]) if index < len(self._bounds) else round(self.max, 1)
+        return round(self.max, 1)
+
+    def as_dict(self) -> dict:
+        """Return the histogram for diagnostics and state attributes"""
+        if self.count == 0:
+            return { "count": 0 }
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 1),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": round(self.max, 1),
+            "buckets": dict({ ("le_%s" % bound): count for bound, count in zip(self._bounds, self._counts) }, overflow=self._counts[-1]),
+        }
+
+
+class dScriptBoardMetrics(object):
+    """Counters and latency histograms of a board"""
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self._since = time.monotonic()
+        self.counters = { name: 0 for name in METRIC_COUNTERS }
+        self.histograms = { name: dScriptHistogram() for name in METRIC_HISTOGRAMS }
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increase a counter"""
+        self.counters[name] += value
+
+    def observe(self, name: str, seconds: float) -> None:
+        """Add a duration (seconds) to a histogram"""
+        self.histograms[name].observe(seconds * 1000)
+
+    def observe_slot(self, lane: int, wait: float, service: float) -> None:
+        """Record a command of the board scheduler - queue wait and round trip time (seconds)"""
+        self.counters[METRIC_COMMANDS] += 1
+        self.histograms[METRIC_QUEUE_WAIT].observe(wait * 1000)
+        self.histograms[METRIC_COMMAND_RTT].observe(service * 1000)
+
+    def rate(self, name: str) -> float:
+        """Return the counter per hour since the metrics were created"""
+        return round(self.counters[name] * 3600 / max(time.monotonic() - self._since, 1), 1)
+
+    def as_dict(self) -> dict:
+        """Return all metrics for diagnostics"""
+        return {
+            "counters": dict(self.counters),
+            "per_hour": { name: self.rate(name) for name in METRIC_COUNTERS },
+            "histograms": { name: histogram.as_dict() for name, histogram in self.histograms.items() },
+        }
@@ -0,0 +1,151 @@
+"""asyncio native dScriptServer running within the home assistant event loop"""
+
+from __future__ import annotations
+from typing import Final
+import logging
+import asyncio
+
+from .const import (
+    DSCRIPT_DECIMALCOMMANDS,
+    DSCRIPT_EVENTTOPICS,
+    DSCRIPT_ONOFFSTATES,
+)
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+NATIVE_PROTOCOLS: Final = ['binary'] # the push format decoded by dScriptModule - other protocols use its server
+NO_IDENTIFIER_TOPICS: Final = ['heartbeat', 'getstatus', 'getconfig', 'testonline']
+ONOFF_TOPICS: Final = ['getlight', 'getsocket', 'getmotion', 'getrelay', 'getinput']
+
+
+class dScriptPushEvent(object):
+    """Event of a board push - same attributes as the dScriptModule event object"""
+    __slots__ = ('sender', 'topic', 'identifier', 'value')
+
+    def __init__(self, sender, topic, identifier=None, value=None) -> None:
+        """Initialize the object."""
+        self.sender = sender
+        self.topic = topic
+        self.identifier = identifier
+        self.value = value
+
+
+class dScriptNativeServer(object):
+    """asyncio.start_server based replacement for the thread based dScriptModule dScriptServer"""
+
+    _DecimalCommands = DSCRIPT_DECIMALCOMMANDS
+    _OnOffStates = DSCRIPT_ONOFFSTATES
+    _socketsize = 100
+    _timeout = 10
+
+    def __init__(self, TCP_IP='0.0.0.0', TCP_PORT=17123, PROTOCOL='binary') -> None:
+        """Initialize the object."""
+        _LOGGER.debug("dScriptNativeServer - %s:%s: __init__", TCP_IP, TCP_PORT)
+        if not PROTOCOL.lower() in NATIVE_PROTOCOLS:
+            raise Exception("Protocol not supported by native server: %s" % PROTOCOL)
+        self.IP = TCP_IP
+        self.Port = TCP_PORT
+        self.State = False
+        self._Protocol = PROTOCOL.lower()
+        self._AESKey = None
+        self._server = None
+        self._handlers = { topic: [] for topic in DSCRIPT_EVENTTOPICS }
+
+    def SetAESKey(self, KEY) -> bool:
+        """Store the AESKey (interface of dScriptServer - binary messages are not encrypted)"""
+        if not len(KEY) == 32:
+            raise Exception("AES key must be exactly 32 characters long")
+        self._AESKey = KEY.encode() if isinstance(KEY, str) else KEY
+        return True
+
+    def addEventHandler(self, topic, handler) -> bool:
+        """Register a handler(event, None) for a topic - handlers are called within the event loop"""
+        topic = topic.lower()
+        if not topic in self._handlers:
+            raise Exception("Unknown event handler topic: %s" % topic)
+        if not handler in self._handlers[topic]:
+            self._handlers[topic].append(handler)
+        return True
+
+    def removeEventHandler(self, topic, handler) -> bool:
+        """Remove a handler of a topic"""
+        topic = topic.lower()
+        if handler in self._handlers.get(topic, []):
+            self._handlers[topic].remove(handler)
+        return True
+
+    async def async_StartServer(self) -> None:
+        """Async: Start listening within the running event loop"""
+        _LOGGER.debug("dScriptNativeServer - %s:%s: async_StartServer", self.IP, self.Port)
+        if not self._server is None:
+            raise Exception("Server already running")
+        self._server = await asyncio.start_server(self._async_ClientConnected, self.IP, self.Port, reuse_address=True)
+        self.State = self._server.is_serving()
+        _LOGGER.info("dScriptNativeServer - %s:%s: serving (%s)", self.IP, self.Port, self._Protocol)
+
+    async def async_StopServer(self) -> None:
+        """Async: Stop listening"""
+        _LOGGER.debug("dScriptNativeServer - %s:%s: async_StopServer", self.IP, self.Port)
+        if self._server is None:
+            raise Exception("Server already stopped")
+        server = self._server
+        self._server = None
+        server.close()
+        try:
+            await asyncio.wait_for(server.wait_closed(), timeout=self._timeout)
+        except asyncio.TimeoutError:
+            _LOGGER.debug("dScriptNativeServer - %s:%s: async_StopServer: clients still connected", self.IP, self.Port)
+        self.State = False
+
+    async def _async_ClientConnected(self, reader, writer) -> None:
+        """Async: Read a single message of a connected board"""
+        addr = writer.get_extra_info('peername')
+        try:
+            data = await asyncio.wait_for(reader.read(self._socketsize), timeout=self._timeout)
+        except Exception as e:
+            _LOGGER.debug("dScriptNativeServer - %s:%s: receive from %s failed: %s (%s.%s)", self.IP, self.Port, addr, str(e), e.__class__.__module__, type(e).__name__)
+            return None
+        finally:
+            writer.close()
+            try:
+                await asyncio.wait_for(writer.wait_closed(), timeout=self._timeout)
+            except Exception:
+                pass
+        if not data or addr is None:
+            return None
+        try:
+            event = self.parse(memoryview(data), addr[0])
+        except Exception as e:
+            _LOGGER.error("dScriptNativeServer - %s:%s: parsing %s from %s failed: %s (%s.%s)", self.IP, self.Port, bytes(data), addr[0], str(e), e.__class__.__module__, type(e).__name__)
+            return None
+        if event is None:
+            return None
+        for handler in self._handlers.get(event.topic, []):
+            handler(event, None)
+
+    def parse(self, view: memoryview, sender: str) -> dScriptPushEvent | None:
+        """Translate a received binary message into an event"""
+        return self._parse_binary(view, sender)
+
+    def _parse_binary(self, view: memoryview, sender: str) -> dScriptPushEvent | None:
+        """Parse a binary message: command, identifier, state"""
+        topic = self._DecimalCommands.get(view[0], None)
+        if topic is None:
+            raise Exception("Unknown command: %s" % view[0])
+        return self._event(sender, topic, view[1] if len(view) > 1 else None, view[2] if len(view) > 2 else None)
+
+    def _event(self, sender: str, topic: str, identifier, state) -> dScriptPushEvent | None:
+        """Create the event object of a message (same interpretation as dScriptModule)"""
+        if topic == 'stopserver':
+            _LOGGER.warning("dScriptNativeServer - %s:%s: ignore stopserver request of %s", self.IP, self.Port, sender)
+            return None
+        if topic in NO_IDENTIFIER_TOPICS:
+            return dScriptPushEvent(sender, topic)
+        if identifier is None:
+            _LOGGER.debug("dScriptNativeServer - %s:%s: missing identifier for %s from %s", self.IP, self.Port, topic, sender)
+            return None
+        if state is None or state < 0 or state == 255: # firmware sends -1 (=255 as unsigned byte) for 'no state'
+            return dScriptPushEvent(sender, topic, identifier)
+        if topic in ONOFF_TOPICS:
+            return dScriptPushEvent(sender, topic, identifier, self._OnOffStates.get(state, None))
+        return dScriptPushEvent(sender, topic, identifier, state)
@@ -0,0 +1,116 @@
+"""Lookup indexes for dScriptBoards and their entities."""
+
+from __future__ import annotations
+from typing import Final
+import logging
+import time
+
+from .const import (
+    DEFAULT_NEGATIVE_CACHE_TTL,
+    DOMAIN,
+)
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class dScriptBoardIndex(object):
+    """IP -> MAC index of known boards with a negative cache for unknown senders"""
+
+    def __init__(self, entry_id: str, negative_ttl: int = DEFAULT_NEGATIVE_CACHE_TTL) -> None:
+        """Initialize the object."""
+        self._entry_id = entry_id
+        self._negative_ttl = negative_ttl
+        self._ip_to_mac = {}
+        self._mac_to_ip = {}
+        self._negative = {}
+        self.stats = {
+            "hits": 0,
+            "misses": 0,
+            "negative_hits": 0,
+            "negative_entries": 0,
+        }
+
+    def add(self, mac: str, ip: str) -> None:
+        """Add or move a board (identified by its MAC) to an IP address"""
+        old_ip = self._mac_to_ip.get(mac, None)
+        if not old_ip is None and not old_ip == ip:
+            _LOGGER.debug("%s - %s: dScriptBoardIndex add: %s moved from %s to %s", self._entry_id, DOMAIN, mac, old_ip, ip)
+            self._ip_to_mac.pop(old_ip, None)
+        self._ip_to_mac[ip] = mac
+        self._mac_to_ip[mac] = ip
+        self._negative.pop(ip, None)
+
+    def remove(self, mac: str) -> None:
+        """Remove a board (identified by its MAC) from the index"""
+        ip = self._mac_to_ip.pop(mac, None)
+        if not ip is None and self._ip_to_mac.get(ip, None) == mac:
+            self._ip_to_mac.pop(ip)
+
+    def get(self, ip: str) -> str | None:
+        """Return the MAC address of the board known at an IP address"""
+        mac = self._ip_to_mac.get(ip, None)
+        if mac is None:
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        return mac
+
+    def is_negative(self, ip: str) -> bool:
+        """Return True if the IP address is cached as not belonging to any known board"""
+        expires = self._negative.get(ip, None)
+        if expires is None:
+            return False
+        if expires < time.monotonic():
+            self._negative.pop(ip, None)
+            return False
+        self.stats["negative_hits"] += 1
+        return True
+
+    def add_negative(self, ip: str) -> None:
+        """Cache an IP address as not belonging to any known board"""
+        self._negative[ip] = time.monotonic() + self._negative_ttl
+        self.stats["negative_entries"] = len(self._negative)
+
+
+class dScriptEntityRouting(object):
+    """Routing table of (board MAC, topic, identifier) -> entity for pushed updates"""
+
+    def __init__(self, entry_id: str) -> None:
+        """Initialize the object."""
+        self._entry_id = entry_id
+        self._routes = {}
+        self._boards = {}
+
+    def add(self, entity) -> None:
+        """Add the route of an entity"""
+        key = entity.route_key
+        self._routes[key] = entity
+        self._boards.setdefault(key[0], {})[key] = entity
+
+    def remove(self, entity) -> None:
+        """Remove the route of an entity (only if it still points to this entity)"""
+        key = entity.route_key
+        if not self._routes.get(key, None) is entity:
+            return None
+        self._routes.pop(key)
+        board_routes = self._boards.get(key[0], {})
+        board_routes.pop(key, None)
+        if not board_routes:
+            self._boards.pop(key[0], None)
+
+    def remove_board(self, mac: str) -> None:
+        """Remove all routes of a board"""
+        for key in self._boards.pop(mac, {}):
+            self._routes.pop(key, None)
+
+    def get(self, key: tuple):
+        """Return the entity routed by a (board MAC, topic, identifier) key"""
+        return self._routes.get(key, None)
+
+    def entities(self, mac: str) -> list:
+        """Return all routed entities of a board"""
+        return list(self._boards.get(mac, {}).values())
+
+    def all(self) -> list:
+        """Return all routed entities"""
+        return list(self._routes.values())
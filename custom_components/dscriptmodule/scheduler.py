@@ -0,0 +1,137 @@
+"""Per board request scheduler with priority lanes"""
+
+from __future__ import annotations
+from typing import Final
+import logging
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+
+from .const import DEFAULT_BOARD_CONCURRENCY
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+LANE_USER: Final = 0 # commands initiated by the user - always served first
+LANE_PUSH: Final = 1 # reads following a push of the board
+LANE_POLL: Final = 2 # background polls, status and config reads
+LANE_NAMES: Final = { LANE_USER: "user", LANE_PUSH: "push", LANE_POLL: "poll" }
+
+COMMAND_LANE: Final = contextvars.ContextVar('dscriptmodule_command_lane', default=None)
+SLOT_HOLDER: Final = contextvars.ContextVar('dscriptmodule_slot_holder', default=None) # (scheduler, task) of the slot the running task holds
+
+
+def dScript_CommandLane(command: str) -> int:
+    """Return the lane of a board command - explicitly set lane of the calling task first, Set* commands are user commands"""
+    lane = COMMAND_LANE.get()
+    if not lane is None:
+        return lane
+    if command.startswith('Set'):
+        return LANE_USER
+    return LANE_POLL
+
+
+class dScriptCommandLane(object):
+    """Context manager to run the board requests of a block within a lane"""
+
+    def __init__(self, lane: int) -> None:
+        """Initialize the object."""
+        self._lane = lane
+        self._token = None
+
+    def __enter__(self):
+        self._token = COMMAND_LANE.set(self._lane)
+        return self
+
+    def __exit__(self, *args) -> None:
+        COMMAND_LANE.reset(self._token)
+
+
+class dScriptBoardScheduler(object):
+    """Limit the requests in flight to a board - waiting requests are admitted by lane, then in arrival order"""
+
+    def __init__(self, limit: int = DEFAULT_BOARD_CONCURRENCY) -> None:
+        """Initialize the object."""
+        self.limit = max(1, int(limit))
+        self._inflight = 0
+        self._waiters = []
+        self._sequence = itertools.count()
+        self.observer = None # called with (lane, wait, service) after every request
+        self.stats = { name: { "requests": 0, "waited": 0, "wait_total": 0.0, "wait_max": 0.0, "service_total": 0.0, "service_max": 0.0 } for name in LANE_NAMES.values() }
+
+    @property
+    def queued(self) -> int:
+        """Return the number of requests waiting for a slot"""
+        return len([ waiter for waiter in self._waiters if not waiter[2].done() ])
+
+    async def async_run(self, lane: int, target, *args):
+        """Async: Await target(*args) within a request slot of the lane (nested requests reuse the slot of the task)"""
+        holder = SLOT_HOLDER.get()
+        task = asyncio.current_task()
+        if not holder is None and holder[0] is self and holder[1] is task:
+            # nested request of the slot holder (AES nonce) - tasks spawned within the slot inherit the context but queue for a slot of their own
+            return await target(*args)
+        stats = self.stats[LANE_NAMES.get(lane, "poll")]
+        queued = time.monotonic()
+        await self._async_acquire(lane)
+        start = time.monotonic()
+        token = SLOT_HOLDER.set((self, task))
+        try:
+            return await target(*args)
+        finally:
+            SLOT_HOLDER.reset(token)
+            self._release()
+            end = time.monotonic()
+            wait = start - queued
+            service = end - start
+            stats["requests"] += 1
+            if wait > 0.001:
+                stats["waited"] += 1
+            stats["wait_total"] += wait
+            stats["wait_max"] = max(stats["wait_max"], wait)
+            stats["service_total"] += service
+            stats["service_max"] = max(stats["service_max"], service)
+            if not self.observer is None:
+                self.observer(lane, wait, service)
+
+    async def _async_acquire(self, lane: int) -> None:
+        """Async: Take a request slot - wait behind all earlier requests of the same or a higher lane"""
+        while self._waiters and self._waiters[0][2].done():
+            heapq.heappop(self._waiters) # drop cancelled requests
+        if self._inflight < self.limit and not self._waiters:
+            self._inflight += 1
+            return None
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (lane, next(self._sequence), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # slot was handed over right before the cancellation - pass it on
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        """Hand the slot over to the first waiting request or free it"""
+        while self._waiters:
+            lane, sequence, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return None
+        self._inflight -= 1
+
+    def as_dict(self) -> dict:
+        """Return the statistics rounded for diagnostics"""
+        lanes = {}
+        for name, stats in self.stats.items():
+            if stats["requests"] == 0: continue
+            lanes[name] = {
+                "requests": stats["requests"],
+                "waited": stats["waited"],
+                "wait_avg": round(stats["wait_total"] / stats["requests"], 4),
+                "wait_max": round(stats["wait_max"], 4),
+                "service_avg": round(stats["service_total"] / stats["requests"], 4),
+                "service_max": round(stats["service_max"], 4),
+            }
+        return { "limit": self.limit, "inflight": self._inflight, "queued": self.queued, "lanes": lanes }
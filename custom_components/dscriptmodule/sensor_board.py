@@ -4,13 +4,17 @@ from __future__ import annotations
 from typing import Final
 import logging
 import asyncio
-import urllib.request
-import socket
+import time
+import aiohttp
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    callback,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.const import (
     ATTR_MODEL,
     ATTR_VOLTAGE,
@@ -29,10 +33,16 @@ from .const import(
     CATTR_FW_VERSION,
     CATTR_IP_ADDRESS,
     CATTR_PROTOCOL,
+    CATTR_RTT,
     CATTR_SW_TYPE,
+    DEFAULT_HEALTH_TIMEOUT,
     DOMAIN,
 )
 
+from .tracing import (
+    TRACER,
+    TOPIC_POLL,
+)
 from .utils import(
     async_dScript_setup_entry,
 )
@@ -56,6 +66,10 @@ class dScriptBoardSensor(dScriptPlatformEntity):
     _onlineurl = STATE_UNKNOWN
     _configurl = STATE_UNKNOWN   
     _NoGetUpdateCounter = 999
+    _health_method = 'HEAD' #falls back to GET for boards not answering HEAD requests
+    _unrecorded_attributes = frozenset({ATTR_VOLTAGE, ATTR_TEMPERATURE, CATTR_RTT}) #history is kept by the board telemetry
+    _rtt = None
+    _attributes_key = None
 
     def _init_platform_specific(self, **kwargs):
         """Platform specific init actions"""
@@ -71,17 +85,27 @@ class dScriptBoardSensor(dScriptPlatformEntity):
 
     @property
     def extra_state_attributes(self):
-        """Return the state attributes of the sensor."""
+        """Return the state attributes of the sensor (rebuilt only if the board identity or a measured value changed)."""
+        static = self._board.descriptors.get('board_attributes', self._board_attributes)
+        key = (static, self._board._Volts, self._board._Temperature, self._rtt)
+        if not self._attributes_key == key:
+            self._attributes_key = key
+            self._attributes = dict(static)
+            self._attributes[ATTR_VOLTAGE] = self._board._Volts
+            self._attributes[ATTR_TEMPERATURE] = self._board._Temperature
+            self._attributes[CATTR_RTT] = self._rtt
+        return self._attributes
+
+    def _board_attributes(self) -> dict:
+        """Build the static state attributes of the board (memoized per board)"""
         return {
             ATTR_MODEL: self._board._ModuleID,
-            ATTR_VOLTAGE: self._board._Volts,
-            ATTR_TEMPERATURE: self._board._Temperature,
             ATTR_DEVICE_ID: self._board.MACAddress,
-            ATTR_SW_VERSION: self._software,
-            CATTR_FW_VERSION: self._firmware,
+            ATTR_SW_VERSION: str(self._board._ApplicationFirmwareMajor) + "." + str(self._board._ApplicationFirmwareMinor),
+            CATTR_FW_VERSION: str(self._board._SystemFirmwareMajor) + "." + str(self._board._SystemFirmwareMinor),
             CATTR_IP_ADDRESS: self._board.IP,
             CATTR_SW_TYPE: self._board._CustomFirmeware,
-            CATTR_PROTOCOL: self._board._Protocol
+            CATTR_PROTOCOL: self._board._Protocol,
         }
 
     @property
@@ -93,41 +117,69 @@ class dScriptBoardSensor(dScriptPlatformEntity):
         return True
 
     @property
-    def should_poll(self) -> bool:
+    def needs_poll(self) -> bool:
         """Return True if polling is needed."""
-        #_LOGGER.debug("%s - %s.%s: should_poll", self._entry_id, self._board.name, self.uniqueid)
+        #_LOGGER.debug("%s - %s.%s: needs_poll", self._entry_id, self._board.name, self.uniqueid)
         return True #always return true as we want http poll always and GetStatus only every 10 poll requests
 
     async def async_local_poll(self) -> None:
         """Async: Poll the latest status from device"""
         try:
-            _LOGGER.debug("%s - %s.%s: async_local_poll", self._entry_id, self._board.name, self.uniqueid)         
-            state = await self.hass.async_add_executor_job(urllib.request.urlopen,self._onlineurl)
-            state = state.getcode()
+            if not self._board.breaker.closed and not await self._board.async_check_available():
+                #board unreachable - only the single circuit breaker probe contacts it
+                return None
+            state = await self.async_health_probe()
             if self._NoGetUpdateCounter >= 10:
                 self._NoGetUpdateCounter = 0
                 await self._board.async_GetStatus()
                 #await self.hass.async_add_executor_job(self._board.GetStatus)
             else: self._NoGetUpdateCounter += 1
-        except urllib.error.URLError:       state = 404
-        except socket.timeout:              state = 408
-        except OSError:                     state = 113
-        except urllib.error.HTTPError as e: state = e.code
         except Exception as e:
             _LOGGER.error("%s - %s.%s: async_local_poll failed: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
             return None
         try:
-            if not state == 200 and self._board.available == True: self._board.check_available()
-            elif state == 200 and self._board.available == False: self._board.check_available()
+            healthy = 200 <= state < 400
+            if not healthy and self._board.available == True: await self._board.async_check_available()
+            elif healthy and self._board.available == False: await self._board.async_check_available()
             else:
-                _LOGGER.debug("%s - %s: async_local_poll board available unchanged: %s", self._board.friendlyname, self._name, self._board.available)
+                if TRACER.enabled:
+                    TRACER.trace(self._board, TOPIC_POLL, "board available unchanged", available=self._board.available)
             self._state = str(state)
             self.async_write_ha_state()
-            _LOGGER.debug("%s - %s: async_local_poll complete: %s", self._board.friendlyname, self._name, state)
+            if TRACER.enabled:
+                TRACER.trace(self._board, TOPIC_POLL, "health probe complete", state=state, rtt=self._rtt)
         except Exception as e:
             _LOGGER.error("%s - %s.%s: async_local_poll failed: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
 
 
+    async def async_health_probe(self) -> int:
+        """Async: Request the board web page via the shared http session - returns the http status (or a pseudo code) and records the round trip time of a healthy (2xx / 3xx) answer"""
+        self._onlineurl = "http://" + self._board.IP + "/index.htm"
+        session = async_get_clientsession(self.hass)
+        start = time.monotonic()
+        try:
+            async with session.request(self._health_method, self._onlineurl, timeout=aiohttp.ClientTimeout(total=DEFAULT_HEALTH_TIMEOUT), allow_redirects=False) as response:
+                state = response.status
+            if state in (400, 404, 405, 501) and self._health_method == 'HEAD':
+                _LOGGER.debug("%s - %s.%s: async_health_probe: HEAD not supported - use GET", self._entry_id, self._board.name, self.uniqueid)
+                self._health_method = 'GET'
+                return await self.async_health_probe()
+        except asyncio.TimeoutError:                state = 408
+        except aiohttp.ClientConnectorError:        state = 113
+        except aiohttp.ClientError:                 state = 404
+        except OSError:                             state = 113
+        if 200 <= state < 400:
+            self._rtt = round((time.monotonic() - start) * 1000, 1)
+        else:
+            self._rtt = None
+        return state
+
+    @callback
+    def async_handle_push(self, state) -> None:
+        """Apply a pushed state directly within the event loop (no task required)"""
+        #push with direct data should never happen for a board sensor
+        _LOGGER.warning("%s - %s.%s: unexpected async_handle_push request", self._entry_id, self._board.name, self.uniqueid)
+
     async def async_local_push(self, state=None) -> None:
         """Async: Get the latest status from device after an update was pushed"""
         #push with direct data should never happen for a board sensor
@@ -5,7 +5,10 @@ from typing import Final
 import logging
 import asyncio
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    callback,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -17,7 +20,16 @@ from .entities import dScriptPlatformEntity
 from .const import(
     DOMAIN,
 )
+from .scheduler import (
+    dScriptCommandLane,
+    LANE_PUSH,
+)
 
+from .tracing import (
+    TRACER,
+    TOPIC_POLL,
+    dScript_TraceError,
+)
 from .utils import(
     async_dScript_setup_entry,
 )
@@ -36,6 +48,8 @@ class dScriptButtonSensor(dScriptPlatformEntity):
     
     _icon = 'mdi:gesture-tap-button'    
     _platform = PLATFORM
+    _poll_method = 'async_GetButton'
+    _push_coalesce = False #every push is a button event - merging would drop presses
 
 #    def _init_platform_specific(self, **kwargs):
 #        """Platform specific init actions"""
@@ -54,28 +68,31 @@ class dScriptButtonSensor(dScriptPlatformEntity):
             #_LOGGER.debug("%s - %s.%s: async_local_poll state received: %s", self._entry_id, self._board.name, self.uniqueid, state)
             self._state = state
             self.async_write_ha_state()
-            _LOGGER.debug("%s - %s.%s: async_local_poll complete: %s", self._entry_id, self._board.name, self.uniqueid, state) 
+            if TRACER.enabled:
+                TRACER.trace(self._board, TOPIC_POLL, "local poll complete", entity=self.uniqueid, state=state)
         except OSError as e:
-            _LOGGER.debug("%s - %s.%s: async_local_poll known exception: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
+            if TRACER.enabled:
+                TRACER.trace(self._board, TOPIC_POLL, "local poll known exception", entity=self.uniqueid, error=lambda: dScript_TraceError(e))
             self._state = STATE_UNKNOWN
             self.async_write_ha_state()
         except Exception as e:
             _LOGGER.error("%s - %s.%s: async_local_poll failed: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__) 
 
+    @callback
+    def async_flush_push(self) -> None:
+        """Write the latest pushed state (end of coalescing window)"""
+        super().async_flush_push()
+        # still need to execute a poll as firmware does not reset the internal value without it :(
+        with dScriptCommandLane(LANE_PUSH):
+            self.hass.async_create_task(self._board.async_GetButton(self._identifier))
+
     async def async_local_push(self, state=None) -> None:
         """Async: Get the latest status from device after an update was pushed"""
         try:
             #_LOGGER.debug("%s - %s.%s: async_local_push: %s", self._entry_id, self._board.name, self.uniqueid, state) 
             if not state is None:
-                state = self._state_post_process(state)
-                self._state = state
-                self.async_write_ha_state()
-                _LOGGER.debug("%s - %s.%s: async_local_push complete: %s", self._entry_id, self._board.name, self.uniqueid, state)
-                # still need to execute a poll as firmware does not reset the internal value without it :(
-                state = await self._board.async_GetButton(self._identifier)
-                #state = await self.hass.async_add_executor_job(self._board.GetButton, self._identifier)
+                self.async_handle_push(state)
             else:
                 await self.hass.async_create_task(self.async_local_poll())
         except Exception as e:
             _LOGGER.error("%s - %s.%s: async_local_push failed: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
-
@@ -0,0 +1,73 @@
+"""Support for dScriptModule sensor_metric devices (diagnostic board metrics)."""
+
+from __future__ import annotations
+from typing import Final
+import logging
+
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfTime,
+)
+
+from .entities import dScriptPlatformEntity
+from .metrics import (
+    METRIC_COUNTERS,
+    METRIC_SENSORS,
+)
+
+
+_LOGGER: Final = logging.getLogger(__name__)
+PLATFORM = 'sensor'
+
+
+class dScriptMetricSensor(dScriptPlatformEntity):
+    """The class for dScriptModule sensor_metrics - one metric of the board per sensor, disabled by default."""
+
+    _icon = 'mdi:chart-histogram'
+    _platform = PLATFORM
+    _metric = None
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _unrecorded_attributes = frozenset({'buckets'})
+
+    def _init_platform_specific(self, **kwargs):
+        """Platform specific init actions"""
+        self._metric = METRIC_SENSORS[self._identifier - 1]
+        self._name = str(self._board.friendlyname) + "_" + self._metric
+        if self._metric in METRIC_COUNTERS:
+            self._icon = 'mdi:counter'
+
+    @property
+    def state(self) -> int | float | None:
+        """Return the counter value or the p95 latency (milliseconds) of the metric."""
+        if self._metric in METRIC_COUNTERS:
+            return self._board.metrics.counters[self._metric]
+        return self._board.metrics.histograms[self._metric].percentile(0.95)
+
+    @property
+    def unit_of_measurement(self) -> str | None:
+        """Return the unit of the metric."""
+        if self._metric in METRIC_COUNTERS:
+            return None
+        return UnitOfTime.MILLISECONDS
+
+    @property
+    def extra_state_attributes(self):
+        """Return the rate of a counter or the histogram of a latency metric."""
+        if self._metric in METRIC_COUNTERS:
+            return { "per_hour": self._board.metrics.rate(self._metric) }
+        return self._board.metrics.histograms[self._metric].as_dict()
+
+    @property
+    def available(self) -> bool:
+        """Return True if entity is available (metrics are kept while the board is unreachable)."""
+        return True
+
+    @property
+    def needs_poll(self) -> bool:
+        """Return True if polling is needed."""
+        return True #no board I/O - the poll only writes the current metric value
+
+    async def async_update(self) -> None:
+        """Async: Nothing to read - the state is taken from the board metrics when written."""
+        return None
@@ -5,189 +5,194 @@ from typing import Final
 import logging
 import asyncio
 
-from homeassistant.const import (
-    CONF_PARAMS,
-    CONF_PORT,
-    CONF_PROTOCOL,
-    EVENT_HOMEASSISTANT_START,
-    EVENT_HOMEASSISTANT_STOP,
+from homeassistant.core import (
+    HomeAssistant,
+    callback,
 )
-from homeassistant.helpers import discovery
+from homeassistant.config_entries import ConfigEntry
 
-from dScriptModule import dScriptServer
 from .board import (
     async_setup_dScriptBoard,
-    async_dScript_ValidateBoardConfig,
+    async_dScript_RevalidateBoardConfig,
 )
 from .const import (
-    CONF_AESKEY,
-    CONF_LISTENIP,
+    CONF_COORDINATOR,
+    CONF_ENTRY_ID,
+    CONF_LISTENERS,
+    CONF_LIVENESS,
+    CONF_PYOJBECT,
+    CONF_ROUTING,
+    CONF_SERVER,
 #    DATA_BOARDS,
     DOMAIN,
-    DSCRIPT_TOPICTOENTITYTYPE,
 )
-from .services import async_registerService
+from .scheduler import (
+    dScriptCommandLane,
+    LANE_PUSH,
+)
+from .listener import (
+    dScript_AcquireListener,
+    async_dScript_ReleaseListener,
+)
+from .metrics import (
+    METRIC_EVENTS,
+    METRIC_HEARTBEATS,
+)
+from .tracing import (
+    TRACER,
+    TOPIC_HEARTBEAT,
+    TOPIC_PUSH,
+)
 from .utils import (
+    dScript_UnindexBoard,
+    dScript_WriteBoardStates,
     async_dScript_GetBoardByIP,
-    async_dScript_GetEntityByUniqueID,
-    async_ProgrammingDebug,
-#    ProgrammingDebug,
 )
 _LOGGER: Final = logging.getLogger(__name__)
 
 platform = 'dScriptBuiltInServer'
 
 class dScriptBuiltInServer(object):
-    """The class for dScriptServer running internally"""
+    """The class for dScriptServer running internally - handles the events a shared listener routes to its config entry"""
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         """Initialize the object."""
         _LOGGER.debug("%s: __init__", platform)
         self._entry = entry
         self._entry_id = self._entry.entry_id        
         self.hass = hass
-        
-        _LOGGER.debug("%s - %s: __init__: create server object", platform, self._entry_id)        
-        conf_params=hass.data[DOMAIN][entry.entry_id][CONF_PARAMS]
-        self.dScriptServer = dScriptServer(conf_params.get(CONF_LISTENIP),conf_params.get(CONF_PORT),conf_params.get(CONF_PROTOCOL))
-
-        _LOGGER.debug("%s - %s: __init__: register dScriptServer event handlers", platform, self._entry_id)
-        if len(conf_params.get(CONF_AESKEY)) > 0:
-            self.dScriptServer.SetAESKey(conf_params.get(CONF_AESKEY))
-        self.dScriptServer.addEventHandler('heartbeat',self.dSBoardHeartbeat)
-        self.dScriptServer.addEventHandler('getconfig',self.dSBoardGetConfig)
-        self.dScriptServer.addEventHandler('getlight',self.dSBoardEntityUpdate)
-        self.dScriptServer.addEventHandler('getsocket',self.dSBoardEntityUpdate)
-        self.dScriptServer.addEventHandler('getshutter',self.dSBoardEntityUpdate)
-        self.dScriptServer.addEventHandler('getmotion',self.dSBoardEntityUpdate)
-        self.dScriptServer.addEventHandler('getbutton',self.dSBoardEntityUpdate)
-        
-        asyncio.run_coroutine_threadsafe(self.async_dSServerRegisterServices(), self.hass.loop)
+
+        _LOGGER.debug("%s - %s: __init__: subscribe to shared listener", platform, self._entry_id)
+        self.listener = dScript_AcquireListener(hass, self)
         _LOGGER.debug("%s - %s: __init__: complete", platform, self._entry_id)
 
-    async def async_dSServerRegisterServices(self) -> None:
-        """Register dScript Services and autostart events for dScriptServer"""
-        try:        
-            _LOGGER.debug("%s - async_dSServerRegisterServices: register dScriptServer to start/stop with home assistant", self._entry_id)
-            self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_START, self.async_dSServerStart)
-            self.hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self.async_dSServerStop)
+    @property
+    def dScriptServer(self):
+        """Return the dScriptServer object of the shared listener"""
+        return self.listener.dScriptServer
+
+    @property
+    def server_stats(self) -> dict:
+        """Return the start statistics of the shared listener"""
+        return self.listener.server_stats
+
+    @property
+    def ingress_stats(self) -> dict:
+        """Return the ingress statistics of the shared listener"""
+        return self.listener.ingress_stats
 
-            _LOGGER.debug("%s - async_dSServerRegisterServices: regsiter dScriptServer specific services", self._entry_id)
-            await async_registerService(self.hass, "serverstop", self.async_dSServerStop)
-            await async_registerService(self.hass, "serverstart", self.async_dSServerStart)
-        except Exception as e:
-            _LOGGER.error("%s - async_dSServerRegisterServices: failed %s", str(e), self._entry_id)        
-        
     async def async_dSServerStart(self, event) -> None | bool:
-        """Start the dScriptServer instance"""
-        try:
-            _LOGGER.debug("%s - async_dSServerStart: Start the dScriptServer", self._entry_id)
-            if self.dScriptServer.State == True:
-                return None
-            await self.dScriptServer.async_StartServer()
-            #self.dScriptServer.StartServer()
-            i = 0
-            while self.dScriptServer.State == False:
-                if i > 10: raise Exception("Timeout: ", i)
-                i += 1
-                await asyncio.sleep(1)
-            _LOGGER.debug("%s - async_dSServerStart: started", self._entry_id)
-        except Exception as e:
-            _LOGGER.error("%s - async_dSServerStop: Could not start dScriptServer: %s (%s.%s)", self._entry_id, str(e), e.__class__.__module__, type(e).__name__)
-            return False
-            
+        """Start the dScriptServer instance (retried in background if the port cannot be bound)"""
+        return await self.listener.async_start(event)
+
     async def async_dSServerStop(self, event) -> None | bool:
-        """Stop the running dScriptServer instance"""
-        try:
-            _LOGGER.debug("%s - async_dSServerStop: Stop the dScriptServer", self._entry_id)
-            if self.dScriptServer.State == False:
-                return None
-            await self.dScriptServer.async_StopServer()
-            #self.dScriptServer.StopServer()
-            i = 0
-            while self.dScriptServer.State == True:
-                if i > 10: raise Exception("Timeout: ", i)
-                i += 1
-                await asyncio.sleep(1)
-            _LOGGER.debug("%s - async_dSServerStart: stopped", self._entry_id)
-        except Exception as e:
-            _LOGGER.error("%s - async_dSServerStop: Could not stop dScriptServer: %s (%s.%s)", self._entry_id, str(e), e.__class__.__module__, type(e).__name__)
-            return False
-            
-    async def async_dSBoardHeartbeat(self, sender, event) -> None:
+        """Stop the running dScriptServer instance (affects all config entries sharing the listener)"""
+        return await self.listener.async_stop(event)
+
+    async def async_dSServerRelease(self) -> None | bool:
+        """Unsubscribe from the shared listener - the dScriptServer is stopped with the last config entry"""
+        return await async_dScript_ReleaseListener(self.hass, self)
+
+    async def async_wait_ready(self, timeout: float | None = None) -> bool:
+        """Async: Wait until the server is serving - returns False on timeout"""
+        return await self.listener.async_wait_ready(timeout)
+
+    async def async_wait_stopped(self, timeout: float | None = None) -> bool:
+        """Async: Wait until the server stopped serving - returns False on timeout"""
+        return await self.listener.async_wait_stopped(timeout)
+
+    @callback
+    def dSBoardDispatch(self, sender, dSBoard) -> None:
+        """Handle an event the listener routed to this config entry (dSBoard is None for unknown boards)"""
+        if not dSBoard is None:
+            dSBoard.metrics.count(METRIC_EVENTS)
+        if sender.topic == 'heartbeat':
+            self.hass.async_create_task(self.async_dSBoardHeartbeat(sender, sender.topic, dSBoard))
+        elif dSBoard is None:
+            if TRACER.enabled:
+                TRACER.trace(sender.sender, TOPIC_PUSH, "no board", topic=sender.topic)
+        elif sender.topic == 'getconfig':
+            self.hass.async_create_task(async_dScript_RevalidateBoardConfig(self.hass, self._entry, dSBoard, True))
+        else:
+            self.dSBoardEntityUpdate(sender, dSBoard)
+
+    async def async_dSBoardHeartbeat(self, sender, event, dSBoard=None) -> None:
         """Handle incoming hearbeat connection of any board"""
         try:       
-            _LOGGER.debug("%s - async_dSBoardHeartbeat: handle %s", sender.sender, event)
-            dSBoard = await async_dScript_GetBoardByIP(self.hass, self._entry, sender.sender)
+            if dSBoard is None:
+                dSBoard = await async_dScript_GetBoardByIP(self.hass, self._entry, sender.sender)
             if not dSBoard:
-                _LOGGER.debug("%s - async_dSBoardHearbeat: new board", sender.sender)
+                if TRACER.enabled:
+                    TRACER.trace(sender.sender, TOPIC_HEARTBEAT, "new board", event=event)
                 self.hass.async_create_task(async_setup_dScriptBoard(self.hass, self._entry, sender.sender))
             else:
-                _LOGGER.debug("%s - async_dSBoardHearbeat: known board %s", sender.sender, dSBoard.friendlyname)
-                if not dSBoard.check_available() == True:
-                    _LOGGER.warning("%s - async_dSBoardHearbeat: board unavailable %s", sender.sender, dSBoard.friendlyname)
+                if TRACER.enabled:
+                    TRACER.trace(dSBoard, TOPIC_HEARTBEAT, "known board", event=event, available=dSBoard.available, breaker=dSBoard.breaker.state)
+                dSBoard.breaker.expire() # the board is alive - probe it now instead of waiting for the backoff
+                if event == 'heartbeat':
+                    dSBoard.metrics.count(METRIC_HEARTBEATS)
+                if not event == 'heartbeat' or self.hass.data[DOMAIN][self._entry_id][CONF_LIVENESS].async_heartbeat(dSBoard):
+                    available = dSBoard.available
+                    if not await dSBoard.async_check_available():
+                        _LOGGER.warning("%s - async_dSBoardHearbeat: board unavailable %s", sender.sender, dSBoard.friendlyname)
+                        if not dSBoard.foreign_mac is None:
+                            # another board took over the IP address - route its events to a board object of its own
+                            dScript_UnindexBoard(self.hass, self._entry, dSBoard.MACAddress)
+                            dScript_WriteBoardStates(self.hass, self._entry, dSBoard.MACAddress)
+                            self.hass.async_create_task(async_setup_dScriptBoard(self.hass, self._entry, sender.sender))
+                            return None
+                    elif not available == True:
+                        dScript_WriteBoardStates(self.hass, self._entry, dSBoard.MACAddress)
+                        self.hass.data[DOMAIN][self._entry_id][CONF_COORDINATOR].async_request_refresh(dSBoard)
                 if dSBoard._CustomFirmeware:
-                    self.hass.async_create_task(self.async_dSBoardGetConfig(sender, event))
+                    self.hass.async_create_task(async_dScript_RevalidateBoardConfig(self.hass, self._entry, dSBoard))
         except Exception as e:
             _LOGGER.error("%s - async_dSBoardHearbeat: failed: %s (%s.%s)", sender.sender, str(e), e.__class__.__module__, type(e).__name__)
 
-    def dSBoardHeartbeat(self, sender, event):
-        """Handle incoming hearbeat connection of any board"""
-        try:
-            _LOGGER.debug("%s - dSBoardHeartbeat: handle %s", sender.sender, event)
-            asyncio.run_coroutine_threadsafe(
-                    self.async_dSBoardHeartbeat(sender, event), self.hass.loop)
-        except Exception as e:
-            _LOGGER.error("%s - dSBoardHearbeat: failed: %s (%s.%s)", sender.sender, str(e), e.__class__.__module__, type(e).__name__)
+    @callback
+    def dSBoardEntityUpdate(self, sender, dSBoard) -> None:
+        """Perform the update action for specified device if device trigger was received"""
+        entity = self.hass.data[DOMAIN][self._entry_id][CONF_ROUTING].get((dSBoard.MACAddress, sender.topic, sender.identifier))
+        if entity is None:
+            if TRACER.enabled:
+                TRACER.trace(dSBoard, TOPIC_PUSH, "no entity", topic=sender.topic, identifier=sender.identifier)
+            return None
+        if TRACER.enabled:
+            TRACER.trace(dSBoard, TOPIC_PUSH, "update push", entity=entity.entity_id, value=sender.value)
+        if sender.value is None:
+            with dScriptCommandLane(LANE_PUSH):
+                self.hass.async_create_task(entity.async_local_poll())
+        else:
+            entity.async_handle_push(sender.value)
 
-    async def async_dSBoardGetConfig(self, sender, event) -> None:
-        """Handles incomig getconfig connection of any board"""
-        try:
-            _LOGGER.debug("%s - async_dSBoardGetConfig: handle %s", sender.sender, event)
-            dSBoard = await async_dScript_GetBoardByIP(self.hass, self._entry, sender.sender)
-            if not dSBoard:
-                _LOGGER.warning("%s - async_dSBoardGetConfig: received trigger from identifyable board: %s", sender.sender, event)
-                return None
-            self.hass.async_create_task(async_dScript_ValidateBoardConfig(self.hass, self._entry, dSBoard))
-        except Exception as e:
-            _LOGGER.error("%s - async_dSBoardGetConfig: failed: %s (%s.%s)", sender.sender, str(e), e.__class__.__module__, type(e).__name__)
-
-    def dSBoardGetConfig(self, sender, event) -> None:
-        """Handles incomig getconfig connection of any board"""
-        try:
-            _LOGGER.debug("%s - dSBoardGetConfig: handle %s", sender.sender, event)
-            asyncio.run_coroutine_threadsafe(
-                    self.async_dSBoardGetConfig(sender, event), self.hass.loop)
-        except Exception as e:
-            _LOGGER.error("%s - dSBoardGetConfig: failed: %s (%s.%s)", sender.sender, str(e), e.__class__.__module__, type(e).__name__)
 
-    async def async_dSBoardEntityUpdate(self, sender, event, process=False) -> None:
-        """Perform the update action for specified device if device trigger was received"""
-        try:
-            if process == False:
-                #_LOGGER.debug("%s - async_dSBoardEntityUpdate: restart as independent", sender.sender)
-                self.hass.async_create_task(self.async_dSBoardEntityUpdate(sender, event, True))
-                return None
-            else:
-                _LOGGER.debug("%s - async_dSBoardEntityUpdate: handle %s", sender.sender, event)                
-                dSEntityType = DSCRIPT_TOPICTOENTITYTYPE[sender.topic]
-                dSBoard = await async_dScript_GetBoardByIP(self.hass, self._entry, sender.sender)
-                if not dSBoard:
-                    _LOGGER.warning("%s - async_dSBoardEntityUpdate: received trigger from not identifyable board: %s", sender.sender, event)
-                    return None
-                uniqueid = DOMAIN.lower()+"_"+str(dSBoard.MACAddress).replace(':','')+'_'+dSEntityType+str(sender.identifier)                
-                entity = await async_dScript_GetEntityByUniqueID(self.hass, self._entry_id, uniqueid, str(dSBoard.MACAddress))
-                if not entity is None:
-                    _LOGGER.debug("%s - async_dSBoardEntityUpdate: update push %s to state %s", sender.sender, entity .entity_id, sender.value)
-                    self.hass.async_create_task(entity.async_local_push(sender.value))
-        except Exception as e:
-            _LOGGER.error("%s - async_dSBoardEntityUpdate: failed: %s (%s.%s)", sender.sender, str(e), e.__class__.__module__, type(e).__name__)
+def _dScript_ServiceListeners(hass: HomeAssistant, call) -> list:
+    """Return the listeners addressed by a serverstart / serverstop service call (all if no entry_id is given)"""
+    config_entry_id = call.data.get(CONF_ENTRY_ID, None)
+    if config_entry_id is None:
+        return list(hass.data[DOMAIN].get(CONF_LISTENERS, {}).values())
+    BuiltInServer = hass.data[DOMAIN].get(config_entry_id, {}).get(CONF_SERVER, {}).get(CONF_PYOJBECT, None)
+    if BuiltInServer is None:
+        return []
+    return [ BuiltInServer.listener ]
+
+
+async def async_service_ServerStart(hass: HomeAssistant, call) -> None | bool:
+    """Async: Handle the service request to start the dScriptServer listeners"""
+    try:
+        _LOGGER.debug("%s - async_service_ServerStart", call)
+        for listener in _dScript_ServiceListeners(hass, call):
+            await listener.async_start("service")
+    except Exception as e:
+        _LOGGER.error("%s - async_service_ServerStart: failed: %s (%s.%s)", call, str(e), e.__class__.__module__, type(e).__name__)
+        return False
 
-    def dSBoardEntityUpdate(self, sender, event):
-        """Perform the update action for specified device if device trigger was received"""
-        try:
-            #_LOGGER.debug("%s - dSBoardEntityUpdate: handle %s", sender.sender, event)
-            asyncio.run_coroutine_threadsafe(
-                    self.async_dSBoardEntityUpdate(sender, event),self.hass.loop)
-        except Exception as e:
-            _LOGGER.error("%s - dSBoardEntityUpdate: failed: %s (%s.%s)", sender.sender, str(e), e.__class__.__module__, type(e).__name__)
 
+async def async_service_ServerStop(hass: HomeAssistant, call) -> None | bool:
+    """Async: Handle the service request to stop the dScriptServer listeners"""
+    try:
+        _LOGGER.debug("%s - async_service_ServerStop", call)
+        for listener in _dScript_ServiceListeners(hass, call):
+            await listener.async_stop("service")
+    except Exception as e:
+        _LOGGER.error("%s - async_service_ServerStop: failed: %s (%s.%s)", call, str(e), e.__class__.__module__, type(e).__name__)
+        return False
@@ -6,7 +6,10 @@ import logging
 import asyncio
 import functools
 
-from homeassistant.core import HomeAssistant
+from homeassistant.core import (
+    HomeAssistant,
+    SupportsResponse,
+)
 from homeassistant.helpers import entity_registry
 from homeassistant.const import (
     CONF_ENTITY_ID,
@@ -18,8 +21,12 @@ from .const import (
     CONF_ENTRY_ID,
     CONF_PYOJBECT,
     CONF_SERVER,
+    DEFAULT_BOARD_DEADLINE,
+    DEFAULT_TRACE_SAMPLE,
+    DEFAULT_TRACE_SIZE,
     KNOWN_DATA,
 )
+from .tracing import TRACER
 from .utils import (
     async_ProgrammingDebug,
     async_dScript_GetEntityByUniqueID,
@@ -32,7 +39,7 @@ class DummySender(object):
     def __init__(self, sender):
         self.sender = sender
 
-async def async_registerService(hass: HomeAssistant, name:str , service) -> None:
+async def async_registerService(hass: HomeAssistant, name:str , service, supports_response: SupportsResponse = SupportsResponse.NONE) -> None:
     """Async: Register a service if it does not already exist"""
     try:
         _LOGGER.debug("%s - async_registerService: %s", DOMAIN, name)
@@ -40,7 +47,7 @@ async def async_registerService(hass: HomeAssistant, name:str , service) -> None
         if not hass.services.has_service(DOMAIN, name):
             #_LOGGER.info("%s - async_registerServic: register service: %s", DOMAIN, name)
             #hass.services.async_register(DOMAIN, name, service)
-            hass.services.async_register(DOMAIN, name, functools.partial(service, hass))
+            hass.services.async_register(DOMAIN, name, functools.partial(service, hass), supports_response=supports_response)
         else:
             _LOGGER.debug("%s - async_registerServic: service already exists: %s", DOMAIN, name)  
     except Exception as e:
@@ -92,7 +99,7 @@ async def async_service_HeartbeatKnownBoards(hass: HomeAssistant, call) -> None
         if BuiltInServer is None:
             _LOGGER.error("%s - async_service_HeartbeatKnownBoards: %s server not existing", call, DOMAIN)
             return False
-        elif BuiltInServer.dScriptServer.State is False:
+        elif not await BuiltInServer.async_wait_ready(DEFAULT_BOARD_DEADLINE):
             _LOGGER.error("%s - async_service_HeartbeatKnownBoards: %s server not running", call, DOMAIN)
             return False
 
@@ -109,3 +116,38 @@ async def async_service_HeartbeatKnownBoards(hass: HomeAssistant, call) -> None
     except Exception as e:
         _LOGGER.error("%s - async_service_HeartbeatKnownBoards: failed: %s (%s.%s)", call, str(e), e.__class__.__module__, type(e).__name__)
         return False
+
+async def async_service_TraceStart(hass: HomeAssistant, call) -> None | bool:
+    """Async: Handle the service request to start tracing of selected boards / topics"""
+    try:
+        _LOGGER.debug("%s - async_service_TraceStart", call)
+        TRACER.start(boards=call.data.get('boards', None), topics=call.data.get('topics', None), sample=call.data.get('sample', DEFAULT_TRACE_SAMPLE),
+            size=call.data.get('size', DEFAULT_TRACE_SIZE), log=call.data.get('log', False))
+    except Exception as e:
+        _LOGGER.error("%s - async_service_TraceStart: failed: %s (%s.%s)", call, str(e), e.__class__.__module__, type(e).__name__)
+        return False
+
+async def async_service_TraceStop(hass: HomeAssistant, call) -> None | bool:
+    """Async: Handle the service request to stop tracing"""
+    try:
+        _LOGGER.debug("%s - async_service_TraceStop", call)
+        TRACER.stop()
+    except Exception as e:
+        _LOGGER.error("%s - async_service_TraceStop: failed: %s (%s.%s)", call, str(e), e.__class__.__module__, type(e).__name__)
+        return False
+
+async def async_service_TraceDump(hass: HomeAssistant, call) -> None | dict:
+    """Async: Handle the service request to dump the trace buffer - returned as service response or written to the log"""
+    try:
+        _LOGGER.debug("%s - async_service_TraceDump", call)
+        records = TRACER.dump(boards=call.data.get('boards', None), topics=call.data.get('topics', None), limit=call.data.get('limit', None), clear=call.data.get('clear', False))
+        if call.return_response:
+            return { "records": records }
+        for record in records:
+            _LOGGER.info("%s - trace %s %s: %s %s", record["board"], record["time"], record["topic"], record["message"], record["fields"])
+        _LOGGER.info("%s - async_service_TraceDump: %s trace records dumped", call, len(records))
+    except Exception as e:
+        _LOGGER.error("%s - async_service_TraceDump: failed: %s (%s.%s)", call, str(e), e.__class__.__module__, type(e).__name__)
+        if call.return_response:
+            return { "records": [] }
+    return None
@@ -0,0 +1,88 @@
+"""Compact per board state table of dScriptModule entities."""
+
+from __future__ import annotations
+from typing import Final
+from array import array
+import logging
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+CODE_DEFAULT: Final = 0 # slot never written - read as the default of the caller
+CODE_INT: Final = 1 # the state is the small integer within the value array
+CODE_OBJECT: Final = 2 # the state is kept as object (unhashable or the codebook is full)
+CODE_MAX: Final = 255
+INT_MIN: Final = -32768
+INT_MAX: Final = 32767
+
+
+class dScriptBoardStateTable(object):
+    """States of all entities of a board - per kind (entity type) a bytearray of codes and an int16 array of values indexed by identifier
+
+    State values (on / off / open / http codes / None ...) are stored as one byte codes of the codebook of the table.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self._codes = {}
+        self._values = {}
+        self._objects = {}
+        self._codebook = [None, None, None]
+        self._codebook_index = {}
+
+    def _code(self, state) -> int:
+        """Return the code of a state value - new values are added to the codebook, CODE_OBJECT if it cannot be coded"""
+        try:
+            key = (type(state), state)
+            code = self._codebook_index.get(key, None)
+        except TypeError:
+            return CODE_OBJECT
+        if code is None:
+            if len(self._codebook) > CODE_MAX:
+                return CODE_OBJECT
+            code = len(self._codebook)
+            self._codebook.append(state)
+            self._codebook_index[key] = code
+        return code
+
+    def _ensure(self, kind: str, identifier: int) -> None:
+        """Grow the arrays of a kind to hold the identifier"""
+        codes = self._codes.get(kind, None)
+        if codes is None:
+            codes = self._codes[kind] = bytearray()
+            self._values[kind] = array('h')
+        missing = identifier - len(codes)
+        if missing > 0:
+            codes.extend(bytes(missing))
+            self._values[kind].extend(array('h', bytes(2 * missing)))
+
+    def get(self, kind: str, identifier: int, default=None):
+        """Return the state of a slot (default if it was never written)"""
+        codes = self._codes.get(kind, None)
+        if codes is None or identifier > len(codes) or identifier < 1:
+            return default
+        code = codes[identifier - 1]
+        if code == CODE_DEFAULT:
+            return default
+        if code == CODE_INT:
+            return self._values[kind][identifier - 1]
+        if code == CODE_OBJECT:
+            return self._objects[kind][identifier]
+        return self._codebook[code]
+
+    def set(self, kind: str, identifier: int, state) -> None:
+        """Write the state of a slot"""
+        self._ensure(kind, identifier)
+        if isinstance(state, int) and not isinstance(state, bool) and INT_MIN <= state <= INT_MAX:
+            code = CODE_INT
+            self._values[kind][identifier - 1] = state
+        else:
+            code = self._code(state)
+        if code == CODE_OBJECT:
+            self._objects.setdefault(kind, {})[identifier] = state
+        elif self._codes[kind][identifier - 1] == CODE_OBJECT:
+            self._objects[kind].pop(identifier, None)
+        self._codes[kind][identifier - 1] = code
+
+    def as_dict(self) -> dict:
+        """Return the decoded states per kind (index 0 = identifier 1) for diagnostics"""
+        return { kind: [ self.get(kind, identifier) for identifier in range(1, len(codes) + 1) ] for kind, codes in self._codes.items() }
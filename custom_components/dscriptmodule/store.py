@@ -0,0 +1,134 @@
+"""Write-behind persistence of the known boards cache."""
+
+from __future__ import annotations
+from typing import Final
+import logging
+import asyncio
+import aiofiles
+import json
+import os
+import time
+
+from homeassistant.core import (
+    HomeAssistant,
+    callback,
+)
+from homeassistant.const import EVENT_HOMEASSISTANT_FINAL_WRITE
+
+from .const import (
+    DEFAULT_STORE_DELAY,
+    DOMAIN,
+    KNOWN_DATA_FILE,
+)
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+def _write_atomic(path: str, payload: str) -> None:
+    """Write a file via temp file, fsync and rename (blocking)"""
+    tmp_path = path + '.tmp'
+    with open(tmp_path, mode='w') as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class dScriptKnownDataStore(object):
+    """Domain wide known data cache - changes are marked dirty and written debounced off the event loop"""
+
+    def __init__(self, hass: HomeAssistant, path: str = KNOWN_DATA_FILE, delay: float = DEFAULT_STORE_DELAY) -> None:
+        """Initialize the object."""
+        self.hass = hass
+        self._path = path
+        self._delay = delay
+        self._disk = {}
+        self._entries = {}
+        self._handle = None
+        self._flush_task = None
+        self._dirty = False
+        self._unsub_final = hass.bus.async_listen_once(EVENT_HOMEASSISTANT_FINAL_WRITE, self._async_final_write)
+        self.stats = {
+            "changes": 0,
+            "writes": 0,
+            "last_write": None,
+            "write_time_last": 0.0,
+        }
+
+    async def async_load(self) -> dict:
+        """Async: Read the cache file (once) and return a copy of the known data of the domain"""
+        if not self._disk and os.path.isfile(self._path):
+            async with aiofiles.open(self._path, mode='r') as j:
+                self._disk = json.loads(await j.read()).get(DOMAIN, {})
+            _LOGGER.debug("%s - dScriptKnownDataStore async_load: got known file data: %s", DOMAIN, self._disk)
+        return { mac: dict(board_entry) for mac, board_entry in self._disk.items() }
+
+    def register(self, entry_id: str, known_data: dict) -> None:
+        """Add the known data of a config entry to the persisted data"""
+        self._entries[entry_id] = known_data
+
+    @callback
+    def async_mark_dirty(self) -> None:
+        """Mark the known data as changed - one write follows per burst of changes"""
+        self._dirty = True
+        self.stats["changes"] += 1
+        if self._handle is None:
+            self._handle = self.hass.loop.call_later(self._delay, self._async_schedule_flush)
+
+    @callback
+    def async_forget(self, mac: str) -> None:
+        """Drop a removed board from the persisted data and the known data of all config entries (each loaded a copy of it)"""
+        self._disk.pop(mac, None)
+        for known_data in self._entries.values():
+            known_data.pop(mac, None)
+        self.async_mark_dirty()
+
+    @callback
+    def _async_schedule_flush(self) -> None:
+        """Start the flush at the end of the debounce window"""
+        self._handle = None
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = self.hass.async_create_task(self.async_flush())
+        else:
+            self._handle = self.hass.loop.call_later(self._delay, self._async_schedule_flush)
+
+    async def async_flush(self) -> None:
+        """Async: Write the merged known data of all config entries if it changed"""
+        if not self._handle is None:
+            self._handle.cancel()
+            self._handle = None
+        if not self._dirty:
+            return None
+        self._dirty = False
+        try:
+            merged = { mac: dict(board_entry) for mac, board_entry in self._disk.items() }
+            for known_data in self._entries.values():
+                for mac, board_entry in known_data.items():
+                    merged.setdefault(mac, {}).update(board_entry)
+            payload = json.dumps({ DOMAIN: merged }, indent=2, default=str)
+            start = time.monotonic()
+            await self.hass.async_add_executor_job(_write_atomic, self._path, payload)
+            self._disk = merged
+            self.stats["writes"] += 1
+            self.stats["last_write"] = int(time.time())
+            self.stats["write_time_last"] = round(time.monotonic() - start, 4)
+            _LOGGER.debug("%s - dScriptKnownDataStore async_flush: wrote %s boards to %s", DOMAIN, len(merged), self._path)
+        except Exception as e:
+            self._dirty = True
+            _LOGGER.error("%s - dScriptKnownDataStore async_flush: failed: %s (%s.%s)", DOMAIN, str(e), e.__class__.__module__, type(e).__name__)
+
+    async def _async_final_write(self, event) -> None:
+        """Async: Write pending changes before home assistant stops"""
+        self._unsub_final = None
+        await self.async_flush()
+
+    async def async_release(self, entry_id: str) -> int:
+        """Async: Final flush on unload of a config entry - returns the number of remaining config entries"""
+        if not self._flush_task is None and not self._flush_task.done():
+            await asyncio.shield(self._flush_task)
+        await self.async_flush()
+        self._entries.pop(entry_id, None)
+        if not self._entries and not self._unsub_final is None:
+            self._unsub_final()
+            self._unsub_final = None
+        return len(self._entries)
@@ -21,6 +21,11 @@ from .const import(
     DOMAIN,
 )
 
+from .tracing import (
+    TRACER,
+    TOPIC_POLL,
+    dScript_TraceError,
+)
 from .utils import(
     async_dScript_setup_entry,
 )
@@ -39,6 +44,7 @@ class dScriptSwitch(SwitchEntity, dScriptPlatformEntity):
     
     _icon = 'mdi:power-socket-de'
     _platform = PLATFORM
+    _poll_method = 'async_GetSocket'
 
 #    def _init_platform_specific(self, **kwargs):
 #        """Platform specific init actions"""
@@ -85,9 +91,11 @@ class dScriptSwitch(SwitchEntity, dScriptPlatformEntity):
             #_LOGGER.debug("%s - %s.%s: async_local_poll state received: %s", self._entry_id, self._board.name, self.uniqueid, state)
             self._state = state
             self.async_write_ha_state()
-            _LOGGER.debug("%s - %s.%s: async_local_poll complete: %s", self._entry_id, self._board.name, self.uniqueid, state) 
+            if TRACER.enabled:
+                TRACER.trace(self._board, TOPIC_POLL, "local poll complete", entity=self.uniqueid, state=state)
         except OSError as e:
-            _LOGGER.debug("%s - %s.%s: async_local_poll known exception: %s (%s.%s)", self._entry_id, self._board.name, self.uniqueid, str(e), e.__class__.__module__, type(e).__name__)
+            if TRACER.enabled:
+                TRACER.trace(self._board, TOPIC_POLL, "local poll known exception", entity=self.uniqueid, error=lambda: dScript_TraceError(e))
             self._state = STATE_UNKNOWN
             self.async_write_ha_state()
         except Exception as e:
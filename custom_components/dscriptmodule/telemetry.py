@@ -0,0 +1,106 @@
+"""Board telemetry ring buffers (voltage / temperature)."""
+
+from __future__ import annotations
+from typing import Final
+from array import array
+from collections import deque
+import logging
+import time
+
+from .const import (
+    DEFAULT_TELEMETRY_ALPHA,
+    DEFAULT_TELEMETRY_SIZE,
+)
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+
+class dScriptRingBuffer(object):
+    """Fixed size ring of float samples - min / max / mean of the window and the EWMA are updated in O(1) (amortized) per sample"""
+
+    def __init__(self, size: int = DEFAULT_TELEMETRY_SIZE, alpha: float = DEFAULT_TELEMETRY_ALPHA) -> None:
+        """Initialize the object."""
+        self._size = size
+        self._alpha = alpha
+        self._values = array('d', bytes(8 * size))
+        self._times = array('d', bytes(8 * size))
+        self._count = 0
+        self._sum = 0.0
+        self._min = deque() # absolute sample indexes with increasing values - the first one is the window minimum
+        self._max = deque() # absolute sample indexes with decreasing values - the first one is the window maximum
+        self.ewma = None
+
+    def __len__(self) -> int:
+        """Return the number of samples within the window"""
+        return min(self._count, self._size)
+
+    def append(self, value: float, timestamp: float | None = None) -> None:
+        """Add a sample - the oldest one is dropped once the ring is full"""
+        index = self._count
+        slot = index % self._size
+        while self._min and self._min[0] <= index - self._size:
+            self._min.popleft()
+        while self._max and self._max[0] <= index - self._size:
+            self._max.popleft()
+        if index >= self._size:
+            self._sum -= self._values[slot]
+        self._values[slot] = value
+        self._times[slot] = time.time() if timestamp is None else timestamp
+        self._sum += value
+        self._count += 1
+        while self._min and self._values[self._min[-1] % self._size] >= value:
+            self._min.pop()
+        self._min.append(index)
+        while self._max and self._values[self._max[-1] % self._size] <= value:
+            self._max.pop()
+        self._max.append(index)
+        self.ewma = value if self.ewma is None else self.ewma + self._alpha * (value - self.ewma)
+        if self._count % self._size == 0:
+            # drop the accumulated floating point error of the running sum once per ring turn
+            self._sum = sum(self._values)
+
+    def samples(self, limit: int | None = None) -> list:
+        """Return the (latest limit) samples of the window as [timestamp, value] - oldest first"""
+        count = len(self)
+        if not limit is None:
+            count = min(count, limit)
+        return [ [ self._times[i % self._size], self._values[i % self._size] ] for i in range(self._count - count, self._count) ]
+
+    def stats(self) -> dict:
+        """Return the statistics of the window"""
+        if self._count == 0:
+            return { "count": 0 }
+        last = (self._count - 1) % self._size
+        return {
+            "count": len(self),
+            "last": self._values[last],
+            "last_time": self._times[last],
+            "min": self._values[self._min[0] % self._size],
+            "max": self._values[self._max[0] % self._size],
+            "mean": round(self._sum / len(self), 3),
+            "ewma": round(self.ewma, 3),
+        }
+
+
+class dScriptBoardTelemetry(object):
+    """Voltage and temperature history of a board - fed by every successful GetStatus"""
+
+    def __init__(self, size: int = DEFAULT_TELEMETRY_SIZE) -> None:
+        """Initialize the object."""
+        self.voltage = dScriptRingBuffer(size)
+        self.temperature = dScriptRingBuffer(size)
+
+    def record(self, volts, temperature) -> None:
+        """Add the status values of a board (missing values are skipped)"""
+        now = time.time()
+        if not volts is None:
+            self.voltage.append(float(volts), now)
+        if not temperature is None:
+            self.temperature.append(float(temperature), now)
+
+    def as_dict(self, samples: int | None = None) -> dict:
+        """Return the statistics (and the latest samples) for diagnostics"""
+        return {
+            "voltage": dict(self.voltage.stats(), samples=self.voltage.samples(samples)),
+            "temperature": dict(self.temperature.stats(), samples=self.temperature.samples(samples)),
+        }
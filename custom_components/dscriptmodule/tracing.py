@@ -0,0 +1,120 @@
+"""Sampled per board / per topic tracing of dScriptModule hot paths."""
+
+from __future__ import annotations
+from typing import Final
+from collections import deque
+import logging
+import random
+import time
+
+from .const import (
+    DEFAULT_TRACE_SAMPLE,
+    DEFAULT_TRACE_SIZE,
+)
+
+_LOGGER: Final = logging.getLogger(__name__)
+
+TOPIC_PUSH: Final = 'push' #state pushes of the boards
+TOPIC_POLL: Final = 'poll' #state polls of entities and boards
+TOPIC_COMMAND: Final = 'command' #protocol commands sent to the boards
+TOPIC_HEARTBEAT: Final = 'heartbeat' #heartbeats and availability changes
+TRACE_TOPICS: Final = (TOPIC_PUSH, TOPIC_POLL, TOPIC_COMMAND, TOPIC_HEARTBEAT)
+
+
+def dScript_TraceError(e: Exception) -> str:
+    """Return the trace field text of an exception"""
+    return "%s (%s.%s)" % (str(e), e.__class__.__module__, type(e).__name__)
+
+
+def _dScript_TraceBoard(board) -> tuple:
+    """Return the names a board can be filtered by (MAC address, IP address, name) - board may be a plain IP address"""
+    if isinstance(board, str):
+        return (board.lower(),)
+    return tuple(str(value).lower() for value in (getattr(board, 'MACAddress', None), getattr(board, 'IP', None), getattr(board, 'name', None)) if not value is None)
+
+
+class dScriptTracer(object):
+    """Trace records of selected boards and topics within a ring buffer
+
+    Call sites check TRACER.enabled before calling trace - disabled tracing costs a single attribute
+    check. Field values given as callables are evaluated only for records that pass the board / topic
+    filters and the sampling.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the object."""
+        self.enabled = False
+        self._boards = None
+        self._topics = None
+        self._sample = DEFAULT_TRACE_SAMPLE
+        self._log = False
+        self._records = deque(maxlen=DEFAULT_TRACE_SIZE)
+        self.stats = {
+            "recorded": 0,
+            "filtered": 0,
+            "sampled_out": 0,
+        }
+
+    def start(self, boards=None, topics=None, sample: float = DEFAULT_TRACE_SAMPLE, size: int = DEFAULT_TRACE_SIZE, log: bool = False) -> None:
+        """Enable tracing for the given boards and topics (all if not set) - the buffer is kept if its size is unchanged"""
+        if isinstance(boards, str): boards = [ boards ]
+        if isinstance(topics, str): topics = [ topics ]
+        self._boards = frozenset(str(board).lower() for board in boards) if boards else None
+        self._topics = frozenset(topics) if topics else None
+        self._sample = min(max(float(sample), 0.0), 1.0)
+        self._log = bool(log)
+        if not self._records.maxlen == int(size):
+            self._records = deque(self._records, maxlen=max(1, int(size)))
+        self.enabled = True
+        _LOGGER.info("dScriptTracer: started - boards: %s | topics: %s | sample: %s | size: %s", boards, topics, self._sample, self._records.maxlen)
+
+    def stop(self) -> None:
+        """Disable tracing - the recorded traces are kept until the next dump with clear"""
+        self.enabled = False
+        _LOGGER.info("dScriptTracer: stopped - %s records buffered", len(self._records))
+
+    def trace(self, board, topic: str, message: str, **fields) -> None:
+        """Record a trace of a board (object or IP address) and topic if it passes the filters and the sampling"""
+        if not self.enabled:
+            return None
+        if not self._topics is None and not topic in self._topics:
+            self.stats["filtered"] += 1
+            return None
+        if not self._boards is None and self._boards.isdisjoint(_dScript_TraceBoard(board)):
+            self.stats["filtered"] += 1
+            return None
+        if self._sample < 1.0 and random.random() >= self._sample:
+            self.stats["sampled_out"] += 1
+            return None
+        try:
+            fields = { name: value() if callable(value) else value for name, value in fields.items() }
+        except Exception as e:
+            fields = { "trace_error": dScript_TraceError(e) }
+        names = _dScript_TraceBoard(board)
+        record = { "time": time.time(), "board": names[-1] if names else None, "ids": list(names), "topic": topic, "message": message, "fields": fields }
+        self._records.append(record)
+        self.stats["recorded"] += 1
+        if self._log:
+            _LOGGER.debug("%s - %s: %s %s", record["board"], topic, message, fields)
+
+    def dump(self, boards=None, topics=None, limit: int | None = None, clear: bool = False) -> list:
+        """Return the buffered records (optionally filtered, latest limit) - oldest first"""
+        if isinstance(boards, str): boards = [ boards ]
+        if isinstance(topics, str): topics = [ topics ]
+        boards = frozenset(str(board).lower() for board in boards) if boards else None
+        records = [ record for record in self._records
+            if (topics is None or record["topic"] in topics) and (boards is None or not boards.isdisjoint(record["ids"])) ]
+        if not limit is None:
+            records = records[-int(limit):] if int(limit) > 0 else []
+        if clear:
+            self._records.clear()
+        return records
+
+    def as_dict(self, limit: int | None = None) -> dict:
+        """Return the tracer state (and the latest records) for diagnostics"""
+        return dict(self.stats, enabled=self.enabled, boards=sorted(self._boards) if self._boards else None,
+            topics=sorted(self._topics) if self._topics else None, sample=self._sample, size=self._records.maxlen,
+            buffered=len(self._records), records=self.dump(limit=limit))
+
+
+TRACER: Final = dScriptTracer()
@@ -11,25 +11,29 @@ import asyncio
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers import entity_registry
 #from homeassistant.helpers.entity_registry import EntityRegistry
 from homeassistant.const import (
     CONF_DEVICES,
+    CONF_IP_ADDRESS,
 )
 
 
 from .const import (
     CONF_ADD_ENTITIES,
+    CONF_BOARD_INDEX,
+    CONF_KNOWN_STORE,
     CONF_PYOJBECT,
+    CONF_ROUTING,
     DOMAIN,
     DSCRIPT_ENTITYTYPETOCOUNTATTR,
     DSCRIPT_TOPICTOENTITYTYPE,
+    KNOWN_DATA,
 )
 
 _LOGGER: Final = logging.getLogger(__name__)
 
 
-#TO-BE-DONE FUNCTION -> save json cache (service call?)
-
 def get_mac_address_from_ip(ip) -> str | None:
     """get mac address form IP - warapper for async execution"""
     try:
@@ -72,34 +76,101 @@ def ProgrammingDebug(obj, show_all=False) -> None:
         pass
 
 
+def dScript_GetBoardByIP(hass: HomeAssistant, entry: ConfigEntry, ip: str, data: bool=False):
+    """Receive dScript board object from IP address of already known boards (no network lookup)"""
+    try:
+        entry_data=hass.data[DOMAIN][entry.entry_id]
+        board_mac = entry_data[CONF_BOARD_INDEX].get(ip)
+        if board_mac is None:
+            return None
+        board_entry = entry_data[CONF_DEVICES].get(board_mac, None)
+        if board_entry is None:
+            return None
+        if data:
+            return board_entry
+        return board_entry.get(CONF_PYOJBECT, None)
+    except Exception as e:
+        _LOGGER.error("%s - dScript_GetBoardByIP: Failed to search for %s: %s (%s.%s)", entry.entry_id, ip, str(e), e.__class__.__module__, type(e).__name__)
+
+
+def dScript_IndexBoard(hass: HomeAssistant, entry: ConfigEntry, dSBoard) -> None:
+    """Add a board to (or move it within) the IP index of its config entry"""
+    try:
+        hass.data[DOMAIN][entry.entry_id][CONF_BOARD_INDEX].add(dSBoard.MACAddress, dSBoard.IP)
+    except Exception as e:
+        _LOGGER.error("%s - dScript_IndexBoard: Failed to index %s: %s (%s.%s)", entry.entry_id, dSBoard.IP, str(e), e.__class__.__module__, type(e).__name__)
+
+
+def dScript_UnindexBoard(hass: HomeAssistant, entry: ConfigEntry, mac: str) -> None:
+    """Remove a board from the IP index of its config entry (removed board or its IP address is used by another board)"""
+    try:
+        hass.data[DOMAIN][entry.entry_id][CONF_BOARD_INDEX].remove(mac)
+    except Exception as e:
+        _LOGGER.error("%s - dScript_UnindexBoard: Failed to remove %s: %s (%s.%s)", entry.entry_id, mac, str(e), e.__class__.__module__, type(e).__name__)
+
+
+def dScript_KnownDataChanged(hass: HomeAssistant) -> None:
+    """Mark the known data cache as changed (written debounced by the known data store)"""
+    try:
+        store = hass.data[DOMAIN].get(CONF_KNOWN_STORE, None)
+        if not store is None:
+            store.async_mark_dirty()
+    except Exception as e:
+        _LOGGER.error("%s - dScript_KnownDataChanged: failed: %s (%s.%s)", DOMAIN, str(e), e.__class__.__module__, type(e).__name__)
+
+
+def dScript_ForgetKnownBoard(hass: HomeAssistant, mac: str) -> None:
+    """Remove a board from the persisted known data (written debounced by the known data store)"""
+    try:
+        store = hass.data[DOMAIN].get(CONF_KNOWN_STORE, None)
+        if not store is None:
+            store.async_forget(mac)
+    except Exception as e:
+        _LOGGER.error("%s - dScript_ForgetKnownBoard: failed for %s: %s (%s.%s)", DOMAIN, mac, str(e), e.__class__.__module__, type(e).__name__)
+
+
+def dScript_WriteBoardStates(hass: HomeAssistant, entry: ConfigEntry, mac: str) -> None:
+    """Write the state of all entities of a board (e.g. after its availability changed)"""
+    try:
+        for entity in hass.data[DOMAIN][entry.entry_id][CONF_ROUTING].entities(mac):
+            if getattr(entity, 'platform', None) is None: continue
+            entity.async_write_ha_state()
+    except Exception as e:
+        _LOGGER.error("%s - dScript_WriteBoardStates: Failed for %s: %s (%s.%s)", entry.entry_id, mac, str(e), e.__class__.__module__, type(e).__name__)
+
+
 async def async_dScript_GetBoardByIP(hass: HomeAssistant, entry: ConfigEntry, ip: str, data: bool=False):
     """Async: Receive dScript board object from IP address"""
     try:
         entry_data=hass.data[DOMAIN][entry.entry_id]
         _LOGGER.debug("%s - async_dScript_GetBoardByIP: searching by IP for: %s", entry.entry_id, ip)
-        
-        for board_mac in hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]:
-            board_entry=hass.data[DOMAIN][entry.entry_id][CONF_DEVICES].get(board_mac)
-            dSBoard=board_entry.get(CONF_PYOJBECT, None)
-            if dSBoard is None: continue
-            if not dSBoard.IP == ip: continue
-            if data:
-                return board_entry
-            return board_entry.get(CONF_PYOJBECT, None)
+
+        board = dScript_GetBoardByIP(hass, entry, ip, data)
+        if not board is None:
+            return board
+        if entry_data[CONF_BOARD_INDEX].is_negative(ip):
+            _LOGGER.debug("%s - async_dScript_GetBoardByIP: unknown sender (cached): %s", entry.entry_id, ip)
+            return None
 
         board_mac = await hass.async_add_executor_job(get_mac_address_from_ip, ip)
+        board_entry = None
         if not board_mac is None:
             board_entry = entry_data[CONF_DEVICES].get(board_mac, None)
-            if not board_entry is None and data:
-                return board_entry
-            elif not board_entry is None:
-                return board_entry.get(CONF_PYOJBECT, None)
-        
-        #TO-BE-DONE: LOOP over boards and search for matching IP
-        #for board in entry_data[CONF_DEVICES]:
-
-        _LOGGER.debug("%s - async_dScript_GetBoardByIP: cannot find board: %s", entry.entry_id, ip)
-        return None
+        if board_entry is None or board_entry.get(CONF_PYOJBECT, None) is None:
+            _LOGGER.debug("%s - async_dScript_GetBoardByIP: cannot find board: %s", entry.entry_id, ip)
+            entry_data[CONF_BOARD_INDEX].add_negative(ip)
+            return None
+
+        dSBoard = board_entry.get(CONF_PYOJBECT)
+        if not dSBoard.IP == ip:
+            _LOGGER.info("%s - async_dScript_GetBoardByIP: board %s changed IP: %s -> %s", entry.entry_id, dSBoard.name, dSBoard.IP, ip)
+            dSBoard.IP = ip
+            entry_data[KNOWN_DATA].setdefault(board_mac, {})[CONF_IP_ADDRESS] = ip
+            dScript_KnownDataChanged(hass)
+        dScript_IndexBoard(hass, entry, dSBoard)
+        if data:
+            return board_entry
+        return dSBoard
     except Exception as e:
             _LOGGER.error("%s - async_dScript_GetBoardByIP: Failed to search for %s: %s (%s.%s)", entry.entry_id, ip, str(e), e.__class__.__module__, type(e).__name__)
 
@@ -155,6 +226,7 @@ async def async_dScript_setup_entry(hass: HomeAssistant, entry: ConfigEntry, asy
     from .sensor_board import dScriptBoardSensor
     from .sensor_button import dScriptButtonSensor
     from .sensor_motion import dScriptMotionSensor
+    from .sensor_metric import dScriptMetricSensor
     
     DSCRIPT_ENTITYTYPETOOBJECT: Final = {
         "light": dScriptLight,
@@ -163,7 +235,8 @@ async def async_dScript_setup_entry(hass: HomeAssistant, entry: ConfigEntry, asy
         "cover":  dScriptCover,
         "sensor_motion": dScriptMotionSensor,
         "sensor_button": dScriptButtonSensor,
-        "sensor_board": dScriptBoardSensor
+        "sensor_board": dScriptBoardSensor,
+        "sensor_metric": dScriptMetricSensor
     }    
 
     try:
@@ -200,11 +273,12 @@ async def async_dScript_setup_entry(hass: HomeAssistant, entry: ConfigEntry, asy
                         _LOGGER.debug("%s - %s: async_dScript_setup_entry: %s setting up entity %s.%s", entry.entry_id, DOMAIN, dSBoard.name, platform, identifier)
                         
                         entity = DSCRIPT_ENTITYTYPETOOBJECT[platform](hass, entry, dSBoard, identifier, platform)
-                        if not await async_dScript_GetEntityByUniqueID(hass, entry.entry_id, entity.uniqueid, dSBoard.MACAddress) is None:
+                        if not entry_data[CONF_ROUTING].get(entity.route_key) is None:
                             #_LOGGER.warning("%s - %s: async_dScript_setup_entry: %s entity %s already exists", entry.entry_id, DOMAIN, dSBoard.name, entity.uniqueid)
                             _LOGGER.debug("%s - %s: async_dScript_setup_entry: %s entity %s already exists", entry.entry_id, DOMAIN, dSBoard.name, entity.uniqueid)
                             continue
                         entry_data[CONF_DEVICES][dSBoard.MACAddress][entity.uniqueid] = entity
+                        entry_data[CONF_ROUTING].add(entity)
                         entites.append(entity)            
                 except Exception as e:
                     _LOGGER.error("%s - %s: async_dScript_setup_entry: %s setting up %s platform failed: %s (%s.%s)", entry.entry_id, DOMAIN, dSBoard.name, platform, str(e), e.__class__.__module__, type(e).__name__)
@@ -215,3 +289,26 @@ async def async_dScript_setup_entry(hass: HomeAssistant, entry: ConfigEntry, asy
         _LOGGER.error("%s - %s: async_dScript_setup_entry: preparing platform data %s failed: %s (%s.%s)", entry.entry_id, DOMAIN, platform, str(e), e.__class__.__module__, type(e).__name__)
         return False
 
+
+
+async def async_dScript_remove_entities(hass: HomeAssistant, entry: ConfigEntry, entities: list) -> None:
+    """Async: Remove entities from routing, memory, entity registry and home assistant in one batch"""
+    try:
+        _LOGGER.debug("%s - %s: async_dScript_remove_entities: remove %s entities", entry.entry_id, DOMAIN, len(entities))
+        entry_data=hass.data[DOMAIN][entry.entry_id]
+        entity_reg = entity_registry.async_get(hass)
+        removals = []
+        for entity in entities:
+            entry_data[CONF_ROUTING].remove(entity)
+            board_entry = entry_data[CONF_DEVICES].get(entity._board.MACAddress, {})
+            if board_entry.get(entity.uniqueid, None) is entity:
+                board_entry.pop(entity.uniqueid)
+            if not entity_reg.async_get(entity.entity_id) is None:
+                # registry removal also removes the entity from its platform
+                entity_reg.async_remove(entity.entity_id)
+            elif not getattr(entity, 'platform', None) is None:
+                removals.append(entity.async_remove())
+        if removals:
+            await asyncio.gather(*removals)
+    except Exception as e:
+        _LOGGER.error("%s - %s: async_dScript_remove_entities: failed: %s (%s.%s)", entry.entry_id, DOMAIN, str(e), e.__class__.__module__, type(e).__name__)
@@ -0,0 +1,40 @@
+"""Test setup - load the integration modules without the Home Assistant dependent package init."""
+
+import pathlib
+import sys
+import types
+
+import pytest
+
+PACKAGE_DIR = pathlib.Path(__file__).resolve().parents[1] / "custom_components" / "dscriptmodule"
+
+if not "dscriptmodule" in sys.modules:
+    package = types.ModuleType("dscriptmodule")
+    package.__path__ = [str(PACKAGE_DIR)]
+    sys.modules["dscriptmodule"] = package
+
+
+class FakeBus(object):
+    def async_listen_once(self, event, handler):
+        return lambda: None
+
+
+class FakeHass(object):
+    """The parts of home assistant used by the stores and board helpers"""
+
+    def __init__(self, loop) -> None:
+        self.loop = loop
+        self.bus = FakeBus()
+        self.data = {}
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+
+@pytest.fixture
+def fake_hass():
+    """Return a factory of a minimal hass object for the running event loop"""
+    return FakeHass
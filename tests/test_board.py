@@ -0,0 +1,83 @@
+"""Tests of the board life cycle helpers of board.py."""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("aiofiles")
+pytest.importorskip("dScriptModule")
+
+from homeassistant.const import CONF_DEVICES
+
+from dscriptmodule import board
+from dscriptmodule.const import (
+    CONF_BOARD_INDEX,
+    CONF_KNOWN_STORE,
+    CONF_LIVENESS,
+    CONF_ROUTING,
+    DOMAIN,
+    KNOWN_DATA,
+)
+from dscriptmodule.registry import (
+    dScriptBoardIndex,
+    dScriptEntityRouting,
+)
+from dscriptmodule.store import dScriptKnownDataStore
+
+MAC = "aa:aa:aa:aa:aa:aa"
+IP = "192.0.2.10"
+
+
+class FakeEntry(object):
+    entry_id = "entry1"
+
+
+class FakeLiveness(object):
+    def __init__(self) -> None:
+        self.forgotten = []
+
+    def async_forget(self, mac: str) -> None:
+        self.forgotten.append(mac)
+
+
+def test_removed_board_is_dropped_from_index_and_known_file(tmp_path, monkeypatch, fake_hass):
+    """A removed board is neither resolved by its IP address nor warm started from the known data file again"""
+    path = tmp_path / "known.json"
+    path.write_text(json.dumps({ DOMAIN: { MAC: { "ip_address": IP } } }))
+
+    async def no_entities(hass, entry, entities):
+        return None
+
+    monkeypatch.setattr(board, "async_dScript_remove_entities", no_entities)
+
+    async def run():
+        hass = fake_hass(asyncio.get_running_loop())
+        store = dScriptKnownDataStore(hass, str(path), 0)
+        known_data = await store.async_load()
+        store.register(FakeEntry.entry_id, known_data)
+        index = dScriptBoardIndex(FakeEntry.entry_id)
+        index.add(MAC, IP)
+        liveness = FakeLiveness()
+        hass.data[DOMAIN] = {
+            CONF_KNOWN_STORE: store,
+            FakeEntry.entry_id: {
+                CONF_DEVICES: { MAC: {} },
+                KNOWN_DATA: known_data,
+                CONF_BOARD_INDEX: index,
+                CONF_ROUTING: dScriptEntityRouting(FakeEntry.entry_id),
+                CONF_LIVENESS: liveness,
+            },
+        }
+        removed = await board.async_dScript_RemoveBoard(hass, FakeEntry(), MAC)
+        await store.async_flush()
+        return removed, index, liveness, hass.data[DOMAIN][FakeEntry.entry_id]
+
+    removed, index, liveness, entry_data = asyncio.run(run())
+    assert removed
+    assert index.get(IP) is None
+    assert liveness.forgotten == [MAC]
+    assert not MAC in entry_data[CONF_DEVICES]
+    assert not MAC in entry_data[KNOWN_DATA]
+    assert json.loads(path.read_text())[DOMAIN] == {}
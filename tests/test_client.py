@@ -0,0 +1,169 @@
+"""Tests of the persistent board connection (dScriptBoardClient)."""
+
+import asyncio
+
+import pytest
+
+from dscriptmodule import client
+from dscriptmodule.client import (
+    UNSENT,
+    dScriptBoardClient,
+)
+
+BUFF = 4
+ANSWER = b"\x01\x02\x03\x04"
+CLOSED = None # script entry: the board closed the connection after its last answer (EOF already received)
+
+
+class FakeBoard(object):
+    IP = "192.0.2.10"
+    Port = 17123
+    friendlyname = "fake"
+    _Protocol = "binary"
+
+
+class FakeWriter(object):
+    """Records the written requests of one connection"""
+
+    def __init__(self, log: list) -> None:
+        self._log = log
+        self._closing = False
+        self.wait_closed_called = False
+
+    def write(self, msg: bytes) -> None:
+        self._log.append(msg)
+
+    async def drain(self) -> None:
+        await asyncio.sleep(0)
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        self._closing = True
+
+    async def wait_closed(self) -> None:
+        self.wait_closed_called = True
+
+    def get_extra_info(self, name):
+        return None
+
+
+class FakeReader(object):
+    """Returns the scripted answers of one connection (b'' = closed by the board after it received the request)"""
+
+    def __init__(self, answers: list) -> None:
+        self._answers = list(answers)
+
+    def at_eof(self) -> bool:
+        return bool(self._answers) and self._answers[0] is CLOSED
+
+    async def read(self, n: int) -> bytes:
+        await asyncio.sleep(0)
+        if not self._answers or self._answers[0] is CLOSED:
+            return b""
+        return self._answers.pop(0)
+
+
+class FakeBoardConnections(object):
+    """open_connection replacement - every connection answers according to its script"""
+
+    def __init__(self, scripts: list) -> None:
+        self._scripts = list(scripts)
+        self.written = []
+        self.writers = []
+
+    async def open_connection(self, host, port):
+        if not self._scripts:
+            raise OSError("connection refused")
+        writer = FakeWriter(self.written)
+        self.writers.append(writer)
+        return FakeReader(self._scripts.pop(0)), writer
+
+
+async def _requests(connections, pipeline: int, replay: bool):
+    board_client = dScriptBoardClient(FakeBoard(), pipeline)
+    first = await board_client.async_request(b"GET1", BUFF, 1)
+    second = await board_client.async_request(b"SET2", BUFF, 1, replay)
+    await board_client.async_close()
+    return first, second
+
+
+def test_set_command_after_closed_connection_is_sent_on_new_connection(monkeypatch):
+    """A connection the board closed after its last answer is replaced before a command is written"""
+    connections = FakeBoardConnections([[ANSWER, CLOSED], [ANSWER]])
+    monkeypatch.setattr(client.asyncio, "open_connection", connections.open_connection)
+    first, second = asyncio.run(_requests(connections, 2, False))
+    assert first == ANSWER
+    assert second == ANSWER
+    assert connections.written == [b"GET1", b"SET2"]
+    assert len(connections.writers) == 2
+    assert connections.writers[0].wait_closed_called
+
+
+def test_written_set_command_is_not_resent_after_reconnect(monkeypatch):
+    """A command written to a connection the board closed while receiving it must not be sent again"""
+    connections = FakeBoardConnections([[ANSWER, b""], [ANSWER]])
+    monkeypatch.setattr(client.asyncio, "open_connection", connections.open_connection)
+    first, second = asyncio.run(_requests(connections, 2, False))
+    assert first == ANSWER
+    assert second is None
+    assert connections.written.count(b"SET2") == 1
+    assert len(connections.writers) == 1
+    assert connections.writers[0].wait_closed_called
+
+
+def test_written_read_is_replayed_after_reconnect(monkeypatch):
+    """A read written to a connection the board closed is repeated on a new connection"""
+    connections = FakeBoardConnections([[ANSWER, b""], [ANSWER]])
+    monkeypatch.setattr(client.asyncio, "open_connection", connections.open_connection)
+    first, second = asyncio.run(_requests(connections, 2, True))
+    assert first == ANSWER
+    assert second == ANSWER
+    assert connections.written.count(b"SET2") == 2
+    assert len(connections.writers) == 2
+
+
+def test_request_not_written_is_unsent(monkeypatch):
+    """A request that never reached the board is reported as UNSENT (safe to send again)"""
+    connections = FakeBoardConnections([])
+    monkeypatch.setattr(client.asyncio, "open_connection", connections.open_connection)
+
+    async def request():
+        return await dScriptBoardClient(FakeBoard(), 1).async_request(b"SET1", BUFF, 1, False)
+
+    assert asyncio.run(request()) is UNSENT
+    assert connections.written == []
+
+
+def test_set_command_reaches_board_closing_after_each_answer():
+    """Real socket: a board answering one request per connection still receives a following command"""
+    received = []
+
+    async def handle(reader, writer):
+        received.append(await reader.read(BUFF))
+        writer.write(ANSWER)
+        await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        board = FakeBoard()
+        board.IP = "127.0.0.1"
+        board.Port = server.sockets[0].getsockname()[1]
+        board_client = dScriptBoardClient(board, 1)
+        try:
+            first = await board_client.async_request(b"GET1", BUFF, 2)
+            await asyncio.sleep(0.05)
+            second = await board_client.async_request(b"SET1", BUFF, 2, False)
+        finally:
+            await board_client.async_close()
+            server.close()
+            await server.wait_closed()
+        return first, second, board_client.stats
+
+    first, second, stats = asyncio.run(run())
+    assert first == ANSWER
+    assert second == ANSWER
+    assert received == [b"GET1", b"SET1"]
+    assert stats["errors"] == 0
@@ -0,0 +1,79 @@
+"""Tests of the per board request scheduler (dScriptBoardScheduler)."""
+
+import asyncio
+
+from dscriptmodule.scheduler import (
+    LANE_POLL,
+    LANE_USER,
+    dScriptBoardScheduler,
+)
+
+
+def test_nested_request_reuses_slot_of_parent():
+    """A nested request (AES nonce read) of the slot holder runs within its slot - no deadlock at limit 1"""
+    scheduler = dScriptBoardScheduler(1)
+    calls = []
+
+    async def nonce():
+        calls.append("nonce")
+        return b"nonce"
+
+    async def command():
+        calls.append("command")
+        return await scheduler.async_run(LANE_POLL, nonce)
+
+    async def run():
+        return await asyncio.wait_for(scheduler.async_run(LANE_USER, command), timeout=1)
+
+    assert asyncio.run(run()) == b"nonce"
+    assert calls == ["command", "nonce"]
+    assert scheduler.stats["user"]["requests"] == 1
+
+
+def test_task_spawned_within_slot_queues_for_own_slot():
+    """A task created by the slot holder inherits the context but must not share the slot"""
+    scheduler = dScriptBoardScheduler(1)
+    order = []
+
+    async def child():
+        order.append("child")
+
+    async def parent():
+        task = asyncio.get_running_loop().create_task(scheduler.async_run(LANE_POLL, child))
+        await asyncio.sleep(0.01)
+        order.append("parent")
+        return task
+
+    async def run():
+        task = await scheduler.async_run(LANE_USER, parent)
+        await asyncio.wait_for(task, timeout=1)
+
+    asyncio.run(run())
+    assert order == ["parent", "child"]
+
+
+def test_user_lane_is_served_before_poll_lane():
+    """Waiting requests are admitted by lane, then in arrival order"""
+    scheduler = dScriptBoardScheduler(1)
+    order = []
+
+    async def request(name):
+        order.append(name)
+        await asyncio.sleep(0)
+
+    async def run():
+        gate = asyncio.Event()
+
+        async def hold():
+            await gate.wait()
+
+        holder = asyncio.get_running_loop().create_task(scheduler.async_run(LANE_POLL, hold))
+        await asyncio.sleep(0)
+        poll = asyncio.get_running_loop().create_task(scheduler.async_run(LANE_POLL, request, "poll"))
+        user = asyncio.get_running_loop().create_task(scheduler.async_run(LANE_USER, request, "user"))
+        await asyncio.sleep(0)
+        gate.set()
+        await asyncio.wait_for(asyncio.gather(holder, poll, user), timeout=1)
+
+    asyncio.run(run())
+    assert order == ["user", "poll"]
@@ -0,0 +1,39 @@
+"""Tests of the per board state table (dScriptBoardStateTable)."""
+
+from dscriptmodule.states import (
+    CODE_MAX,
+    dScriptBoardStateTable,
+)
+
+
+def test_equal_values_of_different_types_are_kept_apart():
+    """True, 1 and 1.0 are equal dict keys - each slot must return the value it was written with"""
+    table = dScriptBoardStateTable()
+    table.set("light", 1, True)
+    table.set("light", 2, 1.0)
+    table.set("light", 3, 1)
+    assert [type(table.get("light", identifier)) for identifier in (1, 2, 3)] == [bool, float, int]
+    assert table.get("light", 4, "unknown") == "unknown"
+
+
+def test_full_codebook_stores_the_state_as_object():
+    """Values beyond the codebook capacity are kept as objects instead of failing"""
+    table = dScriptBoardStateTable()
+    for identifier in range(1, CODE_MAX + 11):
+        table.set("sensor", identifier, "state%s" % identifier)
+    table.set("sensor", 1, ["unhashable"])
+    assert table.get("sensor", CODE_MAX + 10) == "state%s" % (CODE_MAX + 10)
+    assert table.get("sensor", 1) == ["unhashable"]
+    table.set("sensor", 1, "state1")
+    assert table.get("sensor", 1) == "state1"
+
+
+def test_codebooks_are_per_table():
+    """A board does not fill the codebook of another board"""
+    first = dScriptBoardStateTable()
+    for identifier in range(1, CODE_MAX + 1):
+        first.set("sensor", identifier, "state%s" % identifier)
+    second = dScriptBoardStateTable()
+    second.set("sensor", 1, "on")
+    assert not (str, "on") in first._codebook_index
+    assert second.get("sensor", 1) == "on"
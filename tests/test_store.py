@@ -0,0 +1,57 @@
+"""Tests of the write-behind known data store (dScriptKnownDataStore)."""
+
+import asyncio
+import json
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("aiofiles")
+
+from dscriptmodule.const import DOMAIN
+from dscriptmodule.store import dScriptKnownDataStore
+
+KNOWN = { "aa:aa:aa:aa:aa:aa": { "friendly_name": "first" }, "bb:bb:bb:bb:bb:bb": { "friendly_name": "second" } }
+
+
+async def _store(tmp_path, fake_hass):
+    path = tmp_path / "known.json"
+    path.write_text(json.dumps({ DOMAIN: KNOWN }))
+    store = dScriptKnownDataStore(fake_hass(asyncio.get_running_loop()), str(path), 0)
+    return store, path
+
+
+def test_forgotten_board_is_dropped_from_file(tmp_path, fake_hass):
+    """A board removed from the known data is no longer written back from the loaded file"""
+
+    async def run():
+        store, path = await _store(tmp_path, fake_hass)
+        known_data = await store.async_load()
+        other_data = await store.async_load()
+        store.register("entry1", known_data)
+        store.register("entry2", other_data)
+        store.async_forget("bb:bb:bb:bb:bb:bb")
+        await store.async_flush()
+        return json.loads(path.read_text())[DOMAIN], known_data, other_data
+
+    written, known_data, other_data = asyncio.run(run())
+    assert list(written) == ["aa:aa:aa:aa:aa:aa"]
+    assert not "bb:bb:bb:bb:bb:bb" in known_data
+    assert not "bb:bb:bb:bb:bb:bb" in other_data
+
+
+def test_changed_board_is_merged_into_file(tmp_path, fake_hass):
+    """Changes of a config entry are written together with the boards of the file"""
+
+    async def run():
+        store, path = await _store(tmp_path, fake_hass)
+        known_data = await store.async_load()
+        store.register("entry1", known_data)
+        known_data["aa:aa:aa:aa:aa:aa"]["friendly_name"] = "renamed"
+        store.async_mark_dirty()
+        await store.async_flush()
+        return json.loads(path.read_text())[DOMAIN]
+
+    written = asyncio.run(run())
+    assert written["aa:aa:aa:aa:aa:aa"]["friendly_name"] == "renamed"
+    assert "bb:bb:bb:bb:bb:bb" in written